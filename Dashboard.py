@@ -1,4 +1,8 @@
 import streamlit as st
+from data_loader import validation_report
+from cache_manager import MB, manager as cache_manager
+from data_validation import failed_rules, summary_table
+from theme import apply_theme
 
 # -------------------------------------------------
 # PAGE CONFIGURATION
@@ -10,100 +14,9 @@ st.set_page_config(
 )
 
 # -------------------------------------------------
-# COLOR SCHEME (LIGHT & MATURE)
+# THEME
 # -------------------------------------------------
-BACKGROUND_COLOR = "#f5f7fb"          # Soft light background
-SIDEBAR_BACKGROUND = "#ffffff"        # Clean white
-PRIMARY_COLOR = "#4f46e5"              # Muted indigo
-SECONDARY_COLOR = "#0f172a"            # Deep slate text
-MUTED_TEXT = "#64748b"                 # Subtle gray
-DIVIDER_COLOR = "#e5e7eb"              # Light divider
-INFO_BACKGROUND = "#eef2ff"            # Soft indigo tint
-INFO_BORDER = "#c7d2fe"
-
-# -------------------------------------------------
-# GLOBAL INLINE CSS
-# -------------------------------------------------
-st.markdown(
-    f"""
-    <style>
-
-    /* App background */
-    .stApp {{
-        background-color: {BACKGROUND_COLOR};
-    }}
-
-    /* Sidebar background */
-    section[data-testid="stSidebar"] {{
-        background-color: {SIDEBAR_BACKGROUND};
-        border-right: 1px solid {DIVIDER_COLOR};
-    }}
-
-    /* Sidebar padding */
-    section[data-testid="stSidebar"] > div {{
-        padding-top: 20px;
-    }}
-
-    /* Headings */
-    h1, h2, h3 {{
-        color: {SECONDARY_COLOR};
-    }}
-
-    /* Paragraph text */
-    p, li {{
-        color: {SECONDARY_COLOR};
-        font-size: 15px;
-        line-height: 1.6;
-    }}
-
-    /* Muted text */
-    .muted {{
-        color: {MUTED_TEXT};
-        font-size: 14px;
-    }}
-
-    /* Sidebar title */
-    .sidebar-title {{
-        font-size: 22px;
-        font-weight: 700;
-        color: {SECONDARY_COLOR};
-        margin-bottom: 2px;
-    }}
-
-    /* Sidebar subtitle */
-    .sidebar-subtitle {{
-        font-size: 13px;
-        color: {MUTED_TEXT};
-        margin-bottom: 16px;
-    }}
-
-    /* Sidebar section header */
-    .sidebar-section {{
-        font-size: 14px;
-        font-weight: 600;
-        color: {SECONDARY_COLOR};
-        margin: 18px 0 6px 0;
-    }}
-
-    /* Divider */
-    hr {{
-        border: none;
-        height: 1px;
-        background-color: {DIVIDER_COLOR};
-        margin: 16px 0;
-    }}
-
-    /* Info box override */
-    div[data-testid="stAlert"] {{
-        background-color: {INFO_BACKGROUND};
-        border: 1px solid {INFO_BORDER};
-        color: {SECONDARY_COLOR};
-    }}
-
-    </style>
-    """,
-    unsafe_allow_html=True
-)
+apply_theme()
 
 # -------------------------------------------------
 # SIDEBAR CONTENT
@@ -181,6 +94,10 @@ st.markdown(
         <li>Inventory and stock health</li>
         <li>Profitability and cost control</li>
         <li>Sales trends and demand behavior</li>
+        <li>Customer value and loyalty</li>
+        <li>Supplier performance</li>
+        <li>Cashier staffing and throughput</li>
+        <li>Discounts and payment methods</li>
     </ul>
     """,
     unsafe_allow_html=True
@@ -191,3 +108,31 @@ st.markdown("<br>", unsafe_allow_html=True)
 st.info(
     "Start with **Executive Overview** to get a one-glance view of today’s business health."
 )
+
+# -------------------------------------------------
+# DATA QUALITY
+# -------------------------------------------------
+failures = failed_rules(validation_report())
+
+if failures:
+    st.warning(
+        f"**{len(failures)} data quality check(s) failed.** "
+        "Affected rows are still included in the KPIs on every page."
+    )
+
+    with st.expander("Data quality details"):
+        st.dataframe(summary_table(failures), use_container_width=True, hide_index=True)
+
+        for result in failures:
+            st.markdown(f"**{result['table']}: {result['description']}** ({result['violations']:,} rows)")
+            st.dataframe(result["sample"], use_container_width=True)
+
+# -------------------------------------------------
+# CACHE STATISTICS
+# -------------------------------------------------
+with st.expander("Cache statistics"):
+    st.caption(
+        f"Shared by all sessions on this server; least recently used entries are evicted past "
+        f"{cache_manager.memory_limit / MB:,.0f} MB in total or a cache's own budget."
+    )
+    st.dataframe(cache_manager.stats(), use_container_width=True, hide_index=True)
@@ -0,0 +1,132 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from analytics.rolling import ENERGY_CATEGORY
+from analytics.series import daily_matrix
+
+# The expected value for a day is the median of the same weekday over the
+# previous SEASONAL_WEEKS weeks; residuals from it are scaled by their rolling
+# median absolute deviation over RESIDUAL_WINDOW_DAYS.
+SEASON_LENGTH = 7
+SEASONAL_WEEKS = 8
+MIN_SEASONS = 4
+RESIDUAL_WINDOW_DAYS = 28
+MIN_RESIDUALS = 14
+
+# Modified z-score cut-off (Iglewicz & Hoaglin); MAD * 1.4826 estimates the
+# standard deviation for normal data.
+ANOMALY_THRESHOLD = 3.5
+MAD_TO_SIGMA = 1.4826
+# Floor under the scale so near-constant count series (one damaged unit more
+# than usual) are not flagged.
+MIN_SCALE = 1.0
+
+# Days of history needed before the first day being scored.
+LOOKBACK_DAYS = SEASON_LENGTH * SEASONAL_WEEKS + RESIDUAL_WINDOW_DAYS
+
+METRIC_LABELS = {
+    "revenue": "Revenue",
+    "energy_cost": "Power & Generator Fuel",
+    "damaged_units": "Damaged Units",
+    "expired_units": "Expired Units"
+}
+
+# -------------------------------------------------
+# STORE x DAY METRICS
+# -------------------------------------------------
+def metric_sources(data):
+    expenses = data["expenses"]
+    return {
+        "revenue": (data["sales"], "Transaction Date", "total_amount"),
+        "energy_cost": (expenses[expenses["expense_category"] == ENERGY_CATEGORY], "Expense Date", "expense_amount"),
+        "damaged_units": (data["inventory"], "Snapshot Date", "damaged_qty"),
+        "expired_units": (data["inventory"], "Snapshot Date", "expired_qty")
+    }
+
+def metric_matrix(data, start=None, end=None):
+    # Stacks every metric for every store into one (series, day) matrix on a
+    # shared calendar so the detectors below run once over all of it.
+    sources = metric_sources(data)
+    dated = [frame[column] for frame, column, _ in sources.values() if len(frame)]
+    if not dated:
+        # Nothing to score: no series and no days.
+        return pd.DataFrame({"store_id": [], "metric": []}), pd.DatetimeIndex([]), np.zeros((0, 0))
+    if start is None:
+        start = min(dates.min() for dates in dated)
+    if end is None:
+        end = max(dates.max() for dates in dated)
+
+    keys, blocks = [], []
+    for metric, (frame, date_column, value_column) in sources.items():
+        if frame.empty:
+            continue
+        stores, dates, values = daily_matrix(frame, date_column, value_column, keys=["store_id"], start=start, end=end)
+        keys.append(stores.assign(metric=metric))
+        blocks.append(values)
+
+    return pd.concat(keys, ignore_index=True), dates, np.vstack(blocks)
+
+# -------------------------------------------------
+# ROBUST DETECTORS
+# -------------------------------------------------
+def trailing_windows(values, length, step=1):
+    # windows[i, t] holds the `length` days before day t (not including it),
+    # NaN-padded at the start of the calendar.
+    padded = np.concatenate([np.full((values.shape[0], length), np.nan), values], axis=1)
+    return sliding_window_view(padded, length, axis=1)[:, :values.shape[1], ::step]
+
+def nanmedian(windows, min_count):
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        median = np.nanmedian(windows, axis=-1)
+    return np.where((~np.isnan(windows)).sum(axis=-1) >= min_count, median, np.nan)
+
+def robust_scores(values):
+    # Seasonal baseline: median of the same weekday in earlier weeks.
+    baseline = nanmedian(trailing_windows(values, SEASON_LENGTH * SEASONAL_WEEKS, SEASON_LENGTH), MIN_SEASONS)
+    residual = values - baseline
+
+    # Residual centre and spread over the trailing window, excluding the day
+    # itself so an outlier cannot mask itself.
+    windows = trailing_windows(residual, RESIDUAL_WINDOW_DAYS)
+    centre = nanmedian(windows, MIN_RESIDUALS)
+    mad = nanmedian(np.abs(windows - centre[..., None]), MIN_RESIDUALS)
+    scale = np.fmax(MAD_TO_SIGMA * mad, MIN_SCALE)
+
+    return baseline + centre, (residual - centre) / scale
+
+# -------------------------------------------------
+# DETECTION
+# -------------------------------------------------
+def detect_anomalies(data, start=None):
+    # Scores every store/metric/day from `start` on (all days by default),
+    # reading only LOOKBACK_DAYS of history before it.
+    history_start = pd.Timestamp(start) - pd.Timedelta(days=LOOKBACK_DAYS) if start is not None else None
+    keys, dates, values = metric_matrix(data, start=history_start)
+    expected, score = robust_scores(values)
+
+    n_series, n_days = values.shape
+    scores = pd.DataFrame({
+        "store_id": np.repeat(keys["store_id"].to_numpy(), n_days),
+        "metric": np.repeat(keys["metric"].to_numpy(), n_days),
+        "Date": np.tile(dates, n_series),
+        "value": values.ravel(),
+        "expected": expected.ravel(),
+        "score": score.ravel()
+    })
+    scores["is_anomaly"] = np.abs(scores["score"]) >= ANOMALY_THRESHOLD
+    if start is not None:
+        scores = scores[scores["Date"] >= pd.Timestamp(start)]
+    return scores.reset_index(drop=True)
+
+def anomaly_alerts(scores, days=14, store_id=None):
+    recent = scores[scores["Date"] > scores["Date"].max() - pd.Timedelta(days=days)]
+    if store_id is not None:
+        recent = recent[recent["store_id"] == store_id]
+    alerts = recent[recent["is_anomaly"]]
+    return alerts.assign(magnitude=alerts["score"].abs()).sort_values(
+        ["Date", "magnitude"], ascending=False
+    ).drop(columns="magnitude")
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+
+# sales_transactions has no basket id, so a basket is rebuilt from the lines
+# that share a customer, till and timestamp ("receipt"), or more loosely from
+# one customer's lines in a store on a day ("daily_visit"). Each receipt line
+# in the workbook carries its own time, which leaves almost every "receipt"
+# basket with a single product, so "daily_visit" is the default.
+BASKET_DEFINITIONS = {
+    "receipt": ["store_id", "customer_id", "transaction_date", "transaction_time", "cashier_id"],
+    "daily_visit": ["store_id", "customer_id", "transaction_date"]
+}
+DEFAULT_BASKET_DEFINITION = "daily_visit"
+
+MIN_PAIR_BASKETS = 5
+
+# -------------------------------------------------
+# BASKET x PRODUCT MATRIX
+# -------------------------------------------------
+def basket_matrix(sales, definition=DEFAULT_BASKET_DEFINITION):
+    # Imported here so pages that only need BASKET_DEFINITIONS do not load scipy.
+    from scipy import sparse
+
+    basket = sales.groupby(BASKET_DEFINITIONS[definition], sort=False).ngroup().to_numpy()
+    product, product_ids = pd.factorize(sales["product_id"])
+
+    matrix = sparse.csr_matrix(
+        (np.ones(len(basket), dtype="int32"), (basket, product)),
+        shape=(basket.max() + 1 if len(basket) else 0, len(product_ids))
+    )
+    # Repeat lines for one product in the same basket count once.
+    matrix.data[:] = 1
+    return matrix, np.asarray(product_ids)
+
+# -------------------------------------------------
+# PAIR AFFINITY
+# -------------------------------------------------
+def product_affinity(sales, definition=DEFAULT_BASKET_DEFINITION, min_pair_baskets=MIN_PAIR_BASKETS):
+    matrix, product_ids = basket_matrix(sales, definition)
+    n_baskets = matrix.shape[0]
+
+    # One sparse product gives every pair's basket count; memory is bounded by
+    # the number of co-occurring pairs, not by baskets x pairs.
+    co_occurrence = (matrix.T @ matrix).tocoo()
+    item_baskets = np.asarray(matrix.sum(axis=0)).ravel()
+
+    a, b, together = co_occurrence.row, co_occurrence.col, co_occurrence.data
+    keep = (a != b) & (together >= min_pair_baskets)
+    a, b, together = a[keep], b[keep], together[keep]
+
+    support = together / n_baskets
+    confidence = together / item_baskets[a]
+    lift = support / ((item_baskets[a] / n_baskets) * (item_baskets[b] / n_baskets))
+
+    return pd.DataFrame({
+        "product_id": product_ids[a],
+        "with_product_id": product_ids[b],
+        "baskets": together.astype("int64"),
+        "support": support,
+        "confidence": confidence,
+        "lift": lift
+    }).sort_values("lift", ascending=False).reset_index(drop=True)
+
+def basket_summary(sales, definition=DEFAULT_BASKET_DEFINITION):
+    matrix, _ = basket_matrix(sales, definition)
+    sizes = np.asarray(matrix.sum(axis=1)).ravel()
+    return {
+        "baskets": matrix.shape[0],
+        "multi_item_baskets": int((sizes > 1).sum()),
+        "average_items": float(sizes.mean()) if len(sizes) else 0.0
+    }
+
+def frequently_bought_together(affinity, products, product_id=None, top_n=10):
+    pairs = affinity
+    if product_id is not None:
+        pairs = pairs[pairs["product_id"] == product_id]
+    else:
+        # Each unordered pair appears in both directions; keep one.
+        pairs = pairs[pairs["product_id"] < pairs["with_product_id"]]
+
+    names = products.set_index("product_id")["product_name"]
+    top = pairs.head(top_n)
+    return top.assign(
+        product_name=top["product_id"].map(names),
+        with_product_name=top["with_product_id"].map(names)
+    )
@@ -0,0 +1,117 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow.dataset as ds
+
+MB = 1024 * 1024
+
+# Memory one worker may spend on a scan. A decoded chunk plus the keys and
+# group-by buffers built from it take roughly WORKING_SET_FACTOR times the
+# chunk's own size, so chunks are sized to the budget divided by that.
+CHUNK_MEMORY_BYTES = int(os.environ.get("DASHBOARD_CHUNK_MB", "64")) * MB
+WORKING_SET_FACTOR = 4
+
+# Rows decoded up front to measure the width of a row.
+SAMPLE_ROWS = 1_000
+
+PRODUCT_DAY_KEYS = ["Transaction Date", "product_id"]
+PRODUCT_DAY_COLUMNS = PRODUCT_DAY_KEYS + ["quantity_sold", "total_amount"]
+
+# Key under which the loaded data carries the product x day totals of its
+# whole sales table, so the views share one scan per data version.
+PRODUCT_DAY_TOTALS = "product_day_totals"
+
+# -------------------------------------------------
+# SOURCES
+# -------------------------------------------------
+def open_source(path):
+    # An Arrow IPC file, a Parquet file, or a directory of either (one file
+    # per partition).
+    if os.path.isdir(path):
+        names = [name for name in os.listdir(path) if not name.startswith(".")]
+        fmt = "parquet" if names and all(name.endswith(".parquet") for name in names) else "ipc"
+    else:
+        fmt = "parquet" if path.endswith(".parquet") else "ipc"
+    return ds.dataset(path, format=fmt)
+
+def chunk_rows(bytes_per_row, memory_bytes=CHUNK_MEMORY_BYTES):
+    return max(int(memory_bytes / WORKING_SET_FACTOR / max(bytes_per_row, 1)), 1)
+
+def iter_chunks(source, columns, memory_bytes=CHUNK_MEMORY_BYTES):
+    # Yields DataFrames of the requested columns, each small enough that its
+    # working set fits memory_bytes. In-memory frames are sliced; on-disk
+    # sources are decoded one batch at a time and never loaded whole.
+    if isinstance(source, pd.DataFrame):
+        frame = source[columns]
+        sample = frame.head(SAMPLE_ROWS)
+        rows = chunk_rows(sample.memory_usage(deep=True).sum() / max(len(sample), 1), memory_bytes)
+        for start in range(0, len(frame), rows):
+            yield frame.iloc[start:start + rows]
+        return
+
+    dataset = open_source(source)
+    sample = dataset.head(SAMPLE_ROWS, columns=columns).to_pandas()
+    rows = chunk_rows(sample.memory_usage(deep=True).sum() / max(len(sample), 1), memory_bytes)
+    for batch in dataset.to_batches(columns=columns, batch_size=rows):
+        if batch.num_rows:
+            yield batch.to_pandas()
+
+# -------------------------------------------------
+# PARTIAL AGGREGATES
+# -------------------------------------------------
+def merge_partials(total, partial):
+    # Partials share an index, so merging is a re-group of their union; the
+    # result only ever holds one row per key.
+    if total is None:
+        return partial
+    return pd.concat([total, partial]).groupby(level=list(range(partial.index.nlevels))).sum()
+
+def daily_product_totals(source, memory_bytes=CHUNK_MEMORY_BYTES):
+    # Units and revenue per (Transaction Date, product_id), the partial every
+    # sales aggregate below is derived from. Its size is days x products no
+    # matter how many lines the source holds.
+    total = None
+    for chunk in iter_chunks(source, PRODUCT_DAY_COLUMNS, memory_bytes):
+        partial = chunk.groupby(PRODUCT_DAY_KEYS, sort=False)[["quantity_sold", "total_amount"]].sum()
+        total = merge_partials(total, partial)
+
+    if total is None:
+        index = pd.MultiIndex.from_arrays(
+            [pd.DatetimeIndex([]), pd.Index([], dtype="int64")], names=PRODUCT_DAY_KEYS
+        )
+        return pd.DataFrame({"quantity_sold": np.array([], dtype="int64"), "total_amount": np.array([], dtype="int64")}, index=index)
+    return total.sort_index()
+
+def product_day_totals(data):
+    # The totals attached to data when they cover its sales, else a fresh
+    # scan of data["sales"].
+    totals = data.get(PRODUCT_DAY_TOTALS)
+    return daily_product_totals(data["sales"]) if totals is None else totals
+
+# -------------------------------------------------
+# AGGREGATES
+# -------------------------------------------------
+def daily_revenue(totals):
+    return totals.groupby(level="Transaction Date")["total_amount"].sum()
+
+def product_totals(totals, products):
+    # One row per product with its attributes, units, revenue and cost of
+    # goods sold. Lines for products missing from the master are dropped, as
+    # the inner merges elsewhere do.
+    grouped = totals.groupby(level="product_id")[["quantity_sold", "total_amount"]].sum().reset_index()
+    merged = grouped.merge(products, on="product_id")
+    merged["cost"] = merged["quantity_sold"] * merged["cost_price"]
+    return merged
+
+def top_products(totals, products, by="quantity_sold", n=10):
+    return product_totals(totals, products).sort_values(by, ascending=False).head(n)
+
+def cost_of_goods_sold(totals, products):
+    return product_totals(totals, products)["cost"].sum()
+
+def category_demand(totals, products):
+    # Units per (Month, category), months as "YYYY-MM" like the Month column.
+    frame = totals["quantity_sold"].reset_index().merge(products[["product_id", "category"]], on="product_id")
+    frame["Month"] = frame["Transaction Date"].dt.to_period("M").astype(str)
+    return frame.groupby(["Month", "category"])["quantity_sold"].sum().reset_index()
@@ -0,0 +1,129 @@
+import numpy as np
+import pandas as pd
+
+RFM_BINS = 5
+
+# Segment names by (recency score, frequency score) band, highest first.
+RFM_SEGMENTS = [
+    ("Champions", 4, 4),
+    ("Loyal", 3, 4),
+    ("Promising", 4, 1),
+    ("Needs Attention", 3, 1),
+    ("At Risk", 1, 3),
+    ("Hibernating", 1, 1)
+]
+
+# -------------------------------------------------
+# CUSTOMER x DAY AGGREGATES
+# -------------------------------------------------
+def customer_daily_aggregates(sales):
+    # One row per customer per visit day. Everything below reads this table,
+    # which is far smaller than the line-level sales.
+    return sales.groupby(["customer_id", "Transaction Date"], sort=False).agg(
+        spend=("total_amount", "sum"),
+        units=("quantity_sold", "sum"),
+        lines=("transaction_id", "count")
+    ).reset_index()
+
+# -------------------------------------------------
+# RFM
+# -------------------------------------------------
+def score(values, higher_is_better=True):
+    # Quantile score in 1..RFM_BINS from the percentile rank; ties share a score.
+    ranks = pd.Series(values).rank(pct=True, method="average", ascending=higher_is_better)
+    return np.ceil(ranks.to_numpy() * RFM_BINS).clip(1, RFM_BINS).astype(int)
+
+def rfm_scores(aggregates, as_of=None):
+    as_of = as_of if as_of is not None else aggregates["Transaction Date"].max()
+
+    rfm = aggregates.groupby("customer_id").agg(
+        last_visit=("Transaction Date", "max"),
+        frequency=("Transaction Date", "count"),
+        monetary=("spend", "sum")
+    ).reset_index()
+    rfm["recency_days"] = (as_of - rfm["last_visit"]).dt.days
+
+    rfm["r_score"] = score(rfm["recency_days"], higher_is_better=False)
+    rfm["f_score"] = score(rfm["frequency"])
+    rfm["m_score"] = score(rfm["monetary"])
+    rfm["rfm_score"] = rfm["r_score"] * 100 + rfm["f_score"] * 10 + rfm["m_score"]
+
+    segment = np.full(len(rfm), "Others", dtype=object)
+    assigned = np.zeros(len(rfm), dtype=bool)
+    for name, min_r, min_f in RFM_SEGMENTS:
+        match = ~assigned & (rfm["r_score"].to_numpy() >= min_r) & (rfm["f_score"].to_numpy() >= min_f)
+        segment[match] = name
+        assigned |= match
+    rfm["segment"] = segment
+
+    return rfm
+
+# -------------------------------------------------
+# RETENTION COHORTS
+# -------------------------------------------------
+def retention_cohorts(aggregates):
+    # Months are counted as integer period ordinals so the whole cohort matrix
+    # is one bincount over (cohort, months since first purchase).
+    dates = aggregates["Transaction Date"]
+    month = ((dates.dt.year - 1970) * 12 + dates.dt.month - 1).to_numpy()
+    customer = aggregates["customer_id"].to_numpy()
+
+    active = pd.DataFrame({"customer_id": customer, "month": month}).drop_duplicates()
+    first_month = active.groupby("customer_id")["month"].transform("min").to_numpy()
+    age = active["month"].to_numpy() - first_month
+
+    base = first_month.min()
+    cohort = first_month - base
+    n_cohorts, n_ages = cohort.max() + 1, age.max() + 1
+    counts = np.bincount(cohort * n_ages + age, minlength=n_cohorts * n_ages).reshape(n_cohorts, n_ages)
+
+    sizes = counts[:, 0]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        retention = np.where(sizes[:, None] > 0, counts / sizes[:, None], np.nan)
+
+    labels = pd.PeriodIndex.from_ordinals(base + np.arange(n_cohorts), freq="M").astype(str)
+    # Cells beyond the end of the data cannot have been observed yet.
+    months_observed = month.max() - base - np.arange(n_cohorts) + 1
+    observed = np.arange(n_ages)[None, :] < months_observed[:, None]
+    retention = np.where(observed, retention, np.nan)
+
+    return pd.DataFrame(retention, index=labels, columns=range(n_ages)), pd.Series(sizes, index=labels)
+
+# -------------------------------------------------
+# LOYALTY
+# -------------------------------------------------
+def loyalty_comparison(aggregates, customers):
+    per_customer = aggregates.groupby("customer_id").agg(
+        spend=("spend", "sum"),
+        visits=("Transaction Date", "count")
+    ).reset_index().merge(customers[["customer_id", "loyalty_member"]], on="customer_id", how="left")
+    per_customer["loyalty_member"] = per_customer["loyalty_member"].fillna("Unknown")
+
+    grouped = per_customer.groupby("loyalty_member").agg(
+        customers=("customer_id", "count"),
+        spend=("spend", "sum"),
+        visits=("visits", "sum")
+    ).reset_index()
+    grouped["spend_per_customer"] = grouped["spend"] / grouped["customers"]
+    grouped["visits_per_customer"] = grouped["visits"] / grouped["customers"]
+    grouped["spend_per_visit"] = grouped["spend"] / grouped["visits"]
+    grouped["revenue_share"] = grouped["spend"] / grouped["spend"].sum()
+    return grouped
+
+# -------------------------------------------------
+# BUNDLE
+# -------------------------------------------------
+def customer_analytics(data):
+    aggregates = customer_daily_aggregates(data["sales"])
+    if len(aggregates):
+        retention, cohort_sizes = retention_cohorts(aggregates)
+    else:
+        retention, cohort_sizes = pd.DataFrame(), pd.Series(dtype="int64")
+
+    return {
+        "aggregates": aggregates,
+        "rfm": rfm_scores(aggregates),
+        "retention": retention,
+        "cohort_sizes": cohort_sizes,
+        "loyalty": loyalty_comparison(aggregates, data["customers"])
+    }
@@ -0,0 +1,243 @@
+import numpy as np
+import pandas as pd
+
+from analytics.energy import WEEKDAYS
+from analytics.series import daily_matrix
+
+# Line discount as a share of list revenue (quantity x shelf price).
+DEPTH_EDGES = [0.02, 0.05, 0.10, 0.20]
+DEPTH_BANDS = ["No discount", "Under 2%", "2–5%", "5–10%", "10–20%", "20% and over"]
+
+BAND_KEYS = ["store_id", "product_id", "Date", "band"]
+PAYMENT_KEYS = ["store_id", "Date", "Hour", "payment_method"]
+MEASURES = ["lines", "units", "list_revenue", "discount", "revenue", "cost"]
+
+# A product-day whose overall discount depth reaches this share counts as a
+# promotion day; consecutive promotion days form one discount period.
+PROMO_DEPTH = 0.05
+# Days either side of a discount period used as its baseline.
+BASELINE_DAYS = 28
+MIN_BASELINE_DAYS = 7
+
+# -------------------------------------------------
+# ROLLUP
+# -------------------------------------------------
+def depth_band(depth):
+    return np.where(depth > 0, 1 + np.searchsorted(DEPTH_EDGES, depth, side="right"), 0)
+
+def discount_lines(sales, products):
+    # Lines for products missing from the master are dropped, as the inner
+    # merges elsewhere do.
+    cost_price = sales["product_id"].map(products.set_index("product_id")["cost_price"])
+    known = cost_price.notna().to_numpy()
+    sales = sales[known]
+
+    units = sales["quantity_sold"].to_numpy(dtype="float64")
+    list_revenue = units * sales["unit_selling_price"].to_numpy(dtype="float64")
+    discount = sales["discount_amount"].to_numpy(dtype="float64")
+    depth = np.divide(discount, list_revenue, out=np.zeros(len(sales)), where=list_revenue > 0)
+
+    return pd.DataFrame({
+        "store_id": sales["store_id"].to_numpy(),
+        "product_id": sales["product_id"].to_numpy(),
+        "Date": sales["Transaction Date"].dt.normalize().to_numpy(),
+        "Hour": sales["Hour"].to_numpy(),
+        "payment_method": sales["payment_method"].to_numpy(),
+        "band": depth_band(depth),
+        "lines": np.ones(len(sales), dtype="int64"),
+        "units": units,
+        "list_revenue": list_revenue,
+        "discount": discount,
+        "revenue": sales["total_amount"].to_numpy(dtype="float64"),
+        "cost": units * cost_price[known].to_numpy(dtype="float64")
+    })
+
+def discount_rollup(sales, products):
+    # Two compact aggregates every view slices: discount depth bands per
+    # store x product x day, and payment methods per store x day x hour. Their
+    # size is set by those keys, not by the number of lines.
+    lines = discount_lines(sales, products)
+    return {
+        "bands": lines.groupby(BAND_KEYS, sort=False)[MEASURES].sum().reset_index(),
+        "payments": lines.groupby(PAYMENT_KEYS, sort=False)[["lines", "revenue"]].sum().reset_index()
+    }
+
+def slice_frame(frame, start=None, end=None, store_id=None):
+    mask = np.ones(len(frame), dtype=bool)
+    if start is not None:
+        mask &= (frame["Date"] >= pd.Timestamp(start)).to_numpy()
+    if end is not None:
+        mask &= (frame["Date"] <= pd.Timestamp(end)).to_numpy()
+    if store_id is not None:
+        mask &= (frame["store_id"] == store_id).to_numpy()
+    return frame[mask]
+
+def slice_bands(rollup, products, start=None, end=None, store_id=None, category=None):
+    bands = slice_frame(rollup["bands"], start, end, store_id).merge(
+        products[["product_id", "product_name", "category"]], on="product_id"
+    )
+    if category is not None:
+        bands = bands[bands["category"] == category]
+    return bands
+
+# -------------------------------------------------
+# DISCOUNT DEPTH
+# -------------------------------------------------
+def with_margins(frame):
+    frame = frame.copy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        frame["discount_rate"] = np.where(frame["list_revenue"] > 0, frame["discount"] / frame["list_revenue"], np.nan)
+        frame["list_margin"] = np.where(frame["list_revenue"] > 0, 1 - frame["cost"] / frame["list_revenue"], np.nan)
+        frame["net_margin"] = np.where(frame["revenue"] > 0, 1 - frame["cost"] / frame["revenue"], np.nan)
+        frame["units_per_line"] = np.where(frame["lines"] > 0, frame["units"] / frame["lines"], np.nan)
+    return frame
+
+def discount_summary(bands):
+    totals = bands[MEASURES].sum()
+    summary = with_margins(totals.to_frame().T).iloc[0]
+    return summary.to_dict()
+
+def depth_response(bands, group=None):
+    # Units per line and margins for every discount depth band, optionally per
+    # category or product.
+    keys = ([group] if group else []) + ["band"]
+    grouped = with_margins(bands.groupby(keys)[MEASURES].sum().reset_index())
+    grouped["Depth"] = np.array(DEPTH_BANDS)[grouped["band"].to_numpy()]
+    return grouped
+
+def discount_by_group(bands, group="category"):
+    grouped = with_margins(bands.groupby(group)[MEASURES].sum().reset_index())
+    grouped["margin_given_up"] = grouped["list_margin"] - grouped["net_margin"]
+    return grouped.sort_values("discount", ascending=False).reset_index(drop=True)
+
+# -------------------------------------------------
+# PAYMENT MIX
+# -------------------------------------------------
+def payment_mix(rollup, by="Hour", start=None, end=None, store_id=None, measure="lines"):
+    # Share of lines (or revenue) paid by each method for every value of by:
+    # "Hour", "Month", "Day Of Week" or "store_id".
+    payments = slice_frame(rollup["payments"], start, end, store_id)
+    if by == "Month":
+        key = payments["Date"].dt.to_period("M").astype(str).rename("Month")
+    elif by == "Day Of Week":
+        key = pd.Series(
+            pd.Categorical(payments["Date"].dt.day_name(), categories=WEEKDAYS, ordered=True),
+            index=payments.index, name="Day Of Week"
+        )
+    else:
+        key = payments[by]
+
+    grouped = payments.groupby([key, payments["payment_method"]], observed=True)[measure].sum().unstack(fill_value=0)
+    shares = grouped.div(grouped.sum(axis=1).replace(0, np.nan), axis=0)
+    return shares.stack().rename("share").reset_index().merge(
+        grouped.stack().rename(measure).reset_index(), on=[grouped.index.name, "payment_method"]
+    )
+
+# -------------------------------------------------
+# BEFORE / AFTER UPLIFT
+# -------------------------------------------------
+def trailing_sums(values, window):
+    # values[:, t] summed over the window days before t (t itself excluded).
+    padded = np.concatenate([np.zeros((values.shape[0], 1)), np.cumsum(values, axis=1)], axis=1)
+    ends = np.arange(values.shape[1])
+    starts = np.maximum(ends - window, 0)
+    return padded[:, ends] - padded[:, starts]
+
+def promo_uplift(bands, promo_depth=PROMO_DEPTH, baseline_days=BASELINE_DAYS, min_baseline_days=MIN_BASELINE_DAYS):
+    # One row per discount period: consecutive days on which a store-product's
+    # discount depth reached promo_depth. Expected units are the average
+    # daily units over the non-promotion days in the baseline_days before the
+    # period; the same average over the days after shows any post-promotion
+    # dip. Every series is handled at once with cumulative sums over a
+    # store-product x day matrix.
+    daily = bands.groupby(["store_id", "product_id", "Date"])[["units", "list_revenue", "discount", "revenue", "cost"]].sum().reset_index()
+    if daily.empty:
+        return pd.DataFrame(columns=[
+            "store_id", "product_id", "start", "end", "days", "depth", "units", "expected_units",
+            "uplift", "post_change", "incremental_units", "discount", "discount_per_incremental_unit"
+        ])
+
+    series, dates, units = daily_matrix(daily, "Date", "units", ["store_id", "product_id"])
+    _, _, list_revenue = daily_matrix(daily, "Date", "list_revenue", ["store_id", "product_id"])
+    _, _, discount = daily_matrix(daily, "Date", "discount", ["store_id", "product_id"])
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        depth = np.where(list_revenue > 0, discount / list_revenue, 0.0)
+    promo = depth >= promo_depth
+    normal = ~promo
+
+    before_units = trailing_sums(units * normal, baseline_days)
+    before_days = trailing_sums(normal.astype("float64"), baseline_days)
+    # The same sums on the time-reversed matrix look forward instead.
+    after_units = trailing_sums((units * normal)[:, ::-1], baseline_days)[:, ::-1]
+    after_days = trailing_sums(normal[:, ::-1].astype("float64"), baseline_days)[:, ::-1]
+
+    # Label each run of promotion days; a run starts where the day before was
+    # not a promotion day.
+    previous = np.concatenate([np.zeros((promo.shape[0], 1), dtype=bool), promo[:, :-1]], axis=1)
+    following = np.concatenate([promo[:, 1:], np.zeros((promo.shape[0], 1), dtype=bool)], axis=1)
+    start_row, start_day = np.nonzero(promo & ~previous)
+    end_row, end_day = np.nonzero(promo & ~following)
+    run_id = np.cumsum(promo & ~previous).reshape(promo.shape) - 1
+
+    rows, days = np.nonzero(promo)
+    runs = run_id[rows, days]
+    n_runs = len(start_row)
+
+    def per_run(values):
+        return np.bincount(runs, weights=values[rows, days], minlength=n_runs)
+
+    run_units = per_run(units)
+    run_discount = per_run(discount)
+    run_list = per_run(list_revenue)
+    run_days = end_day - start_day + 1
+
+    base_days = before_days[start_row, start_day]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        base_rate = np.where(base_days >= min_baseline_days, before_units[start_row, start_day] / base_days, np.nan)
+        post_days = after_days[end_row, end_day]
+        post_rate = np.where(post_days >= min_baseline_days, after_units[end_row, end_day] / post_days, np.nan)
+        expected = base_rate * run_days
+        uplift = np.where(expected > 0, run_units / expected - 1, np.nan)
+        post_change = np.where(base_rate > 0, post_rate / base_rate - 1, np.nan)
+        incremental = run_units - expected
+        per_unit = np.where(incremental > 0, run_discount / incremental, np.nan)
+
+    return pd.DataFrame({
+        "store_id": series["store_id"].to_numpy()[start_row],
+        "product_id": series["product_id"].to_numpy()[start_row],
+        "start": dates[start_day],
+        "end": dates[end_day],
+        "days": run_days,
+        "depth": np.divide(run_discount, run_list, out=np.zeros(n_runs), where=run_list > 0),
+        "units": run_units,
+        "expected_units": expected,
+        "uplift": uplift,
+        "post_change": post_change,
+        "incremental_units": incremental,
+        "discount": run_discount,
+        "discount_per_incremental_unit": per_unit
+    })
+
+def uplift_by_product(runs, products):
+    # Pooled over every period of each product: total against expected units,
+    # so long periods weigh more than one-day ones.
+    scored = runs.dropna(subset=["expected_units"])
+    grouped = scored.groupby("product_id").agg(
+        periods=("start", "count"),
+        promo_days=("days", "sum"),
+        units=("units", "sum"),
+        expected_units=("expected_units", "sum"),
+        discount=("discount", "sum"),
+        mean_post_change=("post_change", "mean")
+    ).reset_index()
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        grouped["uplift"] = np.where(grouped["expected_units"] > 0, grouped["units"] / grouped["expected_units"] - 1, np.nan)
+        grouped["incremental_units"] = grouped["units"] - grouped["expected_units"]
+        grouped["discount_per_incremental_unit"] = np.where(
+            grouped["incremental_units"] > 0, grouped["discount"] / grouped["incremental_units"], np.nan
+        )
+    return grouped.merge(products[["product_id", "product_name", "category"]], on="product_id").sort_values(
+        "uplift", ascending=False
+    ).reset_index(drop=True)
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+
+from analytics.rolling import ENERGY_CATEGORY
+
+ENERGY_KEYS = ["store_id", "Date"]
+
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+# -------------------------------------------------
+# STORE x DAY x HOUR ROLLUP
+# -------------------------------------------------
+def hourly_sales(sales):
+    lines = pd.DataFrame({
+        "store_id": sales["store_id"].to_numpy(),
+        "Date": sales["Transaction Date"].to_numpy(),
+        "Hour": sales["Hour"].to_numpy(),
+        "revenue": sales["total_amount"].to_numpy(dtype="float64"),
+        "transactions": np.ones(len(sales), dtype="int64")
+    })
+    return lines.groupby(ENERGY_KEYS + ["Hour"], sort=False).sum().reset_index()
+
+def daily_energy(expenses, hourly):
+    energy = expenses[expenses["expense_category"] == ENERGY_CATEGORY].groupby(
+        ["store_id", "Expense Date"]
+    )["expense_amount"].sum().rename("energy_cost").rename_axis(ENERGY_KEYS).reset_index()
+
+    trading = hourly.groupby(ENERGY_KEYS).agg(
+        revenue=("revenue", "sum"),
+        transactions=("transactions", "sum"),
+        trading_hours=("Hour", "count")
+    ).reset_index()
+
+    daily = trading.merge(energy, on=ENERGY_KEYS, how="outer").fillna(0)
+    daily["Day Of Week"] = daily["Date"].dt.day_name()
+    return daily
+
+def energy_rollup(sales, expenses):
+    # Spend is only recorded per day, so each day's spend is spread evenly over
+    # the hours that day had sales to compare it with hourly revenue.
+    hourly = hourly_sales(sales)
+    daily = daily_energy(expenses, hourly)
+
+    hourly = hourly.merge(daily[ENERGY_KEYS + ["energy_cost", "trading_hours"]], on=ENERGY_KEYS, how="left")
+    hourly["energy_cost"] = hourly["energy_cost"] / hourly["trading_hours"]
+    return {"daily": daily, "hourly": hourly.drop(columns="trading_hours")}
+
+# -------------------------------------------------
+# EFFICIENCY
+# -------------------------------------------------
+def slice_rollup(rollup, start=None, end=None, store_id=None):
+    sliced = {}
+    for name, frame in rollup.items():
+        mask = np.ones(len(frame), dtype=bool)
+        if start is not None:
+            mask &= (frame["Date"] >= pd.Timestamp(start)).to_numpy()
+        if end is not None:
+            mask &= (frame["Date"] <= pd.Timestamp(end)).to_numpy()
+        if store_id is not None:
+            mask &= (frame["store_id"] == store_id).to_numpy()
+        sliced[name] = frame[mask]
+    return sliced
+
+def with_ratios(frame):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        frame["cost_per_100_revenue"] = np.where(frame["revenue"] > 0, frame["energy_cost"] / frame["revenue"] * 100, np.nan)
+        frame["cost_per_transaction"] = np.where(frame["transactions"] > 0, frame["energy_cost"] / frame["transactions"], np.nan)
+    return frame
+
+def energy_efficiency(rollup, start=None, end=None, store_id=None):
+    daily = slice_rollup(rollup, start, end, store_id)["daily"]
+    totals = with_ratios(daily[["energy_cost", "revenue", "transactions"]].sum().to_frame().T)
+    summary = totals.iloc[0].to_dict()
+    summary["days"] = int(daily["Date"].nunique())
+    return summary
+
+def energy_by_weekday(rollup, start=None, end=None, store_id=None):
+    daily = slice_rollup(rollup, start, end, store_id)["daily"]
+    grouped = daily.groupby("Day Of Week")[["energy_cost", "revenue", "transactions"]].sum()
+    return with_ratios(grouped.reindex(WEEKDAYS).dropna(how="all").reset_index())
+
+def energy_by_hour(rollup, start=None, end=None, store_id=None):
+    hourly = slice_rollup(rollup, start, end, store_id)["hourly"]
+    grouped = hourly.groupby("Hour")[["energy_cost", "revenue", "transactions"]].sum().reset_index()
+    return with_ratios(grouped)
@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+
+from analytics.series import daily_matrices
+
+RISK_HORIZON_DAYS = 14
+VELOCITY_WINDOW_DAYS = 28
+
+# -------------------------------------------------
+# RECEIPT COHORTS
+# -------------------------------------------------
+def receipt_cohorts(inventory):
+    # Rebuilds per store/product receipt cohorts: the opening stock of each
+    # series' first snapshot day plus every day's received_qty. Returns the
+    # series keys, the calendar, the (series x day) receipts and the current
+    # closing stock.
+    keys, dates, values = daily_matrices(
+        inventory.assign(observed=1),
+        "Snapshot Date",
+        ["received_qty", "opening_stock", "closing_stock", "sold_qty", "observed"]
+    )
+
+    # A series first stocked mid-period opens on its own first snapshot day,
+    # and one without a snapshot on the last day keeps the closing stock of
+    # the last day it has one, rather than reading as empty.
+    rows = np.arange(len(keys))
+    observed = values["observed"] > 0
+    days = np.arange(len(dates))
+    first_observed = np.where(observed, days, len(dates)).min(axis=1)
+    last_observed = np.where(observed, days, -1).max(axis=1)
+
+    received = values["received_qty"].copy()
+    received[rows, first_observed] += values["opening_stock"][rows, first_observed]
+
+    return keys, dates, received, values["closing_stock"][rows, last_observed], values["sold_qty"]
+
+def fefo_remaining(received, stock_on_hand):
+    # With one shelf life per product, first-expired-first-out is the same as
+    # issuing the oldest receipt first, so the units still on hand are the most
+    # recent receipts that add up to today's stock. Cohort r covers the
+    # cumulative-receipt interval (cum[r] - received[r], cum[r]]; everything up
+    # to cum[-1] - stock_on_hand has already left the shelf.
+    cumulative = received.cumsum(axis=1)
+    issued = np.clip(cumulative[:, -1] - stock_on_hand, 0, None)[:, None]
+    return np.clip(cumulative - np.maximum(issued, cumulative - received), 0, None), cumulative, issued
+
+# -------------------------------------------------
+# EXPIRY RISK
+# -------------------------------------------------
+def expiry_cohorts(inventory, products, horizon_days=RISK_HORIZON_DAYS, window_days=VELOCITY_WINDOW_DAYS):
+    if inventory.empty:
+        no_dates = pd.Series(dtype="datetime64[ns]")
+        return inventory[["store_id", "product_id"]].assign(
+            product_name=pd.Series(dtype=object), received_date=no_dates, expiry_date=no_dates,
+            days_to_expiry=0.0, units_on_hand=0.0, units_at_risk=0.0, value_at_risk=0.0, past_expiry=False
+        ).reset_index(drop=True)
+
+    keys, dates, received, stock_on_hand, sold = receipt_cohorts(inventory)
+    remaining, cumulative, issued = fefo_remaining(received, stock_on_hand)
+
+    product_info = keys[["product_id"]].merge(
+        products[["product_id", "product_name", "shelf_life_days", "cost_price"]],
+        on="product_id",
+        how="left"
+    )
+    shelf_life = product_info["shelf_life_days"].to_numpy(dtype="float64")[:, None]
+    cost_price = product_info["cost_price"].to_numpy(dtype="float64")[:, None]
+
+    # Days from the last snapshot until each cohort expires.
+    age = np.arange(len(dates) - 1, -1, -1, dtype="float64")[None, :]
+    days_to_expiry = shelf_life - age
+
+    # Expected sales keep draining the oldest cohorts until each one expires;
+    # whatever is left of a cohort on its expiry day is at risk.
+    velocity = sold[:, -window_days:].mean(axis=1)[:, None]
+    drained = issued + velocity * np.clip(days_to_expiry, 0, None)
+    at_risk = np.clip(cumulative - np.maximum(drained, cumulative - received), 0, None)
+
+    in_horizon = (remaining > 0) & (days_to_expiry >= 0) & (days_to_expiry <= horizon_days)
+    past_expiry = (remaining > 0) & (days_to_expiry < 0)
+
+    series, day = np.nonzero(in_horizon | past_expiry)
+    cohorts = keys.iloc[series].reset_index(drop=True)
+    cohorts["product_name"] = product_info["product_name"].to_numpy()[series]
+    cohorts["received_date"] = dates[day]
+    cohorts["expiry_date"] = cohorts["received_date"] + pd.to_timedelta(shelf_life[series, 0], unit="D")
+    cohorts["days_to_expiry"] = days_to_expiry[series, day]
+    cohorts["units_on_hand"] = remaining[series, day]
+    cohorts["units_at_risk"] = np.where(past_expiry[series, day], remaining[series, day], at_risk[series, day])
+    cohorts["value_at_risk"] = cohorts["units_at_risk"] * cost_price[series, 0]
+    cohorts["past_expiry"] = past_expiry[series, day]
+
+    return cohorts[cohorts["units_at_risk"] > 0].reset_index(drop=True)
+
+def expiry_risk_by_product(cohorts):
+    return cohorts.groupby(["store_id", "product_id", "product_name"]).agg(
+        units_at_risk=("units_at_risk", "sum"),
+        value_at_risk=("value_at_risk", "sum"),
+        next_expiry=("expiry_date", "min")
+    ).reset_index().sort_values("value_at_risk", ascending=False)
+
+def expiry_risk_by_day(cohorts):
+    upcoming = cohorts[~cohorts["past_expiry"]]
+    return upcoming.groupby("expiry_date")["value_at_risk"].sum().reset_index()
@@ -0,0 +1,138 @@
+import numpy as np
+import pandas as pd
+
+from analytics.series import daily_matrix
+
+HORIZON_DAYS = 14
+BACKTEST_DAYS = 14
+SEASON_LENGTH = 7
+PROFILE_WEEKS = 8
+ALPHA_GRID = np.linspace(0.05, 0.95, 19)
+
+# The backtest needs a full season of training data before the holdout.
+MIN_HISTORY_DAYS = BACKTEST_DAYS + 2 * SEASON_LENGTH
+
+# z-score for the 90% prediction interval.
+INTERVAL_Z = 1.645
+
+MODELS = ["Seasonal Naive", "Exponential Smoothing", "Day-Of-Week Profile"]
+
+# -------------------------------------------------
+# INPUT SERIES
+# -------------------------------------------------
+def demand_matrix(data, source="sales"):
+    if source == "sales":
+        return daily_matrix(data["sales"], "Transaction Date", "quantity_sold")
+    return daily_matrix(data["inventory"], "Snapshot Date", "sold_qty")
+
+def has_enough_history(data, source="sales"):
+    frame, column = (data["sales"], "Transaction Date") if source == "sales" else (data["inventory"], "Snapshot Date")
+    if frame.empty:
+        return False
+    return (frame[column].max() - frame[column].min()).days + 1 >= MIN_HISTORY_DAYS
+
+# -------------------------------------------------
+# MODELS
+# -------------------------------------------------
+# Every model takes the full (series x days) history and returns a
+# (series x horizon) forecast. Loops run over time steps or horizon days only,
+# never over series.
+def seasonal_naive(history, horizon, season=SEASON_LENGTH):
+    last_season = history[:, -season:]
+    return last_season[:, np.arange(horizon) % season]
+
+def exponential_smoothing(history, horizon, alphas=ALPHA_GRID):
+    # Runs the level recursion for every alpha in the grid side by side and
+    # keeps, per series, the alpha with the lowest one-step-ahead error.
+    alphas = alphas[:, None]
+    level = np.repeat(history[None, :, 0], len(alphas), axis=0)
+    sse = np.zeros_like(level)
+
+    for t in range(1, history.shape[1]):
+        error = history[:, t] - level
+        sse += error ** 2
+        level += alphas * error
+
+    best = sse.argmin(axis=0)
+    final_level = level[best, np.arange(history.shape[0])]
+    return np.repeat(final_level[:, None], horizon, axis=1)
+
+def day_of_week_profile(history, horizon, season=SEASON_LENGTH, weeks=PROFILE_WEEKS):
+    weeks = max(1, min(weeks, history.shape[1] // season))
+    recent = history[:, -weeks * season:].reshape(history.shape[0], weeks, season)
+    profile = recent.mean(axis=1)
+    return profile[:, np.arange(horizon) % season]
+
+MODEL_FUNCTIONS = [seasonal_naive, exponential_smoothing, day_of_week_profile]
+
+# -------------------------------------------------
+# FIT AND SELECT
+# -------------------------------------------------
+def fit_forecasts(values, horizon=HORIZON_DAYS, backtest=BACKTEST_DAYS):
+    train, holdout = values[:, :-backtest], values[:, -backtest:]
+
+    # Backtest every model on the last few weeks and keep the best per series.
+    errors = np.stack([
+        model(train, backtest) - holdout for model in MODEL_FUNCTIONS
+    ])
+    mae = np.abs(errors).mean(axis=2)
+    best = mae.argmin(axis=0)
+    rows = np.arange(values.shape[0])
+    rmse = np.sqrt((errors[best, rows] ** 2).mean(axis=1))
+
+    forecasts = np.stack([model(values, horizon) for model in MODEL_FUNCTIONS])
+    forecast = forecasts[best, rows]
+
+    # The backtest error already spans a multi-day horizon, so it is used as
+    # a constant interval width.
+    spread = INTERVAL_Z * rmse[:, None]
+
+    return {
+        "forecast": forecast,
+        "lower": np.clip(forecast - spread, 0, None),
+        "upper": forecast + spread,
+        "model": np.array(MODELS)[best],
+        "mae": mae[best, rows],
+        "rmse": rmse
+    }
+
+def forecast_demand(data, horizon=HORIZON_DAYS, source="sales"):
+    keys, dates, values = demand_matrix(data, source)
+    fitted = fit_forecasts(values, horizon)
+    future = pd.date_range(dates[-1] + pd.Timedelta(days=1), periods=horizon)
+
+    n_series = len(keys)
+    forecast = keys.loc[keys.index.repeat(horizon)].reset_index(drop=True)
+    forecast["Date"] = np.tile(future, n_series)
+    forecast["Forecast"] = fitted["forecast"].ravel()
+    forecast["Lower"] = fitted["lower"].ravel()
+    forecast["Upper"] = fitted["upper"].ravel()
+    forecast["Model"] = np.repeat(fitted["model"], horizon)
+
+    history = keys.loc[keys.index.repeat(len(dates))].reset_index(drop=True)
+    history["Date"] = np.tile(dates, n_series)
+    history["Units Sold"] = values.ravel()
+
+    return history, forecast
+
+# -------------------------------------------------
+# AGGREGATION
+# -------------------------------------------------
+def total_forecast(history, forecast, product_id=None):
+    if product_id is not None:
+        history = history[history["product_id"] == product_id]
+        forecast = forecast[forecast["product_id"] == product_id]
+
+    actual = history.groupby("Date")["Units Sold"].sum().reset_index()
+
+    # Interval half-widths add in quadrature when independent series are summed.
+    forecast = forecast.assign(Spread=(forecast["Upper"] - forecast["Forecast"]) ** 2)
+    predicted = forecast.groupby("Date").agg(
+        Forecast=("Forecast", "sum"),
+        Spread=("Spread", "sum")
+    ).reset_index()
+    spread = np.sqrt(predicted.pop("Spread"))
+    predicted["Lower"] = np.clip(predicted["Forecast"] - spread, 0, None)
+    predicted["Upper"] = predicted["Forecast"] + spread
+
+    return actual, predicted
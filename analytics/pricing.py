@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+
+SCOPES = ["all", "category", "supplier"]
+
+# Price changes to sweep for the sensitivity curve, as fractions.
+SWEEP_CHANGES = np.round(np.arange(-0.30, 0.301, 0.01), 2)
+SWEEP_ELASTICITIES = [0.0, -0.5, -1.0, -1.5, -2.0]
+
+# -------------------------------------------------
+# PRODUCT BASELINE
+# -------------------------------------------------
+def product_baseline(sales, products):
+    # One row per product with the quantities every scenario scales. Prices
+    # are realised averages, so the zero-change scenario reproduces the
+    # observed revenue and COGS exactly.
+    lines = pd.DataFrame({
+        "product_id": sales["product_id"].to_numpy(),
+        "units": sales["quantity_sold"].to_numpy(dtype="float64"),
+        "list_revenue": (sales["quantity_sold"] * sales["unit_selling_price"]).to_numpy(dtype="float64"),
+        "discount": sales["discount_amount"].to_numpy(dtype="float64")
+    })
+    totals = lines.groupby("product_id").sum()
+
+    baseline = products[["product_id", "product_name", "category", "supplier_id", "cost_price"]].merge(
+        totals.reset_index(), on="product_id", how="inner"
+    )
+    units = baseline["units"].to_numpy()
+    baseline["price"] = np.where(units > 0, baseline["list_revenue"] / np.maximum(units, 1), 0.0)
+    baseline["discount_per_unit"] = np.where(units > 0, baseline["discount"] / np.maximum(units, 1), 0.0)
+    return baseline.drop(columns=["list_revenue", "discount"]).reset_index(drop=True)
+
+# -------------------------------------------------
+# SCENARIOS
+# -------------------------------------------------
+def scenario_frame(scope="all", target=None, price_change=0.0, cost_change=0.0, discount_change=0.0, elasticity=0.0):
+    # Any argument may be a list; they are broadcast against each other to
+    # give one scenario per combination of positions.
+    columns = np.broadcast_arrays(
+        np.asarray(scope, dtype=object), np.asarray(target, dtype=object),
+        np.asarray(price_change, dtype="float64"), np.asarray(cost_change, dtype="float64"),
+        np.asarray(discount_change, dtype="float64"), np.asarray(elasticity, dtype="float64")
+    )
+    names = ["scope", "target", "price_change", "cost_change", "discount_change", "elasticity"]
+    return pd.DataFrame({name: np.ravel(column) for name, column in zip(names, columns)})
+
+def scope_mask(baseline, scenarios):
+    # (scenario, product) mask of the products each scenario changes.
+    scope = scenarios["scope"].to_numpy()[:, None]
+    target = scenarios["target"].astype(str).to_numpy()[:, None]
+    category = baseline["category"].astype(str).to_numpy()[None, :]
+    supplier = baseline["supplier_id"].astype(str).to_numpy()[None, :]
+
+    return (
+        (scope == "all") |
+        ((scope == "category") & (category == target)) |
+        ((scope == "supplier") & (supplier == target))
+    )
+
+def scenario_arrays(baseline, scenarios):
+    # Every lever is a (scenario, product) array built by broadcasting the
+    # scenario column against the product row, so hundreds of scenarios are a
+    # handful of array operations over scenarios x products.
+    applies = scope_mask(baseline, scenarios)
+
+    def lever(column):
+        return 1 + scenarios[column].to_numpy()[:, None] * applies
+
+    price = baseline["price"].to_numpy()[None, :] * lever("price_change")
+    cost = baseline["cost_price"].to_numpy(dtype="float64")[None, :] * lever("cost_change")
+    discount = baseline["discount_per_unit"].to_numpy()[None, :] * lever("discount_change")
+
+    # Constant-elasticity demand response to the net price the shopper pays.
+    base_net = (baseline["price"] - baseline["discount_per_unit"]).to_numpy()[None, :]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        price_ratio = np.where(base_net > 0, (price - discount) / base_net, 1.0)
+    price_ratio = np.clip(price_ratio, 1e-6, None)
+    units = baseline["units"].to_numpy()[None, :] * price_ratio ** scenarios["elasticity"].to_numpy()[:, None]
+
+    return units, units * (price - discount), units * cost
+
+def simulate_scenarios(baseline, scenarios, operating_expenses=0.0):
+    units, revenue, cogs = scenario_arrays(baseline, scenarios)
+
+    result = scenarios.copy()
+    result["units"] = units.sum(axis=1)
+    result["revenue"] = revenue.sum(axis=1)
+    result["cogs"] = cogs.sum(axis=1)
+    result["gross_profit"] = result["revenue"] - result["cogs"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result["gross_margin"] = np.where(result["revenue"] > 0, result["gross_profit"] / result["revenue"], np.nan)
+    result["net_profit"] = result["gross_profit"] - operating_expenses
+    return result
+
+def compare_to_baseline(baseline, scenario, operating_expenses=0.0):
+    # Returns the (baseline, scenario) result rows for one scenario.
+    results = simulate_scenarios(baseline, pd.concat([scenario_frame(), scenario], ignore_index=True), operating_expenses)
+    return results.iloc[0], results.iloc[1]
+
+def price_sweep(baseline, scope="all", target=None, changes=SWEEP_CHANGES, elasticities=SWEEP_ELASTICITIES, operating_expenses=0.0):
+    # Net profit for every price change x elasticity pair in one call.
+    scenarios = scenario_frame(
+        scope, target,
+        price_change=np.asarray(changes)[None, :],
+        elasticity=np.asarray(elasticities)[:, None]
+    )
+    return simulate_scenarios(baseline, scenarios, operating_expenses)
+
+def scenario_by_group(baseline, scenario, group="category"):
+    # Baseline vs a single scenario, broken down by category or supplier.
+    both = pd.concat([scenario_frame(), scenario], ignore_index=True)
+    _, revenue, cogs = scenario_arrays(baseline, both)
+
+    detail = pd.DataFrame({
+        group: baseline[group].to_numpy(),
+        "base_revenue": revenue[0],
+        "revenue": revenue[1],
+        "base_gross_profit": revenue[0] - cogs[0],
+        "gross_profit": revenue[1] - cogs[1]
+    })
+    grouped = detail.groupby(group).sum()
+    grouped["revenue_change"] = grouped["revenue"] - grouped["base_revenue"]
+    grouped["gross_profit_change"] = grouped["gross_profit"] - grouped["base_gross_profit"]
+    return grouped.reset_index()
@@ -0,0 +1,130 @@
+import numpy as np
+import pandas as pd
+
+from analytics.series import SERIES_KEYS, daily_matrices
+
+DAY_KEYS = SERIES_KEYS + ["Date"]
+SNAPSHOT_MEASURES = ["sold_qty", "damaged_qty", "expired_qty"]
+
+# A store-product is flagged when, over the trailing window, the stock system
+# has recorded more units leaving than the tills rang up, by at least
+# MIN_GAP_SHARE of POS units and consistently enough that the mean daily gap
+# is GAP_Z standard errors above zero. One bad count day is not enough.
+GAP_WINDOW_DAYS = 14
+MIN_MATCHED_DAYS = 7
+MIN_GAP_SHARE = 0.02
+GAP_Z = 2.0
+
+STATUS_LABELS = {
+    1: "Probable shrinkage",
+    -1: "Sales not deducted from stock",
+    0: "Within tolerance"
+}
+
+# -------------------------------------------------
+# DAILY RECONCILIATION
+# -------------------------------------------------
+def pos_daily(sales):
+    return sales.groupby(
+        [sales["store_id"], sales["product_id"], sales["Transaction Date"].dt.normalize().rename("Date")],
+        sort=False
+    )["quantity_sold"].sum().rename("pos_qty").reset_index()
+
+def snapshot_daily(inventory):
+    return inventory.groupby(
+        [inventory["store_id"], inventory["product_id"], inventory["Snapshot Date"].dt.normalize().rename("Date")],
+        sort=False
+    )[SNAPSHOT_MEASURES].sum().reset_index()
+
+def reconcile_days(inventory, sales):
+    # One row per store x product x day found in either system. Both sides are
+    # reduced to that grain first, so the join is a single merge of two
+    # key-sized frames whatever the number of sales lines.
+    daily = snapshot_daily(inventory).merge(pos_daily(sales), on=DAY_KEYS, how="outer", indicator=True)
+    daily["has_snapshot"] = daily["_merge"] != "right_only"
+    daily["has_pos"] = daily["_merge"] != "left_only"
+    daily = daily.drop(columns="_merge")
+    daily[SNAPSHOT_MEASURES + ["pos_qty"]] = daily[SNAPSHOT_MEASURES + ["pos_qty"]].fillna(0).astype("int64")
+
+    # Positive: the stock system deducted more than was sold at the tills.
+    # Only days with a snapshot can be reconciled; a snapshot day without POS
+    # lines counts as zero sales.
+    daily["gap"] = np.where(daily["has_snapshot"], daily["sold_qty"] - daily["pos_qty"], 0)
+    return daily.sort_values(DAY_KEYS).reset_index(drop=True)
+
+# -------------------------------------------------
+# PERSISTENT GAPS
+# -------------------------------------------------
+def window_sums(values, window):
+    # values[:, t] summed over the window days ending at t.
+    padded = np.concatenate([np.zeros((values.shape[0], 1)), np.cumsum(values, axis=1)], axis=1)
+    ends = np.arange(1, values.shape[1] + 1)
+    return padded[:, ends] - padded[:, np.maximum(ends - window, 0)]
+
+def gap_matrix(daily, window_days=GAP_WINDOW_DAYS):
+    # Trailing-window gap statistics for every store-product and day at once.
+    # Returns (series keys, dates, dict of series x day arrays).
+    matched = daily[daily["has_snapshot"]].assign(
+        matched=1, gap_sq=lambda frame: frame["gap"].astype("float64") ** 2
+    )
+    series, dates, values = daily_matrices(matched, "Date", ["gap", "gap_sq", "matched", "pos_qty", "sold_qty"])
+    sums = {name: window_sums(matrix, window_days) for name, matrix in values.items()}
+
+    n = sums["matched"]
+    net_gap = sums["gap"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = net_gap / n
+        variance = np.maximum(sums["gap_sq"] / n - mean ** 2, 0.0) * n / (n - 1)
+        # A constant non-zero gap has no spread but is as persistent as it gets.
+        z = np.where(variance > 0, mean / np.sqrt(variance / n), np.sign(mean) * np.inf)
+        share = net_gap / np.maximum(sums["pos_qty"], sums["sold_qty"])
+
+    enough = n >= MIN_MATCHED_DAYS
+    status = np.where(enough & (z >= GAP_Z) & (share >= MIN_GAP_SHARE), 1, 0)
+    status = np.where(enough & (z <= -GAP_Z) & (share <= -MIN_GAP_SHARE), -1, status)
+
+    return series, dates, {
+        "matched_days": n,
+        "net_gap": net_gap,
+        "gap_share": share,
+        "z": z,
+        "status": status
+    }
+
+def flagged_run_days(status):
+    # Consecutive days, up to and including the last one, that each series
+    # has held its current status.
+    changed = np.concatenate([np.ones((status.shape[0], 1), dtype=bool), status[:, 1:] != status[:, :-1]], axis=1)
+    last_change = np.maximum.accumulate(np.where(changed, np.arange(status.shape[1]), 0), axis=1)[:, -1]
+    return status.shape[1] - last_change
+
+def shrinkage_summary(daily, products, window_days=GAP_WINDOW_DAYS, store_id=None):
+    # One row per store-product as of the last day: the trailing-window gap,
+    # its status and for how many days that status has held.
+    if store_id is not None:
+        daily = daily[daily["store_id"] == store_id]
+    if not daily["has_snapshot"].any():
+        return pd.DataFrame(columns=SERIES_KEYS + [
+            "product_name", "category", "matched_days", "net_gap", "gap_share", "z", "status",
+            "status_days", "gap_value", "written_off", "pos_qty", "sold_qty"
+        ])
+
+    series, dates, stats = gap_matrix(daily, window_days)
+    summary = series.assign(**{name: values[:, -1] for name, values in stats.items()})
+    summary["status_days"] = flagged_run_days(stats["status"])
+
+    recent = daily[daily["Date"] > dates[-1] - pd.Timedelta(days=window_days)]
+    totals = recent.groupby(SERIES_KEYS)[["pos_qty", "sold_qty", "damaged_qty", "expired_qty"]].sum()
+    summary = summary.merge(totals.reset_index(), on=SERIES_KEYS, how="left").merge(
+        products[["product_id", "product_name", "category", "cost_price"]], on="product_id", how="left"
+    )
+    summary["written_off"] = summary["damaged_qty"] + summary["expired_qty"]
+    summary["gap_value"] = summary["net_gap"] * summary["cost_price"]
+    return summary.sort_values(["status", "gap_value"], ascending=False).reset_index(drop=True)
+
+def reconciliation_trend(daily, store_id=None):
+    # Daily totals from both systems, for the trend chart.
+    if store_id is not None:
+        daily = daily[daily["store_id"] == store_id]
+    matched = daily[daily["has_snapshot"]]
+    return matched.groupby("Date")[["pos_qty", "sold_qty", "damaged_qty", "expired_qty", "gap"]].sum().reset_index()
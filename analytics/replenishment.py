@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+
+from analytics.series import SERIES_KEYS, daily_matrices
+
+VELOCITY_WINDOW_DAYS = 28
+LEAD_TIME_DAYS = 3
+
+# z-score for a 95% cycle service level.
+SERVICE_LEVEL_Z = 1.645
+
+# -------------------------------------------------
+# NORMAL DISTRIBUTION
+# -------------------------------------------------
+def normal_cdf(x):
+    # Abramowitz & Stegun 7.1.26 erf approximation (error < 1.5e-7), which
+    # keeps the engine on NumPy alone.
+    z = np.abs(x) / np.sqrt(2)
+    t = 1 / (1 + 0.3275911 * z)
+    poly = t * (0.254829592 + t * (-0.284496736 + t * (1.421413741 + t * (-1.453152027 + t * 1.061405429))))
+    erf = 1 - poly * np.exp(-z * z)
+    return 0.5 * (1 + np.sign(x) * erf)
+
+# -------------------------------------------------
+# TRAILING WINDOW
+# -------------------------------------------------
+class ReplenishmentState:
+    # Holds, per store/product series, the sum and sum of squares of sold_qty
+    # over the last VELOCITY_WINDOW_DAYS and the latest closing stock.
+
+    def __init__(self, keys, total, total_sq, days, closing_stock, as_of):
+        self.keys = keys.reset_index(drop=True)
+        self.total = total
+        self.total_sq = total_sq
+        self.days = days
+        self.closing_stock = closing_stock
+        self.as_of = as_of
+
+    @classmethod
+    def from_history(cls, inventory, window_days=VELOCITY_WINDOW_DAYS):
+        # Only the trailing window feeds the metrics, so the matrix is built
+        # over those days alone however long the history grows.
+        if inventory.empty:
+            return cls(inventory[SERIES_KEYS], np.zeros(0), np.zeros(0), 0, np.zeros(0), None)
+        last = inventory["Snapshot Date"].max()
+        first = max(inventory["Snapshot Date"].min(), last - pd.Timedelta(days=window_days - 1))
+        recent = inventory[inventory["Snapshot Date"] >= first].assign(observed=1)
+
+        keys, dates, values = daily_matrices(recent, "Snapshot Date", ["sold_qty", "closing_stock", "observed"])
+        sold = values["sold_qty"]
+
+        # A series without a snapshot on the last day keeps the closing stock
+        # of the last day it has one, rather than reading as empty.
+        last_observed = np.where(values["observed"] > 0, np.arange(len(dates)), -1).max(axis=1)
+        closing_stock = values["closing_stock"][np.arange(len(keys)), last_observed]
+
+        return cls(keys, sold.sum(axis=1), (sold ** 2).sum(axis=1), len(dates), closing_stock, dates[-1])
+
+    # -------------------------------------------------
+    # METRICS
+    # -------------------------------------------------
+    def metrics(self, products, lead_time_days=LEAD_TIME_DAYS, service_z=SERVICE_LEVEL_Z):
+        n = max(self.days, 1)
+        velocity = self.total / n
+        variance = np.clip((self.total_sq - self.total ** 2 / n) / max(n - 1, 1), 0, None)
+        sigma = np.sqrt(variance)
+
+        lead_demand = velocity * lead_time_days
+        lead_sigma = sigma * np.sqrt(lead_time_days)
+        safety_stock = service_z * lead_sigma
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            days_of_cover = np.where(velocity > 0, self.closing_stock / velocity, np.inf)
+            shortfall = (self.closing_stock - lead_demand) / lead_sigma
+        stockout_probability = np.where(
+            lead_sigma > 0,
+            1 - normal_cdf(np.nan_to_num(shortfall)),
+            (self.closing_stock < lead_demand).astype(float)
+        )
+
+        table = self.keys.copy()
+        table["closing_stock"] = self.closing_stock
+        table["velocity"] = velocity
+        table["days_of_cover"] = days_of_cover
+        table["stockout_probability"] = stockout_probability
+        table["safety_stock"] = safety_stock
+        table["dynamic_reorder_point"] = np.ceil(lead_demand + safety_stock)
+
+        table = table.merge(products[["product_id", "product_name", "reorder_level"]], on="product_id", how="left")
+        # The master-data reorder level acts as a floor under the demand-driven one.
+        table["reorder_point"] = np.fmax(table["dynamic_reorder_point"], table["reorder_level"])
+        table["needs_reorder"] = table["closing_stock"] <= table["reorder_point"]
+        return table
+
+# -------------------------------------------------
+# ALERTS
+# -------------------------------------------------
+def reorder_alerts(metrics):
+    alerts = metrics[metrics["needs_reorder"]]
+    return alerts.sort_values(["days_of_cover", "stockout_probability"], ascending=[True, False])
+
+def replenishment_metrics(inventory, products):
+    return ReplenishmentState.from_history(inventory).metrics(products)
@@ -0,0 +1,129 @@
+import numpy as np
+import pandas as pd
+
+# Today plus the 30 days before it, the span of the executive revenue trend.
+WINDOW_DAYS = 31
+
+MEASURES = ["revenue", "units", "expenses", "energy_cost"]
+ENERGY_CATEGORY = "Power & Generator Fuel"
+
+def day_numbers(dates):
+    return np.asarray(dates, dtype="datetime64[ns]").astype("datetime64[D]").astype("int64")
+
+# -------------------------------------------------
+# ROLLING DAILY BUCKETS
+# -------------------------------------------------
+class RollingDaily:
+    # Daily totals per store and measure for the trailing window_days, kept in
+    # a circular buffer indexed by day number modulo the window. Moving the
+    # window forward a day clears one slot and appending a line adds into one,
+    # so both cost the same however long the history is.
+
+    def __init__(self, window_days=WINDOW_DAYS):
+        self.window_days = window_days
+        self.buckets = np.zeros((window_days, 0, len(MEASURES)))
+        self.stores = {}
+        self.as_of = None
+
+    @classmethod
+    def from_data(cls, data, window_days=WINDOW_DAYS):
+        sales, expenses = data["sales"], data["expenses"]
+        rolling = cls(window_days)
+        if sales.empty and expenses.empty:
+            return rolling
+
+        # An empty side has no last date; the window ends on the other's.
+        last = max(dates.max() for dates in (sales["Transaction Date"], expenses["Expense Date"]) if len(dates))
+        first = last - pd.Timedelta(days=window_days - 1)
+        rolling.append_sales(sales[sales["Transaction Date"] >= first])
+        rolling.append_expenses(expenses[expenses["Expense Date"] >= first])
+        return rolling
+
+    def store_rows(self, store_ids):
+        # Only the distinct ids are looked up; each line then takes its row
+        # through the inverse index.
+        distinct, inverse = np.unique(store_ids, return_inverse=True)
+        for store_id in distinct:
+            if store_id not in self.stores:
+                self.stores[store_id] = len(self.stores)
+                self.buckets = np.concatenate(
+                    [self.buckets, np.zeros((self.window_days, 1, len(MEASURES)))],
+                    axis=1
+                )
+        rows = np.array([self.stores[store_id] for store_id in distinct], dtype="int64")
+        return rows[inverse]
+
+    # -------------------------------------------------
+    # UPDATES
+    # -------------------------------------------------
+    def advance(self, day):
+        day = pd.Timestamp(day).normalize()
+        if self.as_of is None:
+            self.as_of = day
+            return
+        if day <= self.as_of:
+            return
+
+        steps = min((day - self.as_of).days, self.window_days)
+        first = day_numbers([self.as_of])[0] + 1
+        self.buckets[(first + np.arange(steps)) % self.window_days] = 0
+        self.as_of = day
+
+    def append(self, dates, store_ids, values):
+        # values holds one row per line with a column per entry in MEASURES.
+        if not len(dates):
+            return
+        self.advance(dates.max())
+
+        days = day_numbers(dates)
+        inside = days > day_numbers([self.as_of])[0] - self.window_days
+        rows = self.store_rows(np.asarray(store_ids)[inside])
+        np.add.at(self.buckets, (days[inside] % self.window_days, rows), values[inside])
+
+    def append_sales(self, sales):
+        values = np.zeros((len(sales), len(MEASURES)))
+        values[:, MEASURES.index("revenue")] = sales["total_amount"].to_numpy(dtype="float64")
+        values[:, MEASURES.index("units")] = sales["quantity_sold"].to_numpy(dtype="float64")
+        self.append(sales["Transaction Date"], sales["store_id"].to_numpy(), values)
+
+    def append_expenses(self, expenses):
+        amount = expenses["expense_amount"].to_numpy(dtype="float64")
+        energy = (expenses["expense_category"] == ENERGY_CATEGORY).to_numpy()
+
+        values = np.zeros((len(expenses), len(MEASURES)))
+        values[:, MEASURES.index("expenses")] = amount
+        values[:, MEASURES.index("energy_cost")] = np.where(energy, amount, 0.0)
+        self.append(expenses["Expense Date"], expenses["store_id"].to_numpy(), values)
+
+    # -------------------------------------------------
+    # READS
+    # -------------------------------------------------
+    def store_selection(self, store_id):
+        if store_id is None:
+            return slice(None)
+        return [self.stores[store_id]] if store_id in self.stores else []
+
+    def series(self, measure, store_id=None):
+        # Oldest day first, with zeros for days that had no activity.
+        if self.as_of is None:
+            return pd.Series(dtype="float64", name=measure)
+
+        end = day_numbers([self.as_of])[0]
+        days = end - self.window_days + 1 + np.arange(self.window_days)
+        slots = self.buckets[days % self.window_days][:, self.store_selection(store_id), MEASURES.index(measure)]
+        return pd.Series(
+            slots.sum(axis=1),
+            index=pd.to_datetime(days.astype("datetime64[D]")),
+            name=measure
+        )
+
+    def day_total(self, measure, day=None, store_id=None):
+        if self.as_of is None:
+            return 0.0
+        day = self.as_of if day is None else pd.Timestamp(day).normalize()
+        offset = (self.as_of - day).days
+        if not 0 <= offset < self.window_days:
+            raise ValueError(f"{day.date()} is outside the rolling window ending {self.as_of.date()}")
+
+        slot = day_numbers([day])[0] % self.window_days
+        return float(self.buckets[slot, self.store_selection(store_id), MEASURES.index(measure)].sum())
@@ -0,0 +1,206 @@
+import numpy as np
+import pandas as pd
+
+from analytics.series import SERIES_KEYS, daily_matrices
+
+MEASURES = ["units", "revenue", "cost", "units_sq"]
+
+# ABC: products making up the first 80% of revenue are A, the next 15% B and
+# the rest C. XYZ: coefficient of variation of daily units up to 0.5 is X
+# (steady), up to 1.0 Y, above that (or no sales at all) Z.
+ABC_SHARES = (0.80, 0.95)
+XYZ_CV = (0.5, 1.0)
+
+# Default period for the comparisons: the last four weeks of history.
+RECENT_DAYS = 28
+
+# Comparison windows are the selected range shifted back by these offsets.
+# A year is 52 weeks so weekdays stay aligned.
+COMPARISONS = {
+    "WoW": pd.DateOffset(weeks=1),
+    "MoM": pd.DateOffset(months=1),
+    "YoY": pd.DateOffset(weeks=52)
+}
+
+# -------------------------------------------------
+# DAILY PRODUCT SERIES
+# -------------------------------------------------
+def series_days(sales, products):
+    # Units, revenue and cost per store x product x day. Lines for products
+    # missing from the master are dropped, as the inner merges elsewhere do.
+    cost_price = sales["product_id"].map(products.set_index("product_id")["cost_price"])
+    known = cost_price.notna().to_numpy()
+    lines = pd.DataFrame({
+        "store_id": sales["store_id"].to_numpy()[known],
+        "product_id": sales["product_id"].to_numpy()[known],
+        "Date": sales["Transaction Date"].dt.normalize().to_numpy()[known],
+        "units": sales["quantity_sold"].to_numpy(dtype="float64")[known],
+        "revenue": sales["total_amount"].to_numpy(dtype="float64")[known],
+        "cost": (sales["quantity_sold"] * cost_price).to_numpy(dtype="float64")[known]
+    })
+    return lines.groupby(SERIES_KEYS + ["Date"], sort=False)[["units", "revenue", "cost"]].sum().reset_index()
+
+class ProductSeries:
+    # Running totals of every measure per series (a product, or a store and
+    # product) over one dense calendar: cumulative[m][i, t] is the total of m
+    # for series i over the days before dates[t]. Any date range is then two
+    # column reads per series, so classifying thousands of SKUs for a new
+    # range never revisits the days inside it.
+
+    def __init__(self, keys, series, dates, cumulative):
+        self.keys = list(keys)
+        self.series = series
+        self.dates = dates
+        self.cumulative = cumulative
+
+    @classmethod
+    def from_days(cls, days, keys=SERIES_KEYS):
+        keys = list(keys)
+        daily = days.groupby(keys + ["Date"], sort=False)[["units", "revenue", "cost"]].sum().reset_index()
+        daily["units_sq"] = daily["units"] ** 2
+        series, dates, values = daily_matrices(daily, "Date", MEASURES, keys)
+        cumulative = {
+            measure: np.concatenate([np.zeros((len(series), 1)), np.cumsum(values[measure], axis=1)], axis=1)
+            for measure in MEASURES
+        }
+        return cls(keys, series, dates, cumulative)
+
+    # -------------------------------------------------
+    # READS
+    # -------------------------------------------------
+    def bounds(self, start=None, end=None):
+        first = 0 if start is None else self.dates.searchsorted(pd.Timestamp(start))
+        last = len(self.dates) if end is None else self.dates.searchsorted(pd.Timestamp(end), side="right")
+        return first, max(last, first)
+
+    def window(self, start=None, end=None, rows=slice(None)):
+        # Totals of every measure per series over start..end, and the number
+        # of days in that range the calendar covers.
+        first, last = self.bounds(start, end)
+        totals = {measure: values[rows, last] - values[rows, first] for measure, values in self.cumulative.items()}
+        return totals, last - first
+
+    def rows_for(self, store_id=None):
+        if store_id is None or "store_id" not in self.keys:
+            return np.arange(len(self.series))
+        return np.flatnonzero((self.series["store_id"] == store_id).to_numpy())
+
+def product_series(sales, products):
+    # Chain-wide and per-store series, built once per data version.
+    days = series_days(sales, products)
+    return {
+        "product": ProductSeries.from_days(days, ["product_id"]),
+        "store": ProductSeries.from_days(days, SERIES_KEYS)
+    }
+
+def select_series(series, store_id=None):
+    # The chain-wide series when no store is picked, so variability is that
+    # of total demand, not of each store on its own.
+    cube = series["product"] if store_id is None else series["store"]
+    return cube, cube.rows_for(store_id)
+
+# -------------------------------------------------
+# ABC / XYZ
+# -------------------------------------------------
+def abc_classes(revenue, shares=ABC_SHARES):
+    # Pareto classes by the cumulative revenue share of the products ranked
+    # before each one, so the product that crosses a threshold stays in the
+    # higher class.
+    order = np.argsort(-revenue, kind="stable")
+    total = revenue.sum()
+    before = np.empty(len(revenue))
+    before[order] = (np.cumsum(revenue[order]) - revenue[order]) / total if total > 0 else 1.0
+    classes = np.select([before < shares[0], before < shares[1]], ["A", "B"], "C")
+    return np.where(revenue > 0, classes, "C"), before
+
+def xyz_classes(cv, limits=XYZ_CV):
+    return np.select([cv <= limits[0], cv <= limits[1]], ["X", "Y"], "Z")
+
+def classify_skus(series, products, start=None, end=None, store_id=None):
+    # One row per SKU (per store and product when a store is picked) with its
+    # revenue share, demand variability and ABC/XYZ class over start..end.
+    cube, rows = select_series(series, store_id)
+    totals, n_days = cube.window(start, end, rows)
+    keys = cube.series.iloc[rows].reset_index(drop=True)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = totals["units"] / n_days
+        std = np.sqrt(np.maximum(totals["units_sq"] / n_days - mean ** 2, 0.0))
+        cv = np.where(mean > 0, std / mean, np.inf)
+    abc, share_before = abc_classes(totals["revenue"])
+    revenue_total = totals["revenue"].sum()
+
+    classes = keys.assign(
+        units=totals["units"],
+        revenue=totals["revenue"],
+        cost=totals["cost"],
+        revenue_share=totals["revenue"] / revenue_total if revenue_total > 0 else 0.0,
+        cumulative_share=share_before + (totals["revenue"] / revenue_total if revenue_total > 0 else 0.0),
+        mean_daily_units=mean,
+        cv=cv,
+        abc=abc,
+        xyz=xyz_classes(cv)
+    )
+    classes["segment"] = classes["abc"] + classes["xyz"]
+    classes = classes.merge(products[["product_id", "product_name", "category"]], on="product_id", how="left")
+    return classes.sort_values("revenue", ascending=False).reset_index(drop=True)
+
+def segment_matrix(classes):
+    # SKUs and revenue share for each ABC x XYZ cell.
+    grid = pd.MultiIndex.from_product([["A", "B", "C"], ["X", "Y", "Z"]], names=["abc", "xyz"])
+    cells = classes.groupby(["abc", "xyz"]).agg(skus=("product_id", "count"), revenue_share=("revenue_share", "sum"))
+    return cells.reindex(grid, fill_value=0).reset_index()
+
+# -------------------------------------------------
+# PERIOD OVER PERIOD
+# -------------------------------------------------
+def period_kpis(cube, rows, start, end):
+    totals, n_days = cube.window(start, end, rows)
+    revenue, cost = totals["revenue"].sum(), totals["cost"].sum()
+    return {
+        "Revenue": revenue,
+        "Units Sold": totals["units"].sum(),
+        "Gross Profit": revenue - cost,
+        "Gross Margin": (revenue - cost) / revenue if revenue else np.nan,
+        "Average Daily Revenue": revenue / n_days if n_days else np.nan,
+        "Active SKUs": int((totals["units"] > 0).sum())
+    }
+
+def recent_period(series, days=RECENT_DAYS, start=None, end=None):
+    # The last days of history within start..end, or None when that range
+    # holds none.
+    dates = series["product"].dates
+    first, last = series["product"].bounds(start, end)
+    if last == first:
+        return None
+    return max(dates[first], dates[last - 1] - pd.Timedelta(days=days - 1)), dates[last - 1]
+
+def covers(cube, start, end):
+    return len(cube.dates) > 0 and pd.Timestamp(start) >= cube.dates[0] and pd.Timestamp(end) <= cube.dates[-1]
+
+def period_deltas(series, start, end, store_id=None):
+    # Every KPI for start..end next to the same range a week, a month and a
+    # year earlier. A comparison is left blank when its range falls outside
+    # the history.
+    cube, rows = select_series(series, store_id)
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    current = period_kpis(cube, rows, start, end)
+
+    deltas = pd.DataFrame({"kpi": list(current), "current": list(current.values())})
+    for label, offset in COMPARISONS.items():
+        if covers(cube, start - offset, end - offset):
+            previous = period_kpis(cube, rows, start - offset, end - offset)
+            deltas[f"{label}_previous"] = list(previous.values())
+        else:
+            deltas[f"{label}_previous"] = np.nan
+
+        previous = deltas[f"{label}_previous"].astype("float64")
+        current_values = deltas["current"].astype("float64")
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Margins change in points, everything else in percent.
+            deltas[label] = np.where(
+                deltas["kpi"] == "Gross Margin",
+                current_values - previous,
+                np.where(previous != 0, current_values / previous - 1, np.nan)
+            )
+    return deltas
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+
+SERIES_KEYS = ["store_id", "product_id"]
+
+# -------------------------------------------------
+# DAILY SERIES MATRIX
+# -------------------------------------------------
+def daily_matrix(frame, date_column, value_column, keys=SERIES_KEYS, start=None, end=None):
+    # Returns (series keys, dates, values) where values[i, t] is the total of
+    # value_column for series i on dates[t]. Days without rows are zero, so
+    # every series shares one dense calendar and models can run on the whole
+    # matrix at once.
+    series, dates, values = daily_matrices(frame, date_column, [value_column], keys, start, end)
+    return series, dates, values[value_column]
+
+def daily_matrices(frame, date_column, value_columns, keys=SERIES_KEYS, start=None, end=None):
+    # As daily_matrix for several value columns, returned as a dict of
+    # matrices on the same series and calendar. Keys are factorized once.
+    dates = frame[date_column].to_numpy().astype("datetime64[D]")
+    if not len(dates) and (start is None or end is None):
+        # No rows to take the calendar from: no series and no days.
+        _, series = factorize_keys(frame[keys])
+        return series, pd.DatetimeIndex([]), {column: np.zeros((0, 0)) for column in value_columns}
+    first = np.datetime64(start, "D") if start is not None else dates.min()
+    last = np.datetime64(end, "D") if end is not None else dates.max()
+    calendar = np.arange(first, last + 1, dtype="datetime64[D]")
+
+    in_range = (dates >= first) & (dates <= last)
+    codes, series = factorize_keys(frame.loc[in_range, keys])
+    day = (dates[in_range] - first).astype("int64")
+
+    n_series, n_days = len(series), len(calendar)
+    cells = codes * n_days + day
+    values = {
+        column: np.bincount(
+            cells,
+            weights=frame.loc[in_range, column].to_numpy(dtype="float64"),
+            minlength=n_series * n_days
+        ).reshape(n_series, n_days)
+        for column in value_columns
+    }
+
+    return series, pd.DatetimeIndex(calendar), values
+
+def factorize_keys(keys):
+    # Codes for each distinct row of keys, in order of first appearance, and
+    # those rows. Each column is factorized on its own and the codes combined
+    # arithmetically, which avoids building a tuple per row.
+    combined = np.zeros(len(keys), dtype="int64")
+    for column in keys.columns:
+        column_codes, uniques = pd.factorize(keys[column])
+        combined = combined * len(uniques) + column_codes
+    codes, distinct = pd.factorize(combined)
+
+    first = np.empty(len(distinct), dtype="int64")
+    first[codes[::-1]] = np.arange(len(codes))[::-1]
+    return codes, keys.iloc[first].reset_index(drop=True)
+
+# -------------------------------------------------
+# TIME OF DAY
+# -------------------------------------------------
+def transaction_hour(sales):
+    # transaction_time is stored as "H:MM" text, separate from the date.
+    return sales["transaction_time"].astype(str).str.split(":", n=1).str[0].astype("int64")
@@ -0,0 +1,125 @@
+import numpy as np
+import pandas as pd
+
+# HyperLogLog precision: 2**12 registers, about 1.6% standard error.
+HLL_PRECISION = 12
+
+# Relative accuracy of the quantile sketch: any reported quantile is within 1%
+# of the exact value.
+QUANTILE_ACCURACY = 0.01
+QUANTILE_MAX_VALUE = 1e9
+
+SKETCH_KEYS = ["store_id", "Date"]
+
+# -------------------------------------------------
+# HYPERLOGLOG
+# -------------------------------------------------
+def hash64(values):
+    # splitmix64 finaliser over the raw int64 ids; wraps modulo 2**64.
+    x = np.asarray(values).astype("uint64")
+    with np.errstate(over="ignore"):
+        x = x + np.uint64(0x9E3779B97F4A7C15)
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+def bit_length(x):
+    # Exact bit length of uint64 values, done on two 32-bit halves so the
+    # float conversion never rounds.
+    high = (x >> np.uint64(32)).astype("float64")
+    low = (x & np.uint64(0xFFFFFFFF)).astype("float64")
+    high_bits = np.frexp(high)[1]
+    low_bits = np.frexp(low)[1]
+    return np.where(high > 0, high_bits + 32, low_bits)
+
+def hll_positions(values, precision=HLL_PRECISION):
+    hashed = hash64(values)
+    suffix_bits = 64 - precision
+    register = (hashed >> np.uint64(suffix_bits)).astype("int64")
+    suffix = hashed & np.uint64((1 << suffix_bits) - 1)
+    rank = (suffix_bits - bit_length(suffix) + 1).astype("uint8")
+    return register, rank
+
+def hll_estimate(registers):
+    registers = np.atleast_2d(registers)
+    m = registers.shape[1]
+    alpha = 0.7213 / (1 + 1.079 / m)
+    raw = alpha * m * m / np.power(2.0, -registers.astype("float64")).sum(axis=1)
+
+    # Linear counting is more accurate while many registers are still empty.
+    zeros = (registers == 0).sum(axis=1)
+    with np.errstate(divide="ignore"):
+        linear = m * np.log(m / np.maximum(zeros, 1))
+    return np.where((raw <= 2.5 * m) & (zeros > 0), linear, raw)
+
+# -------------------------------------------------
+# QUANTILE SKETCH
+# -------------------------------------------------
+# A log-bucketed histogram (DDSketch): bucket i holds values in
+# (gamma**(i-1), gamma**i]. It has a fixed size, merges by adding counts and
+# answers any quantile with bounded relative error.
+GAMMA = (1 + QUANTILE_ACCURACY) / (1 - QUANTILE_ACCURACY)
+QUANTILE_BUCKETS = int(np.ceil(np.log(QUANTILE_MAX_VALUE) / np.log(GAMMA))) + 1
+
+def quantile_buckets(values):
+    values = np.clip(np.asarray(values, dtype="float64"), 1, QUANTILE_MAX_VALUE)
+    return np.ceil(np.log(values) / np.log(GAMMA)).astype("int64")
+
+def quantile_from_counts(counts, q):
+    cumulative = np.cumsum(counts)
+    if not cumulative[-1]:
+        return np.nan
+    bucket = np.searchsorted(cumulative, q * (cumulative[-1] - 1), side="right")
+    return 2 * GAMMA ** bucket / (GAMMA + 1)
+
+# -------------------------------------------------
+# PER STORE x DAY SKETCH STORE
+# -------------------------------------------------
+def build_sketches(sales):
+    # Returns the (store, day) keys plus one row of sketch state per key.
+    # Every row update is a grouped maximum or a bincount over all lines at once.
+    keys = sales[["store_id", "Transaction Date"]].rename(columns={"Transaction Date": "Date"})
+    codes, uniques = pd.MultiIndex.from_frame(keys).factorize()
+    n_keys = len(uniques)
+    m = 1 << HLL_PRECISION
+
+    sketches = {"keys": uniques.to_frame(index=False)}
+    sketches["keys"].columns = SKETCH_KEYS
+
+    for name, column in [("customers", "customer_id"), ("cashiers", "cashier_id")]:
+        register, rank = hll_positions(sales[column].to_numpy())
+        registers = np.zeros(n_keys * m, dtype="uint8")
+        np.maximum.at(registers, codes * m + register, rank)
+        sketches[name] = registers.reshape(n_keys, m)
+
+    buckets = quantile_buckets(sales["total_amount"].to_numpy())
+    sketches["amounts"] = np.bincount(
+        codes * QUANTILE_BUCKETS + buckets,
+        minlength=n_keys * QUANTILE_BUCKETS
+    ).reshape(n_keys, QUANTILE_BUCKETS).astype("int64")
+
+    return sketches
+
+def query_sketches(sketches, start=None, end=None, store_id=None, quantiles=(0.5, 0.9)):
+    # Merges the per-day sketches in range: registers by maximum, quantile
+    # counts by sum. Cost depends on the number of days, never on the number
+    # of transactions behind them.
+    keys = sketches["keys"]
+    mask = np.ones(len(keys), dtype=bool)
+    if start is not None:
+        mask &= (keys["Date"] >= pd.Timestamp(start)).to_numpy()
+    if end is not None:
+        mask &= (keys["Date"] <= pd.Timestamp(end)).to_numpy()
+    if store_id is not None:
+        mask &= (keys["store_id"] == store_id).to_numpy()
+
+    if not mask.any():
+        return {"unique_customers": 0, "unique_cashiers": 0, "quantiles": {q: np.nan for q in quantiles}, "lines": 0}
+
+    counts = sketches["amounts"][mask].sum(axis=0)
+    return {
+        "unique_customers": int(round(hll_estimate(sketches["customers"][mask].max(axis=0))[0])),
+        "unique_cashiers": int(round(hll_estimate(sketches["cashiers"][mask].max(axis=0))[0])),
+        "quantiles": {q: quantile_from_counts(counts, q) for q in quantiles},
+        "lines": int(counts.sum())
+    }
@@ -0,0 +1,230 @@
+import numpy as np
+import pandas as pd
+
+from analytics.basket import BASKET_DEFINITIONS
+from analytics.energy import WEEKDAYS
+
+HOURS = 24
+MEASURES = ["transactions", "revenue", "units"]
+
+# Planning inputs for the cashier recommendation. POS lines carry no scan or
+# tender timestamps, so handling time is an assumption the page lets the user
+# change rather than something measured.
+SERVICE_MINUTES = 3.0
+TARGET_WAIT_MINUTES = 2.0
+SERVICE_LEVEL = 0.8
+MAX_CASHIERS = 30
+
+# Staffing for the average day leaves busy days short, so slots are planned
+# for the mean plus this many standard deviations of their daily arrivals.
+PLANNING_Z = 1.0
+
+# -------------------------------------------------
+# STAFFING CUBE
+# -------------------------------------------------
+def grow(array, axis):
+    # One more zero row along axis, for a newly seen store or cashier.
+    pad = [(0, 0)] * array.ndim
+    pad[axis] = (0, 1)
+    return np.pad(array, pad)
+
+class StaffingCube:
+    # Receipts, revenue and units per store x cashier x weekday x hour, plus
+    # the day counts needed to turn them into rates. Every array is sized by
+    # those keys alone, so a year of history is a few kilobytes and each new
+    # day is folded in with np.add.at instead of rescanning the history.
+
+    def __init__(self):
+        self.stores = {}
+        self.cashiers = {}
+        self.values = np.zeros((0, 0, 7, HOURS, len(MEASURES)))
+        # Days each cashier served at least one receipt in the slot.
+        self.active_days = np.zeros((0, 0, 7, HOURS))
+        # Sum over days of the square of the store's receipts in the slot.
+        self.slot_squares = np.zeros((0, 7, HOURS))
+        # Trading days per store and weekday.
+        self.trading_days = np.zeros((0, 7))
+        self.last_day = None
+
+    @classmethod
+    def from_sales(cls, sales):
+        cube = cls()
+        cube.append_sales(sales)
+        return cube
+
+    def store_rows(self, store_ids):
+        for store_id in pd.unique(store_ids):
+            if store_id not in self.stores:
+                self.stores[store_id] = len(self.stores)
+                self.values = grow(self.values, 0)
+                self.active_days = grow(self.active_days, 0)
+                self.slot_squares = grow(self.slot_squares, 0)
+                self.trading_days = grow(self.trading_days, 0)
+        return np.array([self.stores[store_id] for store_id in store_ids], dtype="int64")
+
+    def cashier_rows(self, cashier_ids):
+        for cashier_id in pd.unique(cashier_ids):
+            if cashier_id not in self.cashiers:
+                self.cashiers[cashier_id] = len(self.cashiers)
+                self.values = grow(self.values, 1)
+                self.active_days = grow(self.active_days, 1)
+        return np.array([self.cashiers[cashier_id] for cashier_id in cashier_ids], dtype="int64")
+
+    # -------------------------------------------------
+    # UPDATES
+    # -------------------------------------------------
+    def append_sales(self, sales):
+        # Days already folded in are skipped, so appending an overlapping
+        # extract never double counts.
+        if self.last_day is not None:
+            sales = sales[sales["Transaction Date"] > self.last_day]
+        if sales.empty:
+            return self
+
+        receipts = receipt_lines(sales)
+        slots = receipts.groupby(["store_id", "cashier_id", "Date", "Hour"], sort=False)[MEASURES].sum().reset_index()
+        weekday = slots["Date"].dt.dayofweek.to_numpy()
+        hour = slots["Hour"].to_numpy()
+
+        store = self.store_rows(slots["store_id"].to_numpy())
+        cashier = self.cashier_rows(slots["cashier_id"].to_numpy())
+        np.add.at(self.values, (store, cashier, weekday, hour), slots[MEASURES].to_numpy(dtype="float64"))
+        np.add.at(self.active_days, (store, cashier, weekday, hour), 1)
+
+        store_slots = slots.groupby(["store_id", "Date", "Hour"], sort=False)["transactions"].sum().reset_index()
+        np.add.at(
+            self.slot_squares,
+            (self.store_rows(store_slots["store_id"].to_numpy()),
+             store_slots["Date"].dt.dayofweek.to_numpy(), store_slots["Hour"].to_numpy()),
+            store_slots["transactions"].to_numpy(dtype="float64") ** 2
+        )
+
+        days = slots[["store_id", "Date"]].drop_duplicates()
+        np.add.at(
+            self.trading_days,
+            (self.store_rows(days["store_id"].to_numpy()), days["Date"].dt.dayofweek.to_numpy()),
+            1
+        )
+
+        self.last_day = slots["Date"].max()
+        return self
+
+    # -------------------------------------------------
+    # READS
+    # -------------------------------------------------
+    def store_selection(self, store_id):
+        if store_id is None:
+            return slice(None)
+        return [self.stores[store_id]] if store_id in self.stores else []
+
+def receipt_lines(sales):
+    # One row per receipt: lines sharing a customer, till and timestamp are a
+    # single arrival at the till, as in the basket analysis.
+    lines = pd.DataFrame({
+        "store_id": sales["store_id"].to_numpy(),
+        "cashier_id": sales["cashier_id"].to_numpy(),
+        "customer_id": sales["customer_id"].to_numpy(),
+        "transaction_date": sales["transaction_date"].to_numpy(),
+        "transaction_time": sales["transaction_time"].to_numpy(),
+        "Date": sales["Transaction Date"].dt.normalize().to_numpy(),
+        "Hour": sales["Hour"].to_numpy(),
+        "revenue": sales["total_amount"].to_numpy(dtype="float64"),
+        "units": sales["quantity_sold"].to_numpy(dtype="float64")
+    })
+    receipts = lines.groupby(BASKET_DEFINITIONS["receipt"] + ["Date", "Hour"], sort=False)[["revenue", "units"]].sum()
+    receipts["transactions"] = 1.0
+    return receipts.reset_index()
+
+# -------------------------------------------------
+# PROFILES
+# -------------------------------------------------
+def slot_profile(cube, store_id=None):
+    # One row per weekday x hour that ever traded: average receipts and
+    # revenue per hour, the planning arrival rate and the cashiers actually on
+    # the tills. Stores are summed; their daily variation is treated as
+    # independent.
+    stores = cube.store_selection(store_id)
+    days = cube.trading_days[stores]
+    per_day = np.maximum(days, 1)[:, :, None]
+
+    values = cube.values[stores].sum(axis=1)
+    mean = values[..., MEASURES.index("transactions")] / per_day
+    variance = np.maximum(cube.slot_squares[stores] / per_day - mean ** 2, 0.0)
+    revenue = values[..., MEASURES.index("revenue")] / per_day
+    observed = cube.active_days[stores].sum(axis=1) / per_day
+
+    weekday, hour = np.meshgrid(np.arange(7), np.arange(HOURS), indexing="ij")
+    profile = pd.DataFrame({
+        "weekday": weekday.ravel(),
+        "Day Of Week": np.array(WEEKDAYS)[weekday.ravel()],
+        "Hour": hour.ravel(),
+        "transactions_per_hour": mean.sum(axis=0).ravel(),
+        "planning_rate": (mean.sum(axis=0) + PLANNING_Z * np.sqrt(variance.sum(axis=0))).ravel(),
+        "revenue_per_hour": revenue.sum(axis=0).ravel(),
+        "observed_cashiers": observed.sum(axis=0).ravel()
+    })
+    return profile[profile["transactions_per_hour"] > 0].reset_index(drop=True)
+
+def cashier_throughput(cube, store_id=None):
+    # Receipts and revenue per cashier, and per hour the cashier was serving.
+    stores = cube.store_selection(store_id)
+    values = cube.values[stores].sum(axis=(0, 2, 3))
+    active_hours = cube.active_days[stores].sum(axis=(0, 2, 3))
+
+    table = pd.DataFrame({
+        "cashier_id": list(cube.cashiers),
+        "transactions": values[:, MEASURES.index("transactions")],
+        "revenue": values[:, MEASURES.index("revenue")],
+        "units": values[:, MEASURES.index("units")],
+        "active_hours": active_hours
+    })
+    table = table[table["active_hours"] > 0].copy()
+    table["transactions_per_hour"] = table["transactions"] / table["active_hours"]
+    table["revenue_per_hour"] = table["revenue"] / table["active_hours"]
+    return table.sort_values("transactions_per_hour", ascending=False).reset_index(drop=True)
+
+def cashier_hourly(cube, store_id=None):
+    # Receipts per active hour for each cashier and hour of day.
+    stores = cube.store_selection(store_id)
+    transactions = cube.values[stores][..., MEASURES.index("transactions")].sum(axis=(0, 2))
+    active = cube.active_days[stores].sum(axis=(0, 2))
+
+    cashier, hour = np.nonzero(active)
+    return pd.DataFrame({
+        "cashier_id": np.array(list(cube.cashiers))[cashier] if len(cube.cashiers) else np.array([], dtype="int64"),
+        "Hour": hour,
+        "transactions_per_hour": transactions[cashier, hour] / active[cashier, hour]
+    })
+
+# -------------------------------------------------
+# RECOMMENDATION
+# -------------------------------------------------
+def required_cashiers(arrivals_per_hour, service_minutes=SERVICE_MINUTES, target_wait_minutes=TARGET_WAIT_MINUTES,
+                      service_level=SERVICE_LEVEL, max_cashiers=MAX_CASHIERS):
+    # Fewest tills (Erlang C, M/M/n) at which service_level of customers wait
+    # at most target_wait_minutes, for every slot at once. Erlang B is built
+    # up with its stable recursion and converted to the probability of
+    # waiting at each n.
+    load = np.asarray(arrivals_per_hour, dtype="float64") * service_minutes / 60
+    needed = np.zeros(load.shape, dtype="int64")
+    blocking = np.ones(load.shape)
+
+    for n in range(1, max_cashiers + 1):
+        blocking = load * blocking / (n + load * blocking)
+        stable = n > load
+        with np.errstate(divide="ignore", invalid="ignore"):
+            waiting = np.where(stable, n * blocking / (n - load * (1 - blocking)), 1.0)
+            met = stable & (1 - waiting * np.exp(-(n - load) * target_wait_minutes / service_minutes) >= service_level)
+        needed = np.where((needed == 0) & met, n, needed)
+
+    needed = np.where((needed == 0) & (load > 0), max_cashiers, needed)
+    return np.where(load > 0, np.maximum(needed, 1), 0)
+
+def staffing_plan(profile, service_minutes=SERVICE_MINUTES, target_wait_minutes=TARGET_WAIT_MINUTES,
+                  service_level=SERVICE_LEVEL):
+    plan = profile.copy()
+    plan["recommended_cashiers"] = required_cashiers(
+        plan["planning_rate"].to_numpy(), service_minutes, target_wait_minutes, service_level
+    )
+    plan["gap"] = plan["recommended_cashiers"] - plan["observed_cashiers"]
+    return plan
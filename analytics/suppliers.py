@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+
+ROLLUP_KEYS = ["supplier_id", "store_id", "Date"]
+
+# -------------------------------------------------
+# SUPPLIER x STORE x DAY ROLLUP
+# -------------------------------------------------
+def product_lookup(products, column):
+    return products.set_index("product_id")[column]
+
+def sales_rollup(sales, products):
+    # Product attributes are looked up by index rather than merged, so the
+    # only pass over the sales lines is the groupby itself.
+    cost = sales["product_id"].map(product_lookup(products, "cost_price")).to_numpy(dtype="float64")
+    imported = sales["product_id"].map(product_lookup(products, "local_or_imported")).eq("imported").to_numpy()
+    revenue = sales["total_amount"].to_numpy(dtype="float64")
+
+    lines = pd.DataFrame({
+        "supplier_id": sales["product_id"].map(product_lookup(products, "supplier_id")).to_numpy(),
+        "store_id": sales["store_id"].to_numpy(),
+        "Date": sales["Transaction Date"].to_numpy(),
+        "revenue": revenue,
+        "cogs": sales["quantity_sold"].to_numpy() * cost,
+        "imported_revenue": np.where(imported, revenue, 0.0),
+        "units_sold": sales["quantity_sold"].to_numpy()
+    })
+    return lines.groupby(ROLLUP_KEYS, sort=False).sum().reset_index()
+
+def inventory_rollup(inventory, products):
+    cost = inventory["product_id"].map(product_lookup(products, "cost_price")).to_numpy(dtype="float64")
+    lost = inventory["damaged_qty"].to_numpy() + inventory["expired_qty"].to_numpy()
+
+    rows = pd.DataFrame({
+        "supplier_id": inventory["product_id"].map(product_lookup(products, "supplier_id")).to_numpy(),
+        "store_id": inventory["store_id"].to_numpy(),
+        "Date": inventory["Snapshot Date"].to_numpy(),
+        "units_received": inventory["received_qty"].to_numpy(),
+        "units_lost": lost,
+        "loss_value": lost * cost,
+        "stockout_rows": (inventory["closing_stock"].to_numpy() <= 0).astype("int64"),
+        "snapshot_rows": np.ones(len(inventory), dtype="int64")
+    })
+    return rows.groupby(ROLLUP_KEYS, sort=False).sum().reset_index()
+
+def supplier_rollup(sales, inventory, products):
+    return sales_rollup(sales, products).merge(
+        inventory_rollup(inventory, products),
+        on=ROLLUP_KEYS,
+        how="outer"
+    ).fillna(0)
+
+# -------------------------------------------------
+# SCORECARD
+# -------------------------------------------------
+def supplier_scorecard(rollup, suppliers, start=None, end=None, store_id=None):
+    rows = rollup
+    if start is not None:
+        rows = rows[rows["Date"] >= pd.Timestamp(start)]
+    if end is not None:
+        rows = rows[rows["Date"] <= pd.Timestamp(end)]
+    if store_id is not None:
+        rows = rows[rows["store_id"] == store_id]
+
+    totals = rows.drop(columns=["store_id", "Date"]).groupby("supplier_id").sum()
+    card = suppliers[["supplier_id", "supplier_name", "supplier_type"]].merge(
+        totals.reset_index(), on="supplier_id", how="left"
+    ).fillna(0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        card["gross_profit"] = card["revenue"] - card["cogs"]
+        card["gross_margin"] = np.where(card["revenue"] > 0, card["gross_profit"] / card["revenue"], np.nan)
+        card["loss_rate"] = np.where(card["units_received"] > 0, card["units_lost"] / card["units_received"], np.nan)
+        card["stockout_share"] = card["stockout_rows"] / max(card["stockout_rows"].sum(), 1)
+        card["imported_share"] = np.where(card["revenue"] > 0, card["imported_revenue"] / card["revenue"], np.nan)
+        card["revenue_share"] = card["revenue"] / max(card["revenue"].sum(), 1)
+
+    return card.sort_values("revenue", ascending=False).reset_index(drop=True)
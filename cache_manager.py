@@ -0,0 +1,220 @@
+import functools
+import inspect
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+MB = 1024 * 1024
+
+# Ceiling across every managed cache; the least recently used entries of any
+# cache are evicted once the total goes over it.
+CACHE_MEMORY_LIMIT = int(os.environ.get("DASHBOARD_CACHE_MB", "1024")) * MB
+
+# name: (byte budget, TTL in seconds or None)
+CACHE_BUDGETS = {
+    "data": (512 * MB, None),
+    "aggregates": (256 * MB, None),
+    "figures": (64 * MB, 60 * 60)
+}
+
+# -------------------------------------------------
+# SIZE ESTIMATES
+# -------------------------------------------------
+def estimate_size(value, seen=None):
+    # Deep size in bytes of the values these caches hold: frames, arrays,
+    # sparse matrices, figures and containers or objects made of them.
+    seen = set() if seen is None else seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+
+    if isinstance(value, (pd.DataFrame, pd.Series, pd.Index)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum() if hasattr(usage, "sum") else usage)
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if hasattr(value, "tocsr") and hasattr(value, "data"):
+        csr = value.tocsr()
+        return int(csr.data.nbytes + csr.indices.nbytes + csr.indptr.nbytes)
+    if hasattr(value, "to_plotly_json"):
+        return estimate_size(value.to_plotly_json(), seen)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k, seen) + estimate_size(v, seen) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(estimate_size(item, seen) for item in value)
+    if hasattr(value, "__dict__") and not isinstance(value, type):
+        return sys.getsizeof(value) + estimate_size(vars(value), seen)
+    return sys.getsizeof(value)
+
+# -------------------------------------------------
+# CACHE
+# -------------------------------------------------
+class Cache:
+    # One LRU cache with a byte budget and an optional TTL. Entries are kept
+    # in access order, so eviction always pops from the front.
+
+    def __init__(self, manager, name, max_bytes, ttl_seconds=None):
+        self.manager = manager
+        self.name = name
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        with self.manager.lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[2] is not None and entry[2] <= time.monotonic():
+                self.remove(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None, False
+            self.entries.move_to_end(key)
+            self.manager.touch(self, key)
+            self.hits += 1
+            return entry[0], True
+
+    def put(self, key, value):
+        size = estimate_size(value)
+        expires = time.monotonic() + self.ttl_seconds if self.ttl_seconds is not None else None
+        with self.manager.lock:
+            if key in self.entries:
+                self.remove(key)
+            if size > self.max_bytes:
+                # Larger than the whole budget: hand it back without caching.
+                return value
+            self.entries[key] = (value, size, expires)
+            self.bytes += size
+            self.manager.touch(self, key)
+            while self.bytes > self.max_bytes:
+                self.evict_oldest()
+            self.manager.enforce_limit()
+        return value
+
+    def get_or_compute(self, key, compute):
+        value, found = self.get(key)
+        if found:
+            return value
+        # Computed outside the lock so other keys stay servable meanwhile.
+        return self.put(key, compute())
+
+    def remove(self, key):
+        _, size, _ = self.entries.pop(key)
+        self.bytes -= size
+        self.manager.forget(self, key)
+
+    def evict_oldest(self):
+        self.remove(next(iter(self.entries)))
+        self.evictions += 1
+
+    def clear(self):
+        with self.manager.lock:
+            for key in list(self.entries):
+                self.remove(key)
+
+    def cached(self, fn):
+        # Memoizes fn on its arguments. As with st.cache_data, parameters
+        # whose names start with an underscore are not part of the key, so
+        # large inputs are passed as _data next to a hashable version.
+        signature = inspect.signature(fn)
+        origin = (fn.__code__.co_filename, fn.__qualname__)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = origin + tuple(
+                (name, value) for name, value in bound.arguments.items() if not name.startswith("_")
+            )
+            return self.get_or_compute(key, lambda: fn(*args, **kwargs))
+
+        wrapper.cache = self
+        return wrapper
+
+# -------------------------------------------------
+# MANAGER
+# -------------------------------------------------
+class CacheManager:
+    # Owns every named cache and a global access order across them, used to
+    # keep the sum of all budgets-in-use under memory_limit.
+
+    def __init__(self, memory_limit=CACHE_MEMORY_LIMIT):
+        self.memory_limit = memory_limit
+        self.lock = threading.RLock()
+        self.caches = {}
+        self.order = OrderedDict()
+
+    def register(self, name, max_bytes, ttl_seconds=None):
+        with self.lock:
+            if name not in self.caches:
+                self.caches[name] = Cache(self, name, max_bytes, ttl_seconds)
+            return self.caches[name]
+
+    def touch(self, cache, key):
+        self.order[(cache.name, key)] = None
+        self.order.move_to_end((cache.name, key))
+
+    def forget(self, cache, key):
+        self.order.pop((cache.name, key), None)
+
+    def total_bytes(self):
+        return sum(cache.bytes for cache in self.caches.values())
+
+    def enforce_limit(self):
+        while self.total_bytes() > self.memory_limit and self.order:
+            name, key = next(iter(self.order))
+            cache = self.caches[name]
+            cache.remove(key)
+            cache.evictions += 1
+
+    def clear(self):
+        for cache in self.caches.values():
+            cache.clear()
+
+    def stats(self):
+        with self.lock:
+            rows = [
+                {
+                    "cache": cache.name,
+                    "entries": len(cache.entries),
+                    "used_mb": cache.bytes / MB,
+                    "budget_mb": cache.max_bytes / MB,
+                    "ttl_seconds": cache.ttl_seconds,
+                    "hits": cache.hits,
+                    "misses": cache.misses,
+                    "hit_rate": cache.hits / (cache.hits + cache.misses) if cache.hits + cache.misses else np.nan,
+                    "evictions": cache.evictions,
+                    "expirations": cache.expirations
+                }
+                for cache in self.caches.values()
+            ]
+        return pd.DataFrame(rows)
+
+# One manager per process; pages, the data layer and figure builders share it.
+manager = CacheManager()
+for _name, (_max_bytes, _ttl) in CACHE_BUDGETS.items():
+    manager.register(_name, _max_bytes, _ttl)
+
+def cached(name):
+    return manager.caches[name].cached
+
+def cached_figure(key, builder, *args, **kwargs):
+    # Figures are keyed on the builder plus an explicit hashable key (data
+    # version and any filters); the frames passed to the builder are not
+    # hashed.
+    cache = manager.caches["figures"]
+    return cache.get_or_compute(
+        (builder.__module__, builder.__qualname__) + tuple(key),
+        lambda: builder(*args, **kwargs)
+    )
@@ -0,0 +1,127 @@
+import numpy as np
+import pandas as pd
+
+# Rounding slack, in Naira, when checking line totals.
+AMOUNT_TOLERANCE = 1
+
+SAMPLE_SIZE = 5
+
+# -------------------------------------------------
+# RULES
+# -------------------------------------------------
+# Each rule returns a boolean mask over its table marking the violating rows.
+# Rules work on whole columns at once so a batch of millions of rows costs a
+# handful of array operations.
+def inventory_balance(data):
+    inventory = data["inventory"]
+    expected = (
+        inventory["opening_stock"].to_numpy()
+        + inventory["received_qty"].to_numpy()
+        - inventory["sold_qty"].to_numpy()
+        - inventory["damaged_qty"].to_numpy()
+        - inventory["expired_qty"].to_numpy()
+    )
+    return pd.Series(expected != inventory["closing_stock"].to_numpy(), index=inventory.index)
+
+def inventory_negative_quantities(data):
+    columns = ["opening_stock", "received_qty", "sold_qty", "damaged_qty", "expired_qty", "closing_stock"]
+    inventory = data["inventory"]
+    negative = np.logical_or.reduce([inventory[column].to_numpy() < 0 for column in columns])
+    return pd.Series(negative, index=inventory.index)
+
+def inventory_duplicate_snapshots(data):
+    inventory = data["inventory"]
+    # Pack the three key columns into one int64 so duplicates are found with a
+    # single hash pass instead of a multi-column groupby.
+    days = inventory["snapshot_date"].to_numpy().astype("datetime64[D]").astype("int64")
+    key = (
+        (days << 40)
+        | (inventory["store_id"].to_numpy().astype("int64") << 24)
+        | inventory["product_id"].to_numpy().astype("int64")
+    )
+    return pd.Series(key, index=inventory.index).duplicated(keep=False)
+
+def inventory_unknown_product(data):
+    return ~data["inventory"]["product_id"].isin(data["products"]["product_id"])
+
+def sales_line_total(data):
+    sales = data["sales"]
+    expected = (
+        sales["quantity_sold"].to_numpy() * sales["unit_selling_price"].to_numpy()
+        - sales["discount_amount"].to_numpy()
+    )
+    gap = abs(expected - sales["total_amount"].to_numpy())
+    return pd.Series(gap > AMOUNT_TOLERANCE, index=sales.index)
+
+def sales_non_positive_quantity(data):
+    return data["sales"]["quantity_sold"] <= 0
+
+def sales_unknown_product(data):
+    return ~data["sales"]["product_id"].isin(data["products"]["product_id"])
+
+def sales_unknown_customer(data):
+    return ~data["sales"]["customer_id"].isin(data["customers"]["customer_id"])
+
+def sales_missing_values(data):
+    columns = ["transaction_date", "store_id", "product_id", "quantity_sold", "total_amount"]
+    return data["sales"][columns].isna().any(axis=1)
+
+def products_unknown_supplier(data):
+    return ~data["products"]["supplier_id"].isin(data["suppliers"]["supplier_id"])
+
+RULES = [
+    ("inventory", "inventory_balance",
+     "opening + received - sold - damaged - expired does not equal closing stock", inventory_balance),
+    ("inventory", "inventory_negative_quantities",
+     "a stock quantity is negative", inventory_negative_quantities),
+    ("inventory", "inventory_duplicate_snapshots",
+     "more than one snapshot for the same date, store and product", inventory_duplicate_snapshots),
+    ("inventory", "inventory_unknown_product",
+     "product_id is missing from products", inventory_unknown_product),
+    ("sales", "sales_line_total",
+     "total_amount differs from quantity x unit price - discount", sales_line_total),
+    ("sales", "sales_non_positive_quantity",
+     "quantity_sold is zero or negative", sales_non_positive_quantity),
+    ("sales", "sales_unknown_product",
+     "product_id is missing from products", sales_unknown_product),
+    ("sales", "sales_unknown_customer",
+     "customer_id is missing from customers", sales_unknown_customer),
+    ("sales", "sales_missing_values",
+     "a required field is empty", sales_missing_values),
+    ("products", "products_unknown_supplier",
+     "supplier_id is missing from suppliers", products_unknown_supplier)
+]
+
+# -------------------------------------------------
+# VALIDATION PASS
+# -------------------------------------------------
+def validate_data(data, sample_size=SAMPLE_SIZE):
+    results = []
+
+    for table, rule, description, check in RULES:
+        mask = check(data).to_numpy()
+        violations = int(mask.sum())
+        results.append({
+            "table": table,
+            "rule": rule,
+            "description": description,
+            "rows": len(mask),
+            "violations": violations,
+            "sample": data[table].iloc[np.flatnonzero(mask)[:sample_size]]
+        })
+
+    return results
+
+def failed_rules(results):
+    return [result for result in results if result["violations"]]
+
+def summary_table(results):
+    return pd.DataFrame([
+        {
+            "Table": result["table"],
+            "Rule": result["description"],
+            "Rows Checked": result["rows"],
+            "Violations": result["violations"]
+        }
+        for result in results
+    ])
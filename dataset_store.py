@@ -0,0 +1,113 @@
+import json
+import os
+import shutil
+import uuid
+
+import pyarrow.feather as feather
+
+# Prepared tables are published here as uncompressed Arrow IPC files, one
+# directory per data version, so every process on the machine (server
+# workers, report renderers) maps the same bytes instead of re-parsing the
+# workbook.
+DATASET_DIR = os.environ.get("DASHBOARD_DATASET_DIR", ".dataset")
+
+CURRENT_FILE = "CURRENT"
+KEEP_VERSIONS = 2
+
+def version_directory(version, root=DATASET_DIR):
+    return os.path.join(root, version)
+
+# -------------------------------------------------
+# PUBLISH
+# -------------------------------------------------
+def publish_dataset(data, version, root=DATASET_DIR, source=None):
+    # Tables are written into a private staging directory and renamed into
+    # place in one step, so readers only ever see a complete version. source
+    # describes the file the tables were prepared from and is recorded in
+    # CURRENT for other processes to match against.
+    final = version_directory(version, root)
+    if not os.path.isdir(final):
+        staging = os.path.join(root, f".staging-{version}-{uuid.uuid4().hex}")
+        os.makedirs(staging)
+        try:
+            for name, frame in data.items():
+                # One record batch per table: a column split over several
+                # batches has to be concatenated, i.e. copied, when opened.
+                feather.write_feather(
+                    frame.reset_index(drop=True),
+                    os.path.join(staging, f"{name}.arrow"),
+                    compression="uncompressed",
+                    chunksize=max(len(frame), 1)
+                )
+            os.rename(staging, final)
+        except OSError:
+            # Another process published the same version first.
+            if not os.path.isdir(final):
+                raise
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    swap_current(version, root, source)
+    prune_versions(root)
+    return final
+
+def swap_current(version, root=DATASET_DIR, source=None):
+    staging = os.path.join(root, f".{CURRENT_FILE}-{uuid.uuid4().hex}")
+    with open(staging, "w") as handle:
+        json.dump({"version": version, "source": source}, handle)
+    os.replace(staging, os.path.join(root, CURRENT_FILE))
+
+def current_entry(root=DATASET_DIR):
+    # The published version and the source it was prepared from, or None.
+    try:
+        with open(os.path.join(root, CURRENT_FILE)) as handle:
+            entry = json.load(handle)
+    except (FileNotFoundError, ValueError):
+        return None
+    return entry if isinstance(entry, dict) and entry.get("version") else None
+
+def current_version(root=DATASET_DIR):
+    entry = current_entry(root)
+    return entry["version"] if entry else None
+
+def is_version_directory(entry):
+    # Published versions are "<content hash>-<format>"; anything else under
+    # the root (staging directories, other stores) is left alone.
+    digest, _, format_tag = entry.name.partition("-")
+    return (
+        entry.is_dir()
+        and len(digest) == 16
+        and all(char in "0123456789abcdef" for char in digest)
+        and format_tag.isalnum()
+    )
+
+def prune_versions(root=DATASET_DIR, keep=KEEP_VERSIONS):
+    # Readers that still map an old version keep their pages after unlink, so
+    # removal never breaks a running process.
+    current = current_version(root)
+    versions = sorted(
+        (entry for entry in os.scandir(root) if is_version_directory(entry)),
+        key=lambda entry: entry.stat().st_mtime,
+        reverse=True
+    )
+    others = [entry for entry in versions if entry.name != current]
+    for entry in others[keep - 1:]:
+        shutil.rmtree(entry.path, ignore_errors=True)
+
+# -------------------------------------------------
+# OPEN
+# -------------------------------------------------
+def open_dataset(version, root=DATASET_DIR):
+    directory = version_directory(version, root)
+    if not os.path.isdir(directory):
+        return None
+
+    # split_blocks keeps one block per column instead of consolidating them,
+    # so numeric, datetime and string columns are views of the mapped file
+    # rather than private copies; every process shares the same pages.
+    data = {}
+    for entry in os.scandir(directory):
+        if entry.name.endswith(".arrow"):
+            table = feather.read_table(entry.path, memory_map=True)
+            data[entry.name[:-len(".arrow")]] = table.to_pandas(split_blocks=True)
+    return data
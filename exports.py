@@ -0,0 +1,165 @@
+import argparse
+import io
+import os
+import shutil
+import time
+import uuid
+import zlib
+
+# Rows serialised per chunk; memory held at once is one chunk, not the table.
+CHUNK_ROWS = 50_000
+
+# name: (file extension, MIME type)
+EXPORT_FORMATS = {
+    "csv": (".csv", "text/csv"),
+    "csv.gz": (".csv.gz", "application/gzip"),
+    "parquet": (".parquet", "application/vnd.apache.parquet")
+}
+
+PARQUET_COMPRESSION = "zstd"
+
+# Dashboard downloads are written under Streamlit's static folder and served
+# from disk by its static file route. Each one is removed after the TTL.
+STATIC_DIR = "static"
+DOWNLOAD_DIR = os.path.join(STATIC_DIR, "exports")
+DOWNLOAD_TTL_SECONDS = 3600
+
+# Streamlit's static route refuses files larger than this.
+MAX_DOWNLOAD_BYTES = 200 * 1024 * 1024
+
+# -------------------------------------------------
+# CHUNK ENCODERS
+# -------------------------------------------------
+def csv_chunks(frame, chunk_rows=CHUNK_ROWS):
+    for start in range(0, max(len(frame), 1), chunk_rows):
+        yield frame.iloc[start:start + chunk_rows].to_csv(index=False, header=start == 0).encode("utf-8")
+
+def gzip_chunks(chunks):
+    # wbits=31 writes a gzip header and trailer around the deflate stream.
+    compressor = zlib.compressobj(level=6, wbits=31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+class ChunkSink(io.RawIOBase):
+    # Write-only file that ParquetWriter fills; bytes are drained after each
+    # row group so they can be yielded instead of buffered whole.
+    def __init__(self):
+        self.parts = []
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.parts.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def drain(self):
+        data, self.parts = b"".join(self.parts), []
+        return data
+
+def parquet_chunks(frame, chunk_rows=CHUNK_ROWS):
+    # Imported here so importing exports does not load pyarrow.
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    sink = ChunkSink()
+    schema = pa.Schema.from_pandas(frame, preserve_index=False)
+    with pq.ParquetWriter(sink, schema, compression=PARQUET_COMPRESSION) as writer:
+        for start in range(0, len(frame), chunk_rows):
+            writer.write_table(pa.Table.from_pandas(frame.iloc[start:start + chunk_rows], schema=schema, preserve_index=False))
+            yield sink.drain()
+    yield sink.drain()
+
+def export_chunks(frame, fmt, chunk_rows=CHUNK_ROWS):
+    if fmt == "csv":
+        return csv_chunks(frame, chunk_rows)
+    if fmt == "csv.gz":
+        return gzip_chunks(csv_chunks(frame, chunk_rows))
+    if fmt == "parquet":
+        return parquet_chunks(frame, chunk_rows)
+    raise ValueError(f"Unknown export format {fmt!r}; expected one of {', '.join(EXPORT_FORMATS)}")
+
+# -------------------------------------------------
+# FILES
+# -------------------------------------------------
+def export_file_name(name, fmt):
+    return f"{name}{EXPORT_FORMATS[fmt][0]}"
+
+def write_export(frame, path, fmt, chunk_rows=CHUNK_ROWS):
+    # Written to a temporary name and renamed, so a partial file is never
+    # mistaken for a finished export.
+    staging = f"{path}.partial"
+    with open(staging, "wb") as handle:
+        for chunk in export_chunks(frame, fmt, chunk_rows):
+            handle.write(chunk)
+    os.replace(staging, path)
+    return path
+
+# -------------------------------------------------
+# DASHBOARD DOWNLOADS
+# -------------------------------------------------
+def sweep_downloads(directory=DOWNLOAD_DIR, ttl=DOWNLOAD_TTL_SECONDS):
+    cutoff = time.time() - ttl
+    try:
+        entries = list(os.scandir(directory))
+    except FileNotFoundError:
+        return
+    for entry in entries:
+        if entry.stat().st_mtime < cutoff:
+            shutil.rmtree(entry.path, ignore_errors=True)
+
+def publish_download(frame, name, fmt, directory=DOWNLOAD_DIR, chunk_rows=CHUNK_ROWS):
+    # Encodes frame chunk by chunk into a directory of its own, named with a
+    # random token so one session cannot guess another's files. Returns the
+    # path of the finished file.
+    sweep_downloads(directory)
+    folder = os.path.join(directory, uuid.uuid4().hex)
+    os.makedirs(folder)
+    return write_export(frame, os.path.join(folder, export_file_name(name, fmt)), fmt, chunk_rows)
+
+def download_url(path, static_dir=STATIC_DIR):
+    return "app/static/" + os.path.relpath(path, static_dir).replace(os.sep, "/")
+
+# -------------------------------------------------
+# COMMAND LINE
+# -------------------------------------------------
+def main(argv=None):
+    from analytics.chunked import PRODUCT_DAY_TOTALS
+    from data_loader import DATA_FILE, data_version, filter_data, prepared_data
+    from render_reports import PAGES
+
+    parser = argparse.ArgumentParser(description="Export dashboard tables to CSV or Parquet.")
+    parser.add_argument("--data", default=DATA_FILE, help="Source workbook")
+    parser.add_argument("--out", default="exports", help="Output directory")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="csv.gz", dest="fmt")
+    parser.add_argument("--tables", nargs="*", help="Source tables to export (default: all)")
+    parser.add_argument("--pages", nargs="*", choices=PAGES, default=[], help="Also export each page's report tables")
+    parser.add_argument("--store", type=int, help="Only this store")
+    parser.add_argument("--start", help="First date, YYYY-MM-DD")
+    parser.add_argument("--end", help="Last date, YYYY-MM-DD")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    args = parser.parse_args(argv)
+
+    data = filter_data(prepared_data(args.data, data_version(args.data)), args.store, args.start, args.end)
+    os.makedirs(args.out, exist_ok=True)
+
+    tables = args.tables if args.tables is not None else [name for name in data if name != PRODUCT_DAY_TOTALS]
+    exports = {name: data[name] for name in tables}
+    for page in args.pages:
+        for title, _, table in PAGES[page].build_report(data)["tables"]:
+            exports[f"{page}_{title.lower().replace(' ', '_')}"] = table
+
+    for name, frame in exports.items():
+        path = write_export(frame, os.path.join(args.out, export_file_name(name, args.fmt)), args.fmt, args.chunk_rows)
+        print(f"wrote {path} ({len(frame):,} rows)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+import argparse
+import logging
+import os
+import queue
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# New POS lines arrive as CSV files (same columns as sales_transactions) in
+# this directory. Writers should write to a temporary name and rename to
+# *.csv once complete; processed files are renamed to *.csv.done and
+# unreadable ones to *.csv.failed.
+LIVE_DROP_DIR = os.environ.get("LIVE_DROP_DIR", "live_drop")
+
+POLL_INTERVAL_SECONDS = 1
+BUCKET_MINUTES = 5
+BUCKETS_PER_DAY = 24 * 60 // BUCKET_MINUTES
+
+# -------------------------------------------------
+# LIVE STATE
+# -------------------------------------------------
+class LiveFeed:
+    # Holds today's per-store running totals and a revenue-per-bucket array.
+    # Each batch updates them with a few vectorized operations, so a tick
+    # never recomputes the day.
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.inbox = queue.Queue()
+        self.thread = None
+        self.reset_day(None)
+
+    def reset_day(self, day):
+        self.day = day
+        self.stores = {}
+        self.revenue = np.zeros(0)
+        self.units = np.zeros(0, dtype="int64")
+        self.lines = np.zeros(0, dtype="int64")
+        self.trend = np.zeros((0, BUCKETS_PER_DAY))
+        self.last_update = None
+
+    def store_rows(self, store_ids):
+        # Only the distinct ids are looked up; each line then takes its row
+        # through the inverse index.
+        distinct, inverse = np.unique(store_ids, return_inverse=True)
+        for store_id in distinct:
+            if store_id not in self.stores:
+                self.stores[store_id] = len(self.stores)
+                self.revenue = np.append(self.revenue, 0.0)
+                self.units = np.append(self.units, 0)
+                self.lines = np.append(self.lines, 0)
+                self.trend = np.vstack([self.trend, np.zeros((1, BUCKETS_PER_DAY))])
+        rows = np.array([self.stores[store_id] for store_id in distinct], dtype="int64")
+        return rows[inverse]
+
+    # -------------------------------------------------
+    # INGESTION
+    # -------------------------------------------------
+    def ingest(self, lines):
+        if lines.empty:
+            return 0
+
+        dates = pd.to_datetime(lines["transaction_date"]).dt.normalize()
+        clock = lines["transaction_time"].astype(str).str.split(":", expand=True)
+        minute = clock[0].astype(int).to_numpy() * 60 + clock[1].astype(int).to_numpy()
+
+        with self.lock:
+            latest_day = dates.max()
+            if self.day is None or latest_day > self.day:
+                self.reset_day(latest_day)
+
+            # Late lines from an earlier day are not part of today's view.
+            today = (dates == self.day).to_numpy()
+            if not today.any():
+                return 0
+
+            store_ids = lines["store_id"].to_numpy()[today]
+            amount = lines["total_amount"].to_numpy(dtype="float64")[today]
+            quantity = lines["quantity_sold"].to_numpy()[today]
+            minute = minute[today]
+
+            rows = self.store_rows(store_ids)
+            np.add.at(self.revenue, rows, amount)
+            np.add.at(self.units, rows, quantity)
+            np.add.at(self.lines, rows, 1)
+            np.add.at(self.trend, (rows, minute // BUCKET_MINUTES), amount)
+            self.last_update = pd.Timestamp.now()
+
+        return len(rows)
+
+    def submit(self, lines):
+        # Queue stand-in for a POS socket: producers hand over DataFrames and
+        # the feed thread ingests them on its next tick.
+        self.inbox.put(lines)
+
+    def drain_inbox(self):
+        ingested = 0
+        while True:
+            try:
+                ingested += self.ingest(self.inbox.get_nowait())
+            except queue.Empty:
+                return ingested
+
+    def scan_drop_dir(self, drop_dir):
+        ingested = 0
+        for entry in sorted(os.scandir(drop_dir), key=lambda e: e.name):
+            if not entry.name.endswith(".csv"):
+                continue
+            try:
+                ingested += self.ingest(pd.read_csv(entry.path))
+            except Exception:
+                logger.exception("Skipping unreadable live feed file %s", entry.path)
+                os.replace(entry.path, entry.path + ".failed")
+                continue
+            os.replace(entry.path, entry.path + ".done")
+        return ingested
+
+    # -------------------------------------------------
+    # BACKGROUND THREAD
+    # -------------------------------------------------
+    def run(self, drop_dir, interval):
+        while True:
+            try:
+                self.drain_inbox()
+                if os.path.isdir(drop_dir):
+                    self.scan_drop_dir(drop_dir)
+            except OSError:
+                # The drop directory may be unmounted or being recreated.
+                logger.exception("Live feed scan failed")
+            time.sleep(interval)
+
+    def start(self, drop_dir=LIVE_DROP_DIR, interval=POLL_INTERVAL_SECONDS):
+        if self.thread is None:
+            self.thread = threading.Thread(
+                target=self.run,
+                args=(drop_dir, interval),
+                name="live-feed",
+                daemon=True
+            )
+            self.thread.start()
+        return self
+
+    # -------------------------------------------------
+    # READ SIDE
+    # -------------------------------------------------
+    def snapshot(self, store_id=None):
+        with self.lock:
+            if store_id is None:
+                selected = slice(None)
+            elif store_id in self.stores:
+                selected = [self.stores[store_id]]
+            else:
+                selected = []
+
+            trend = self.trend[selected].sum(axis=0)
+            last_bucket = int(np.flatnonzero(trend).max()) + 1 if trend.any() else 0
+            buckets = pd.to_timedelta(np.arange(last_bucket) * BUCKET_MINUTES, unit="m")
+
+            return {
+                "day": self.day,
+                "revenue": float(self.revenue[selected].sum()),
+                "units": int(self.units[selected].sum()),
+                "lines": int(self.lines[selected].sum()),
+                "last_update": self.last_update,
+                "trend": pd.DataFrame({
+                    "Time": (self.day + buckets) if self.day is not None else buckets,
+                    "Revenue": trend[:last_bucket]
+                })
+            }
+
+# -------------------------------------------------
+# REPLAY SIMULATOR
+# -------------------------------------------------
+def simulate(data_file, drop_dir, lines_per_minute, day=None, interval=5):
+    # Replays one day of historical sales into the drop directory in time
+    # order, stamped with today's date, to exercise live mode.
+    sales = pd.read_excel(data_file, sheet_name="sales_transactions")
+    day = pd.Timestamp(day) if day else sales["transaction_date"].max()
+    lines = sales[sales["transaction_date"] == day].sort_values("transaction_time")
+    lines = lines.assign(transaction_date=pd.Timestamp.now().normalize())
+
+    os.makedirs(drop_dir, exist_ok=True)
+    batch = max(1, int(lines_per_minute * interval / 60))
+
+    for number, start in enumerate(range(0, len(lines), batch)):
+        path = os.path.join(drop_dir, f"pos_{int(time.time())}_{number:06d}.csv")
+        lines.iloc[start:start + batch].to_csv(path + ".tmp", index=False)
+        os.replace(path + ".tmp", path)
+        print(f"wrote {path}")
+        time.sleep(interval)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay historical POS lines into the live drop directory.")
+    parser.add_argument("--data", default="data.xlsx", help="Source workbook")
+    parser.add_argument("--drop-dir", default=LIVE_DROP_DIR, help="Directory watched by live mode")
+    parser.add_argument("--rate", type=int, default=1000, help="Lines per minute")
+    parser.add_argument("--day", help="Historical day to replay, YYYY-MM-DD (default: last day)")
+    parser.add_argument("--interval", type=float, default=5, help="Seconds between files")
+    args = parser.parse_args(argv)
+
+    simulate(args.data, args.drop_dir, args.rate, args.day, args.interval)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+import argparse
+import os
+import shutil
+import uuid
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+from analytics.chunked import (
+    CHUNK_MEMORY_BYTES,
+    MB,
+    SAMPLE_ROWS,
+    category_demand,
+    chunk_rows,
+    cost_of_goods_sold,
+    daily_product_totals,
+    daily_revenue,
+    top_products
+)
+
+SALES_SHEET = "sales_transactions"
+# A root of their own: the published dataset directory is pruned down to its
+# latest versions.
+PARTITIONS_DIR = os.environ.get("DASHBOARD_PARTITIONS_DIR", ".partitions")
+
+# -------------------------------------------------
+# STREAMING PARTITIONS
+# -------------------------------------------------
+def stream_sheet(file_path, sheet, memory_bytes=CHUNK_MEMORY_BYTES):
+    # Yields the sheet as DataFrames of bounded size. openpyxl's read-only
+    # mode parses rows lazily, so the sheet is never held whole.
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        rows = workbook[sheet].iter_rows(values_only=True)
+        header = list(next(rows))
+        batch, limit = [], SAMPLE_ROWS
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= limit:
+                frame = pd.DataFrame(batch, columns=header)
+                if limit == SAMPLE_ROWS:
+                    # The first batch measures the row width for the rest.
+                    limit = chunk_rows(frame.memory_usage(deep=True).sum() / len(frame), memory_bytes)
+                batch = []
+                yield frame
+        if batch:
+            yield pd.DataFrame(batch, columns=header)
+    finally:
+        workbook.close()
+
+def write_partitions(chunks, directory, prepare=None):
+    # One Arrow IPC file per chunk. Every chunk is cast to the first one's
+    # schema so the partitions read back as a single dataset, and the
+    # directory is renamed into place once complete.
+    staging = f"{directory}.staging-{uuid.uuid4().hex}"
+    os.makedirs(staging)
+    try:
+        schema = None
+        for number, chunk in enumerate(chunks):
+            if prepare is not None:
+                chunk = prepare(chunk)
+            if schema is None:
+                schema = pa.Schema.from_pandas(chunk, preserve_index=False)
+            table = pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+            feather.write_feather(table, os.path.join(staging, f"part-{number:05d}.arrow"), compression="uncompressed")
+        os.rename(staging, directory)
+    except OSError:
+        # Another process wrote the same partitions first.
+        if not os.path.isdir(directory):
+            raise
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    return directory
+
+def sales_partitions(file_path, version, memory_bytes=CHUNK_MEMORY_BYTES, root=PARTITIONS_DIR):
+    from data_loader import prepare_sales, prepared_version
+
+    directory = os.path.join(root, prepared_version(version), "sales")
+    if not os.path.isdir(directory):
+        os.makedirs(os.path.dirname(directory), exist_ok=True)
+        write_partitions(stream_sheet(file_path, SALES_SHEET, memory_bytes), directory, prepare_sales)
+    return directory
+
+# -------------------------------------------------
+# COMMAND LINE
+# -------------------------------------------------
+def main(argv=None):
+    from data_loader import DATA_FILE, data_version
+    from exports import EXPORT_FORMATS, export_file_name, write_export
+
+    parser = argparse.ArgumentParser(
+        description="Aggregate sales chunk by chunk with bounded memory: daily revenue, category demand, top products and COGS."
+    )
+    parser.add_argument("--data", default=DATA_FILE, help="Source workbook")
+    parser.add_argument("--source", help="Existing Arrow/Parquet file or partition directory (skips the workbook)")
+    parser.add_argument("--memory-mb", type=int, default=CHUNK_MEMORY_BYTES // MB, help="Memory budget per worker")
+    parser.add_argument("--top", type=int, default=10, help="Products in the top-N tables")
+    parser.add_argument("--out", default="aggregates", help="Output directory")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="csv", dest="fmt")
+    args = parser.parse_args(argv)
+
+    memory_bytes = args.memory_mb * MB
+    source = args.source or sales_partitions(args.data, data_version(args.data), memory_bytes)
+    # Only the product master is loaded whole; it is tiny next to sales.
+    products = pd.read_excel(args.data, sheet_name="products")
+
+    totals = daily_product_totals(source, memory_bytes)
+    results = {
+        "daily_revenue": daily_revenue(totals).rename("revenue").reset_index(),
+        "category_demand": category_demand(totals, products),
+        "top_products_by_units": top_products(totals, products, "quantity_sold", args.top),
+        "top_products_by_cost": top_products(totals, products, "cost", args.top)
+    }
+
+    os.makedirs(args.out, exist_ok=True)
+    for name, frame in results.items():
+        path = write_export(frame, os.path.join(args.out, export_file_name(name, args.fmt)), args.fmt)
+        print(f"wrote {path} ({len(frame):,} rows)")
+
+    print(f"revenue ₦{totals['total_amount'].sum():,.0f}")
+    print(f"cost of goods sold ₦{cost_of_goods_sold(totals, products):,.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,21 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-from datetime import timedelta
-from data_loader import load_data
+from data_loader import load_data, data_version, start_live_feed
+from cache_manager import cached, cached_figure
+from theme import apply_theme, export_panel, kpi_row
+from analytics.anomalies import detect_anomalies
+from analytics.rolling import RollingDaily
+from live_feed import BUCKET_MINUTES
+from task_graph import TaskGraph
+from views.executive import (
+    kpi_tasks,
+    live_kpis,
+    intraday_revenue_chart,
+    revenue_trend_chart,
+    top_categories_chart,
+    anomaly_alert_table,
+    low_stock_alert_table,
+    ALERT_DAYS
+)
 
 # ----------------------------------
 # PAGE CONFIG
@@ -13,234 +26,89 @@ st.set_page_config(
 )
 
 # ----------------------------------
-# LIGHT MATURE COLOR SCHEME
+# THEME
 # ----------------------------------
-BACKGROUND_COLOR = "#f5f7fb"     # Soft light background
-CARD_BACKGROUND = "#ffffff"
-
-PRIMARY_COLOR = "#4f46e5"        # Muted Indigo Blue
-ACCENT_COLOR = "#10b981"         # Emerald Green
-WARNING_COLOR = "#f59e0b"
-DANGER_COLOR = "#dc2626"
+apply_theme()
 
-TEXT_PRIMARY = "#0f172a"         # Deep Slate
-TEXT_MUTED = "#64748b"
-
-AXIS_COLOR = "#334155"
-GRID_COLOR = "#e5e7eb"
+# Live mode reruns only the live fragment on this interval.
+LIVE_REFRESH_SECONDS = 5
 
 # ----------------------------------
 # LOAD DATA
 # ----------------------------------
 
 data = load_data()
+version = data_version()
 
 sales = data["sales"]
 inventory = data["inventory"]
-expenses = data["expenses"]
 products = data["products"]
 
-sales["Transaction Date"] = pd.to_datetime(sales["transaction_date"])
-inventory["Snapshot Date"] = pd.to_datetime(inventory["snapshot_date"])
-expenses["Expense Date"] = pd.to_datetime(expenses["expense_date"])
+# -------------------------------------------------
+# ROLLING DAILY AGGREGATES
+# -------------------------------------------------
+@cached("aggregates")
+def load_rolling_daily(version, _data):
+    return RollingDaily.from_data(_data)
 
-today = sales["Transaction Date"].max()
-last_30_days = today - timedelta(days=30)
+# -------------------------------------------------
+# ANOMALY SCORES
+# -------------------------------------------------
+@cached("aggregates")
+def load_anomaly_scores(version, _data):
+    return detect_anomalies(_data)
 
 # ----------------------------------
-# GLOBAL CSS (STREAMLIT UI THEMING)
+# PAGE TASKS
 # ----------------------------------
-st.markdown(
-    f"""
-    <style>
-    html, body, [class*="css"] {{
-        background-color: {BACKGROUND_COLOR};
-        color: {TEXT_PRIMARY};
-        font-family: Inter, sans-serif;
-    }}
-
-    .kpi-card {{
-        background-color: {CARD_BACKGROUND};
-        padding: 22px;
-        border-radius: 16px;
-        box-shadow: 0 10px 25px rgba(0,0,0,0.05);
-        text-align: center;
-    }}
-
-    .kpi-title {{
-        font-size: 12px;
-        color: {TEXT_MUTED};
-        text-transform: uppercase;
-        letter-spacing: 0.08em;
-        margin-bottom: 6px;
-    }}
-
-    .kpi-value {{
-        font-size: 28px;
-        font-weight: 700;
-        color: {TEXT_PRIMARY};
-    }}
-
-    .section-title {{
-        font-size: 26px;
-        font-weight: 700;
-        margin: 36px 0 10px 0;
-        color: {TEXT_PRIMARY};
-    }}
-
-    .subheader {{
-        font-size: 18px;
-        font-weight: 600;
-        margin-top: 6px;
-        color: {TEXT_PRIMARY};
-    }}
-
-    .caption {{
-        font-size: 13px;
-        color: {TEXT_MUTED};
-        margin-bottom: 12px;
-    }}
-    </style>
-    """,
-    unsafe_allow_html=True
-)
+# KPIs, charts and alert tables do not depend on any widget, so they are
+# evaluated together up front; independent ones run concurrently.
+graph = TaskGraph()
+rolling = graph.add("rolling", load_rolling_daily, version, data)
+kpi_tasks(graph, data, rolling)
+graph.add("revenue_trend", cached_figure, (version,), revenue_trend_chart, rolling)
+graph.add("top_categories", cached_figure, (version,), top_categories_chart, sales)
+graph.add("anomalies", anomaly_alert_table, graph.add("anomaly_scores", load_anomaly_scores, version, data))
+graph.add("low_stock", low_stock_alert_table, inventory, products)
+results = graph.run()
 
 # ----------------------------------
-# KPI COMPONENT
-# ----------------------------------
-def kpi_card(title, value):
-    st.markdown(
-        f"""
-        <div class="kpi-card">
-            <div class="kpi-title">{title}</div>
-            <div class="kpi-value">{value}</div>
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
-
-# ----------------------------------
-# KPI CALCULATIONS
-# ----------------------------------
-def calculate_today_revenue():
-    return sales[sales["Transaction Date"] == today]["total_amount"].sum()
-
-def calculate_gross_margin():
-    merged = sales.merge(products, on="product_id")
-    revenue = merged["total_amount"].sum()
-    cost = (merged["quantity_sold"] * merged["cost_price"]).sum()
-    return round((revenue - cost) / revenue * 100, 2)
-
-def calculate_stockout_rate():
-    stockouts = inventory[inventory["closing_stock"] <= 0]
-    return round(len(stockouts) / len(inventory) * 100, 2)
-
-def calculate_expired_stock_value():
-    merged = inventory.merge(products, on="product_id")
-    return (merged["expired_qty"] * merged["cost_price"]).sum()
-
-def calculate_energy_cost_today():
-    energy = expenses[
-        (expenses["Expense Date"] == today) &
-        (expenses["expense_category"] == "Power & Generator Fuel")
-    ]
-    return energy["expense_amount"].sum()
-
-# ----------------------------------
-# CHARTS
+# PAGE LAYOUT
 # ----------------------------------
-def revenue_trend_chart():
-    df = sales[sales["Transaction Date"] >= last_30_days]
-    grouped = df.groupby("Transaction Date")["total_amount"].sum().reset_index()
-
-    fig = px.line(
-        grouped,
-        x="Transaction Date",
-        y="total_amount",
-        markers=True
-    )
-
-    fig.update_traces(
-        line=dict(color=PRIMARY_COLOR, width=3),
-        marker=dict(size=6, color=PRIMARY_COLOR),
-        hovertemplate="<b>Date:</b> %{x|%d %b %Y}<br><b>Revenue:</b> ₦%{y:,.0f}<extra></extra>"
-    )
+st.title("Executive Overview")
 
-    fig.update_layout(
-        plot_bgcolor=CARD_BACKGROUND,
-        paper_bgcolor=CARD_BACKGROUND,
-        font=dict(color=AXIS_COLOR),
-        xaxis=dict(title="Date", gridcolor=GRID_COLOR),
-        yaxis=dict(title="Revenue (₦)", tickprefix="₦", gridcolor=GRID_COLOR),
-        margin=dict(l=40, r=40, t=20, b=40)
-    )
+# KPI ROW
+kpi_values = results["kpis"]
 
-    return fig
+kpi_row(kpi_values)
 
-def top_categories_chart():
-    grouped = sales.groupby("product_category")["total_amount"].sum().reset_index()
-    grouped = grouped.sort_values("total_amount", ascending=False).head(5)
+# LIVE MODE
+live_mode = st.toggle(
+    "Live mode",
+    help="Follow intraday POS lines dropped into the live feed directory."
+)
 
-    fig = px.bar(
-        grouped,
-        x="product_category",
-        y="total_amount"
-    )
+@st.fragment(run_every=LIVE_REFRESH_SECONDS)
+def live_panel(feed):
+    snapshot = feed.snapshot()
+    live_values = live_kpis(snapshot)
 
-    fig.update_traces(
-        marker_color=ACCENT_COLOR,
-        hovertemplate="<b>Category:</b> %{x}<br><b>Revenue:</b> ₦%{y:,.0f}<extra></extra>"
-    )
+    kpi_row(live_values)
 
-    fig.update_layout(
-        plot_bgcolor=CARD_BACKGROUND,
-        paper_bgcolor=CARD_BACKGROUND,
-        font=dict(color=AXIS_COLOR),
-        xaxis_title="Product Category",
-        yaxis_title="Revenue (₦)",
-        yaxis_tickprefix="₦",
-        xaxis_gridcolor=GRID_COLOR,
-        yaxis_gridcolor=GRID_COLOR,
-        margin=dict(l=40, r=40, t=20, b=40)
+    st.markdown('<div class="subheader">Intraday Revenue</div>', unsafe_allow_html=True)
+    st.markdown(
+        f'<div class="caption">Revenue per {BUCKET_MINUTES}-minute interval from the live feed, '
+        f'refreshed every {LIVE_REFRESH_SECONDS} seconds.</div>',
+        unsafe_allow_html=True
     )
+    if snapshot["lines"]:
+        st.plotly_chart(intraday_revenue_chart(snapshot["trend"]), use_container_width=True)
+    else:
+        st.info("No live sales lines received yet today.")
 
-    return fig
-
-# ----------------------------------
-# ALERT TABLE
-# ----------------------------------
-def low_stock_alert_table():
-    alerts = inventory[inventory["closing_stock"] <= 30]
-    alerts = alerts.merge(products, on="product_id")
-
-    return alerts[[
-        "product_name",
-        "closing_stock",
-        "reorder_level"
-    ]].rename(columns={
-        "product_name": "Product Name",
-        "closing_stock": "Current Stock",
-        "reorder_level": "Reorder Level"
-    }).sort_values("Current Stock")
-
-# ----------------------------------
-# PAGE LAYOUT
-# ----------------------------------
-st.title("Executive Overview")
-
-# KPI ROW
-k1, k2, k3, k4, k5 = st.columns(5)
-
-with k1:
-    kpi_card("Today’s Revenue", f"₦{calculate_today_revenue():,.0f}")
-with k2:
-    kpi_card("Gross Margin", f"{calculate_gross_margin()}%")
-with k3:
-    kpi_card("Stockout Rate", f"{calculate_stockout_rate()}%")
-with k4:
-    kpi_card("Expired Stock Value", f"₦{calculate_expired_stock_value():,.0f}")
-with k5:
-    kpi_card("Energy Cost Today", f"₦{calculate_energy_cost_today():,.0f}")
+if live_mode:
+    st.markdown('<div class="section-title">Live Today</div>', unsafe_allow_html=True)
+    live_panel(start_live_feed())
 
 # SALES PERFORMANCE
 st.markdown('<div class="section-title">Sales Performance</div>', unsafe_allow_html=True)
@@ -250,16 +118,41 @@ left, right = st.columns([2, 1])
 with left:
     st.markdown('<div class="subheader">Daily Revenue Trend</div>', unsafe_allow_html=True)
     st.markdown('<div class="caption">Daily total revenue over the last 30 days.</div>', unsafe_allow_html=True)
-    st.plotly_chart(revenue_trend_chart(), use_container_width=True)
+    st.plotly_chart(results["revenue_trend"], use_container_width=True)
 
 with right:
     st.markdown('<div class="subheader">Top Revenue Categories</div>', unsafe_allow_html=True)
     st.markdown('<div class="caption">Product categories generating the most revenue.</div>', unsafe_allow_html=True)
-    st.plotly_chart(top_categories_chart(), use_container_width=True)
+    st.plotly_chart(results["top_categories"], use_container_width=True)
 
 # ALERTS
 st.markdown('<div class="section-title">Operational Alerts</div>', unsafe_allow_html=True)
-st.markdown('<div class="subheader">Low Stock Items</div>', unsafe_allow_html=True)
-st.markdown('<div class="caption">Products approaching critical stock levels.</div>', unsafe_allow_html=True)
+st.markdown('<div class="subheader">Unusual Activity</div>', unsafe_allow_html=True)
+st.markdown(
+    f'<div class="caption">Store-days in the last {ALERT_DAYS} days where revenue, generator fuel spend, '
+    'or damaged and expired units deviate from the usual weekday pattern.</div>',
+    unsafe_allow_html=True
+)
 
-st.dataframe(low_stock_alert_table(), use_container_width=True)
+anomalies = results["anomalies"]
+if anomalies.empty:
+    st.success("No unusual activity detected.")
+else:
+    st.dataframe(anomalies, use_container_width=True)
+
+st.markdown('<div class="subheader">Low Stock Items</div>', unsafe_allow_html=True)
+st.markdown('<div class="caption">Products at or below their reorder point, most urgent first.</div>', unsafe_allow_html=True)
+
+low_stock = results["low_stock"]
+st.dataframe(low_stock, use_container_width=True)
+
+# EXPORT
+st.markdown('<div class="section-title">Export</div>', unsafe_allow_html=True)
+export_panel(
+    {
+        "Low stock items": low_stock,
+        "Unusual activity": anomalies,
+        "Sales transactions": sales
+    },
+    key="executive_overview"
+)
@@ -1,7 +1,29 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-from data_loader import load_data
+from data_loader import load_data, data_version
+from cache_manager import cached, cached_figure
+from theme import apply_theme, export_panel, kpi_row
+from task_graph import TaskGraph
+from analytics.chunked import product_day_totals
+from analytics.energy import energy_by_hour, energy_by_weekday, energy_efficiency, energy_rollup
+from analytics.pricing import (
+    compare_to_baseline,
+    price_sweep,
+    product_baseline,
+    scenario_by_group,
+    scenario_frame
+)
+from views.profitability import (
+    kpi_tasks,
+    monthly_profit_trend_chart,
+    expense_category_breakdown_chart,
+    energy_kpis,
+    energy_by_hour_chart,
+    energy_by_weekday_chart,
+    scenario_kpis,
+    price_sensitivity_chart,
+    scenario_impact_table,
+    high_cost_products_table
+)
 
 # -------------------------------------------------
 # PAGE CONFIG
@@ -12,243 +34,192 @@ st.set_page_config(
 )
 
 # -------------------------------------------------
-# COLOR SCHEME (CONSISTENT)
+# THEME
 # -------------------------------------------------
-BACKGROUND_COLOR = "#f5f7fb"
-CARD_BACKGROUND = "#ffffff"
-PRIMARY_COLOR = "#4f46e5"
-SECONDARY_COLOR = "#0f172a"
-SUCCESS_COLOR = "#15803d"
-WARNING_COLOR = "#d97706"
-DANGER_COLOR = "#b91c1c"
-AXIS_COLOR = "#334155"
-GRID_COLOR = "#e2e8f0"
-MUTED_TEXT = "#64748b"
-
-# -------------------------------------------------
-# INLINE CSS
-# -------------------------------------------------
-st.markdown(
-    f"""
-    <style>
-    .stApp {{
-        background-color: {BACKGROUND_COLOR};
-    }}
-
-    .kpi-card {{
-        background-color: {CARD_BACKGROUND};
-        padding: 22px;
-        border-radius: 16px;
-        box-shadow: 0 8px 22px rgba(0,0,0,0.05);
-        text-align: center;
-    }}
-
-    .kpi-title {{
-        font-size: 12px;
-        color: {MUTED_TEXT};
-        text-transform: uppercase;
-        letter-spacing: 0.05em;
-        margin-bottom: 6px;
-    }}
-
-    .kpi-value {{
-        font-size: 28px;
-        font-weight: 700;
-        color: {SECONDARY_COLOR};
-    }}
-
-    .section-title {{
-        font-size: 24px;
-        font-weight: 700;
-        margin: 32px 0 10px 0;
-        color: {SECONDARY_COLOR};
-    }}
-
-    .subheader {{
-        font-size: 18px;
-        font-weight: 600;
-        color: {SECONDARY_COLOR};
-        margin-bottom: 4px;
-    }}
-
-    .caption {{
-        font-size: 13px;
-        color: {MUTED_TEXT};
-        margin-bottom: 10px;
-    }}
-    </style>
-    """,
-    unsafe_allow_html=True
-)
+apply_theme()
 
 # -------------------------------------------------
 # LOAD DATA
 # -------------------------------------------------
 
 data = load_data()
+version = data_version()
 sales = data["sales"]
 products = data["products"]
+totals = product_day_totals(data)
 expenses = data["expenses"]
 
-sales["Transaction Date"] = pd.to_datetime(sales["transaction_date"])
-expenses["Expense Date"] = pd.to_datetime(expenses["expense_date"])
-
 # -------------------------------------------------
-# KPI COMPONENT
+# ENERGY ROLLUP
 # -------------------------------------------------
-def kpi_card(title, value):
-    st.markdown(
-        f"""
-        <div class="kpi-card">
-            <div class="kpi-title">{title}</div>
-            <div class="kpi-value">{value}</div>
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
+@cached("aggregates")
+def load_energy_rollup(version, _sales, _expenses):
+    return energy_rollup(_sales, _expenses)
 
 # -------------------------------------------------
-# KPI CALCULATIONS
+# PRICING BASELINE
 # -------------------------------------------------
-def total_revenue():
-    return sales["total_amount"].sum()
-
-def total_cost_of_goods_sold():
-    merged = sales.merge(products, on="product_id")
-    return (merged["quantity_sold"] * merged["cost_price"]).sum()
-
-def gross_profit():
-    return total_revenue() - total_cost_of_goods_sold()
+@cached("aggregates")
+def load_product_baseline(version, _sales, _products):
+    return product_baseline(_sales, _products)
 
-def gross_margin():
-    revenue = total_revenue()
-    return round((gross_profit() / revenue) * 100, 2) if revenue else 0
-
-def total_operating_expenses():
-    return expenses["expense_amount"].sum()
-
-def net_profit_estimate():
-    return gross_profit() - total_operating_expenses()
+# -------------------------------------------------
+# PAGE TASKS
+# -------------------------------------------------
+# Everything that does not depend on a widget is evaluated up front as one
+# graph: the KPIs share revenue, cost of goods sold and operating expenses,
+# and independent items run concurrently.
+graph = TaskGraph()
+kpi_tasks(graph, data)
+graph.add("monthly_profit_trend", cached_figure, (version,), monthly_profit_trend_chart, sales, products)
+graph.add("expense_breakdown", cached_figure, (version,), expense_category_breakdown_chart, expenses)
+graph.add("energy", load_energy_rollup, version, sales, expenses)
+graph.add("baseline", load_product_baseline, version, sales, products)
+graph.add("high_cost_products", high_cost_products_table, totals, products)
+results = graph.run()
 
 # -------------------------------------------------
-# CHARTS
+# PAGE LAYOUT
 # -------------------------------------------------
-def monthly_profit_trend_chart():
-    merged = sales.merge(products, on="product_id")
-    merged["Month"] = merged["Transaction Date"].dt.to_period("M").astype(str)
-
-    grouped = merged.groupby("Month").agg(
-        Revenue=("total_amount", "sum"),
-        Cost=("quantity_sold", lambda x: (x * merged.loc[x.index, "cost_price"]).sum())
-    ).reset_index()
-
-    grouped["Gross Profit"] = grouped["Revenue"] - grouped["Cost"]
-
-    fig = px.line(
-        grouped,
-        x="Month",
-        y="Gross Profit",
-        markers=True
-    )
+st.title("Profitability & Cost Control")
 
-    fig.update_traces(line=dict(color=SUCCESS_COLOR, width=3))
-    fig.update_layout(
-        plot_bgcolor="white",
-        paper_bgcolor="white",
-        font=dict(color=AXIS_COLOR),
-        xaxis_title="Month",
-        yaxis_title="Gross Profit (₦)",
-        yaxis_tickprefix="₦",
-        yaxis_gridcolor=GRID_COLOR
-    )
+# KPIs
+kpi_values = results["kpis"]
 
-    return fig
+kpi_row(kpi_values)
 
-def expense_category_breakdown_chart():
-    grouped = expenses.groupby("expense_category")["expense_amount"].sum().reset_index()
+# Charts
+st.markdown('<div class="section-title">Profitability Trends</div>', unsafe_allow_html=True)
+
+left, right = st.columns(2)
 
-    fig = px.bar(
-        grouped,
-        x="expense_category",
-        y="expense_amount"
+with left:
+    st.markdown('<div class="subheader">Monthly Gross Profit Trend</div>', unsafe_allow_html=True)
+    st.markdown(
+        '<div class="caption">Tracks how gross profit has changed over time.</div>',
+        unsafe_allow_html=True
     )
+    st.plotly_chart(results["monthly_profit_trend"], use_container_width=True)
 
-    fig.update_traces(marker_color=WARNING_COLOR)
-    fig.update_layout(
-        plot_bgcolor="white",
-        paper_bgcolor="white",
-        font=dict(color=AXIS_COLOR),
-        xaxis_title="Expense Category",
-        yaxis_title="Total Cost (₦)",
-        yaxis_tickprefix="₦",
-        yaxis_gridcolor=GRID_COLOR
+with right:
+    st.markdown('<div class="subheader">Operating Expenses By Category</div>', unsafe_allow_html=True)
+    st.markdown(
+        '<div class="caption">Shows which cost categories consume the most money.</div>',
+        unsafe_allow_html=True
     )
+    st.plotly_chart(results["expense_breakdown"], use_container_width=True)
 
-    return fig
+# Energy
+st.markdown('<div class="section-title">Energy Efficiency</div>', unsafe_allow_html=True)
+st.markdown(
+    '<div class="caption">Power & generator fuel spend relative to sales. Each day\'s spend is spread evenly '
+    'over the hours that day had sales.</div>',
+    unsafe_allow_html=True
+)
 
-# -------------------------------------------------
-# TABLE
-# -------------------------------------------------
-def high_cost_products_table():
-    merged = sales.merge(products, on="product_id")
-    merged["Cost Impact"] = merged["quantity_sold"] * merged["cost_price"]
-
-    table = merged.groupby("product_name").agg(
-        Units_Sold=("quantity_sold", "sum"),
-        Cost_Impact=("Cost Impact", "sum")
-    ).reset_index()
-
-    return table.sort_values("Cost_Impact", ascending=False).head(10).rename(
-        columns={
-            "product_name": "Product Name",
-            "Units_Sold": "Units Sold",
-            "Cost_Impact": "Total Cost (₦)"
-        }
+energy = results["energy"]
+daily_energy = energy["daily"]
+first_day, last_day = daily_energy["Date"].min().date(), daily_energy["Date"].max().date()
+period_column, store_column = st.columns([2, 1])
+
+with period_column:
+    period = st.date_input("Period", (first_day, last_day), min_value=first_day, max_value=last_day)
+with store_column:
+    store_id = st.selectbox(
+        "Store",
+        [None] + sorted(daily_energy["store_id"].unique().tolist()),
+        format_func=lambda sid: "All Stores" if sid is None else f"Store {sid}"
     )
 
-# -------------------------------------------------
-# PAGE LAYOUT
-# -------------------------------------------------
-st.title("Profitability & Cost Control")
-
-# KPIs
-k1, k2, k3, k4, k5 = st.columns(5)
+start, end = period if len(period) == 2 else (period[0], period[0])
+energy_values = energy_kpis(energy_efficiency(energy, start, end, store_id))
 
-with k1:
-    kpi_card("Total Revenue", f"₦{total_revenue():,.0f}")
+kpi_row(energy_values)
 
-with k2:
-    kpi_card("Cost Of Goods Sold", f"₦{total_cost_of_goods_sold():,.0f}")
+left, right = st.columns(2)
 
-with k3:
-    kpi_card("Gross Profit", f"₦{gross_profit():,.0f}")
+with left:
+    st.markdown('<div class="subheader">Energy Cost By Hour</div>', unsafe_allow_html=True)
+    st.markdown(
+        '<div class="caption">Hours where sales cover the running cost least have the tallest bars.</div>',
+        unsafe_allow_html=True
+    )
+    st.plotly_chart(energy_by_hour_chart(energy_by_hour(energy, start, end, store_id)), use_container_width=True)
 
-with k4:
-    kpi_card("Gross Margin", f"{gross_margin()}%")
+with right:
+    st.markdown('<div class="subheader">Energy Cost By Day Of Week</div>', unsafe_allow_html=True)
+    st.markdown(
+        '<div class="caption">Spend per ₦100 of sales for each weekday.</div>',
+        unsafe_allow_html=True
+    )
+    st.plotly_chart(energy_by_weekday_chart(energy_by_weekday(energy, start, end, store_id)), use_container_width=True)
 
-with k5:
-    kpi_card("Net Profit Estimate", f"₦{net_profit_estimate():,.0f}")
+# What-if pricing
+st.markdown('<div class="section-title">What-If Pricing</div>', unsafe_allow_html=True)
+st.markdown(
+    '<div class="caption">Change selling prices, cost prices or discounts for all products, one category or one '
+    'supplier and see the effect on profit. Elasticity sets how strongly units sold respond to the net price '
+    '(0 keeps volumes fixed, −1 keeps revenue fixed).</div>',
+    unsafe_allow_html=True
+)
 
-# Charts
-st.markdown('<div class="section-title">Profitability Trends</div>', unsafe_allow_html=True)
+baseline = results["baseline"]
+operating_expenses = results["operating_expenses"]
+
+scope_column, target_column = st.columns(2)
+with scope_column:
+    scope = st.radio("Apply to", ["all", "category", "supplier"], horizontal=True,
+                     format_func=lambda s: {"all": "All products", "category": "Category", "supplier": "Supplier"}[s])
+with target_column:
+    if scope == "category":
+        target = st.selectbox("Category", sorted(baseline["category"].unique().tolist()))
+    elif scope == "supplier":
+        target = st.selectbox("Supplier", sorted(baseline["supplier_id"].unique().tolist()),
+                              format_func=lambda sid: f"Supplier {sid}")
+    else:
+        target = None
+
+price_column, cost_column, discount_column, elasticity_column = st.columns(4)
+with price_column:
+    price_change = st.slider("Selling price change (%)", -30, 30, 0)
+with cost_column:
+    cost_change = st.slider("Cost price change (%)", -30, 30, 0)
+with discount_column:
+    discount_change = st.slider("Discount change (%)", -100, 100, 0)
+with elasticity_column:
+    elasticity = st.slider("Price elasticity", -3.0, 0.0, 0.0, step=0.1)
+
+scenario = scenario_frame(scope, target, price_change / 100, cost_change / 100, discount_change / 100, elasticity)
+scenario_values = scenario_kpis(*compare_to_baseline(baseline, scenario, operating_expenses))
+
+kpi_row(scenario_values)
 
 left, right = st.columns(2)
 
 with left:
-    st.markdown('<div class="subheader">Monthly Gross Profit Trend</div>', unsafe_allow_html=True)
+    st.markdown('<div class="subheader">Net Profit Sensitivity To Price</div>', unsafe_allow_html=True)
     st.markdown(
-        '<div class="caption">Tracks how gross profit has changed over time.</div>',
+        '<div class="caption">Net profit across price changes of −30% to +30% for the selected products, '
+        'under several elasticities.</div>',
         unsafe_allow_html=True
     )
-    st.plotly_chart(monthly_profit_trend_chart(), use_container_width=True)
+    st.plotly_chart(
+        price_sensitivity_chart(price_sweep(baseline, scope, target, operating_expenses=operating_expenses)),
+        use_container_width=True
+    )
 
 with right:
-    st.markdown('<div class="subheader">Operating Expenses By Category</div>', unsafe_allow_html=True)
+    group = "supplier_id" if scope == "supplier" else "category"
+    st.markdown('<div class="subheader">Scenario Impact</div>', unsafe_allow_html=True)
     st.markdown(
-        '<div class="caption">Shows which cost categories consume the most money.</div>',
+        f'<div class="caption">Baseline vs scenario revenue and gross profit by {"supplier" if scope == "supplier" else "category"}.</div>',
         unsafe_allow_html=True
     )
-    st.plotly_chart(expense_category_breakdown_chart(), use_container_width=True)
+    st.dataframe(
+        scenario_impact_table(scenario_by_group(baseline, scenario, group), "Supplier" if scope == "supplier" else "Category"),
+        use_container_width=True,
+        hide_index=True
+    )
 
 # Table
 st.markdown('<div class="section-title">Products With Highest Cost Impact</div>', unsafe_allow_html=True)
@@ -257,4 +228,16 @@ st.markdown(
     unsafe_allow_html=True
 )
 
-st.dataframe(high_cost_products_table(), use_container_width=True)
+high_cost_products = results["high_cost_products"]
+st.dataframe(high_cost_products, use_container_width=True)
+
+# EXPORT
+st.markdown('<div class="section-title">Export</div>', unsafe_allow_html=True)
+export_panel(
+    {
+        "Operating expenses": expenses,
+        "Daily energy": daily_energy,
+        "High cost products": high_cost_products
+    },
+    key="profitability"
+)
@@ -1,7 +1,24 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-from data_loader import load_data
+from data_loader import load_data, data_version
+from cache_manager import cached, cached_figure
+from theme import apply_theme, export_panel, kpi_row
+from task_graph import TaskGraph
+from analytics.chunked import product_day_totals
+from analytics.basket import BASKET_DEFINITIONS, DEFAULT_BASKET_DEFINITION, basket_summary, product_affinity
+from analytics.forecasting import forecast_demand, has_enough_history, total_forecast
+from analytics.segmentation import classify_skus, period_deltas, product_series, recent_period, segment_matrix
+from views.sales import (
+    kpis,
+    hourly_sales_pattern_chart,
+    day_of_week_sales_chart,
+    monthly_category_demand_chart,
+    demand_forecast_chart,
+    sku_segment_matrix_chart,
+    top_products_by_volume_table,
+    sku_segments_table,
+    period_comparison_table,
+    frequently_bought_together_table
+)
 
 # -------------------------------------------------
 # PAGE CONFIG
@@ -12,226 +29,59 @@ st.set_page_config(
 )
 
 # -------------------------------------------------
-# COLOR SCHEME (SAME AS OTHER PAGES)
-# -------------------------------------------------
-BACKGROUND_COLOR = "#f5f7fb"
-CARD_BACKGROUND = "#ffffff"
-PRIMARY_COLOR = "#4f46e5"
-SECONDARY_COLOR = "#0f172a"
-SUCCESS_COLOR = "#15803d"
-WARNING_COLOR = "#d97706"
-INFO_COLOR = "#0369a1"
-AXIS_COLOR = "#334155"
-GRID_COLOR = "#e2e8f0"
-MUTED_TEXT = "#64748b"
-
+# THEME
 # -------------------------------------------------
-# INLINE CSS
-# -------------------------------------------------
-st.markdown(
-    f"""
-    <style>
-    .stApp {{
-        background-color: {BACKGROUND_COLOR};
-    }}
-
-    .kpi-card {{
-        background-color: {CARD_BACKGROUND};
-        padding: 22px;
-        border-radius: 16px;
-        box-shadow: 0 8px 22px rgba(0,0,0,0.05);
-        text-align: center;
-    }}
-
-    .kpi-title {{
-        font-size: 12px;
-        color: {MUTED_TEXT};
-        text-transform: uppercase;
-        letter-spacing: 0.05em;
-        margin-bottom: 6px;
-    }}
-
-    .kpi-value {{
-        font-size: 28px;
-        font-weight: 700;
-        color: {SECONDARY_COLOR};
-    }}
-
-    .section-title {{
-        font-size: 24px;
-        font-weight: 700;
-        margin: 32px 0 10px 0;
-        color: {SECONDARY_COLOR};
-    }}
-
-    .subheader {{
-        font-size: 18px;
-        font-weight: 600;
-        color: {SECONDARY_COLOR};
-        margin-bottom: 4px;
-    }}
-
-    .caption {{
-        font-size: 13px;
-        color: {MUTED_TEXT};
-        margin-bottom: 10px;
-    }}
-    </style>
-    """,
-    unsafe_allow_html=True
-)
+apply_theme()
 
 # -------------------------------------------------
 # LOAD DATA
 # -------------------------------------------------
 
 data = load_data()
+version = data_version()
 sales = data["sales"]
 products = data["products"]
-
-sales["Transaction Date"] = pd.to_datetime(sales["transaction_date"])
-sales["Hour"] = sales["Transaction Date"].dt.hour
-sales["Day Of Week"] = sales["Transaction Date"].dt.day_name()
-sales["Month"] = sales["Transaction Date"].dt.to_period("M").astype(str)
+totals = product_day_totals(data)
 
 # -------------------------------------------------
-# KPI COMPONENT
+# DEMAND FORECAST
 # -------------------------------------------------
-def kpi_card(title, value):
-    st.markdown(
-        f"""
-        <div class="kpi-card">
-            <div class="kpi-title">{title}</div>
-            <div class="kpi-value">{value}</div>
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
+@cached("aggregates")
+def load_demand_forecast(version, _data):
+    return forecast_demand(_data)
 
 # -------------------------------------------------
-# KPI CALCULATIONS
+# MARKET BASKET
 # -------------------------------------------------
-def total_units_sold():
-    return sales["quantity_sold"].sum()
-
-def average_daily_sales():
-    daily = sales.groupby(sales["Transaction Date"].dt.date)["total_amount"].sum()
-    return daily.mean()
-
-def peak_sales_hour():
-    return sales.groupby("Hour")["total_amount"].sum().idxmax()
-
-def best_selling_category():
-    merged = sales.merge(products, on="product_id")
-    return (
-        merged.groupby("category")["quantity_sold"]
-        .sum()
-        .idxmax()
-    )
+@cached("aggregates")
+def load_product_affinity(version, definition, _sales):
+    return product_affinity(_sales, definition), basket_summary(_sales, definition)
 
 # -------------------------------------------------
-# CHARTS
+# SKU SEGMENTATION
 # -------------------------------------------------
-def hourly_sales_pattern_chart():
-    grouped = sales.groupby("Hour")["total_amount"].sum().reset_index()
-
-    fig = px.line(
-        grouped,
-        x="Hour",
-        y="total_amount",
-        markers=True
-    )
-
-    fig.update_traces(line=dict(color=PRIMARY_COLOR, width=3))
-    fig.update_layout(
-        plot_bgcolor="white",
-        paper_bgcolor="white",
-        font=dict(color=AXIS_COLOR),
-        xaxis_title="Hour Of Day",
-        yaxis_title="Total Sales (₦)",
-        yaxis_tickprefix="₦",
-        yaxis_gridcolor=GRID_COLOR
-    )
-
-    return fig
-
-def day_of_week_sales_chart():
-    order = [
-        "Monday", "Tuesday", "Wednesday",
-        "Thursday", "Friday", "Saturday", "Sunday"
-    ]
-
-    grouped = (
-        sales.groupby("Day Of Week")["total_amount"]
-        .sum()
-        .reindex(order)
-        .reset_index()
-    )
-
-    fig = px.bar(
-        grouped,
-        x="Day Of Week",
-        y="total_amount"
-    )
-
-    fig.update_traces(marker_color=INFO_COLOR)
-    fig.update_layout(
-        plot_bgcolor="white",
-        paper_bgcolor="white",
-        font=dict(color=AXIS_COLOR),
-        xaxis_title="Day Of Week",
-        yaxis_title="Total Sales (₦)",
-        yaxis_tickprefix="₦",
-        yaxis_gridcolor=GRID_COLOR
-    )
-
-    return fig
-
-def monthly_category_demand_chart():
-    merged = sales.merge(products, on="product_id")
-
-    grouped = merged.groupby(
-        ["Month", "category"]
-    )["quantity_sold"].sum().reset_index()
-
-    fig = px.area(
-        grouped,
-        x="Month",
-        y="quantity_sold",
-        color="category"
-    )
-
-    fig.update_layout(
-        plot_bgcolor="white",
-        paper_bgcolor="white",
-        font=dict(color=AXIS_COLOR),
-        xaxis_title="Month",
-        yaxis_title="Units Sold",
-        yaxis_gridcolor=GRID_COLOR
-    )
-
-    return fig
+# Cumulative daily series per product and per store-product, built once per
+# data version; classifying any period reads two days from each series.
+@cached("aggregates")
+def load_product_series(version, _sales, _products):
+    return product_series(_sales, _products)
 
 # -------------------------------------------------
-# TABLE
+# PAGE TASKS
 # -------------------------------------------------
-def top_products_by_volume_table():
-    merged = sales.merge(products, on="product_id")
-
-    table = merged.groupby("product_name").agg(
-        Units_Sold=("quantity_sold", "sum"),
-        Revenue=("total_amount", "sum")
-    ).reset_index()
-
-    return table.sort_values(
-        "Units_Sold", ascending=False
-    ).head(10).rename(
-        columns={
-            "product_name": "Product Name",
-            "Units_Sold": "Units Sold",
-            "Revenue": "Total Revenue (₦)"
-        }
-    )
+# KPIs, the demand charts, the forecast, the top products table and the
+# product series do not depend on any widget, so they are evaluated together
+# and run concurrently.
+graph = TaskGraph()
+graph.add("kpis", kpis, data)
+graph.add("hourly_pattern", cached_figure, (version,), hourly_sales_pattern_chart, sales)
+graph.add("day_of_week", cached_figure, (version,), day_of_week_sales_chart, sales)
+graph.add("monthly_category_demand", cached_figure, (version,), monthly_category_demand_chart, totals, products)
+graph.add("top_products", top_products_by_volume_table, totals, products)
+graph.add("product_series", load_product_series, version, sales, products)
+if has_enough_history(data):
+    graph.add("forecast", load_demand_forecast, version, data)
+results = graph.run()
 
 # -------------------------------------------------
 # PAGE LAYOUT
@@ -239,19 +89,9 @@ def top_products_by_volume_table():
 st.title("Sales & Demand Patterns")
 
 # KPIs
-k1, k2, k3, k4 = st.columns(4)
-
-with k1:
-    kpi_card("Total Units Sold", f"{total_units_sold():,}")
-
-with k2:
-    kpi_card("Average Daily Sales", f"₦{average_daily_sales():,.0f}")
+kpi_values = results["kpis"]
 
-with k3:
-    kpi_card("Peak Sales Hour", f"{peak_sales_hour()}:00")
-
-with k4:
-    kpi_card("Top Selling Category", best_selling_category())
+kpi_row(kpi_values)
 
 # Charts
 st.markdown('<div class="section-title">Customer Buying Behavior</div>', unsafe_allow_html=True)
@@ -264,7 +104,7 @@ with left:
         '<div class="caption">Identifies peak shopping hours for staff and power planning.</div>',
         unsafe_allow_html=True
     )
-    st.plotly_chart(hourly_sales_pattern_chart(), use_container_width=True)
+    st.plotly_chart(results["hourly_pattern"], use_container_width=True)
 
 with right:
     st.markdown('<div class="subheader">Sales By Day Of Week</div>', unsafe_allow_html=True)
@@ -272,7 +112,7 @@ with right:
         '<div class="caption">Shows which days drive the highest demand.</div>',
         unsafe_allow_html=True
     )
-    st.plotly_chart(day_of_week_sales_chart(), use_container_width=True)
+    st.plotly_chart(results["day_of_week"], use_container_width=True)
 
 st.markdown('<div class="section-title">Demand Trends</div>', unsafe_allow_html=True)
 
@@ -281,7 +121,31 @@ st.markdown(
     '<div class="caption">Tracks how product categories perform across the year.</div>',
     unsafe_allow_html=True
 )
-st.plotly_chart(monthly_category_demand_chart(), use_container_width=True)
+st.plotly_chart(results["monthly_category_demand"], use_container_width=True)
+
+if "forecast" in results:
+    history, forecast = results["forecast"]
+
+    st.markdown('<div class="subheader">Demand Forecast</div>', unsafe_allow_html=True)
+    st.markdown(
+        '<div class="caption">Projected daily units sold for the next two weeks with a 90% interval. '
+        'Each product and store uses whichever of seasonal naive, exponential smoothing or a '
+        'day-of-week profile tracked its recent demand best.</div>',
+        unsafe_allow_html=True
+    )
+
+    product_names = products.set_index("product_id")["product_name"]
+    product_options = [None] + sorted(forecast["product_id"].unique().tolist())
+    product_id = st.selectbox(
+        "Product",
+        product_options,
+        format_func=lambda pid: "All Products" if pid is None else product_names.get(pid, str(pid))
+    )
+
+    st.plotly_chart(
+        demand_forecast_chart(*total_forecast(history, forecast, product_id)),
+        use_container_width=True
+    )
 
 # Table
 st.markdown('<div class="section-title">Top Selling Products</div>', unsafe_allow_html=True)
@@ -290,4 +154,107 @@ st.markdown(
     unsafe_allow_html=True
 )
 
-st.dataframe(top_products_by_volume_table(), use_container_width=True)
+top_products = results["top_products"]
+st.dataframe(top_products, use_container_width=True)
+
+# SKU segmentation
+st.markdown('<div class="section-title">SKU Segmentation (ABC/XYZ)</div>', unsafe_allow_html=True)
+st.markdown(
+    '<div class="caption">A, B and C products make up the first 80%, the next 15% and the last 5% of revenue in '
+    'the period. X, Y and Z grade how steady daily demand is: a coefficient of variation up to 0.5, up to 1.0, '
+    'and above. Each KPI is also compared with the same days a week, a month and a year earlier.</div>',
+    unsafe_allow_html=True
+)
+
+series = results["product_series"]
+first_day, last_day = series["product"].dates[0].date(), series["product"].dates[-1].date()
+recent_start, recent_end = recent_period(series)
+period_column, store_column = st.columns([2, 1])
+
+with period_column:
+    period = st.date_input(
+        "Period", (recent_start.date(), recent_end.date()), min_value=first_day, max_value=last_day,
+        key="segment_period"
+    )
+with store_column:
+    store_id = st.selectbox(
+        "Store",
+        [None] + sorted(series["store"].series["store_id"].unique().tolist()),
+        format_func=lambda sid: "All Stores" if sid is None else f"Store {sid}",
+        key="segment_store"
+    )
+
+start, end = period if len(period) == 2 else (period[0], period[0])
+classes = classify_skus(series, products, start, end, store_id)
+comparison = period_comparison_table(period_deltas(series, start, end, store_id))
+
+left, right = st.columns(2)
+
+with left:
+    st.markdown('<div class="subheader">Revenue By Segment</div>', unsafe_allow_html=True)
+    st.plotly_chart(
+        cached_figure((version, start, end, store_id), sku_segment_matrix_chart, segment_matrix(classes)),
+        use_container_width=True
+    )
+
+with right:
+    st.markdown('<div class="subheader">Period Comparison</div>', unsafe_allow_html=True)
+    st.dataframe(comparison, use_container_width=True, hide_index=True)
+
+st.markdown('<div class="subheader">SKU Segments</div>', unsafe_allow_html=True)
+segments = sku_segments_table(classes)
+st.dataframe(segments, use_container_width=True, hide_index=True)
+
+# Market basket
+st.markdown('<div class="section-title">Frequently Bought Together</div>', unsafe_allow_html=True)
+st.markdown(
+    '<div class="caption">Sales lines are grouped into baskets and product pairs are ranked by lift: '
+    'how much more often they are bought together than chance would suggest.</div>',
+    unsafe_allow_html=True
+)
+
+basket_labels = {
+    "receipt": "Same receipt (customer, till and time)",
+    "daily_visit": "Same customer on the same day"
+}
+definition = st.radio(
+    "Group sales lines into baskets by",
+    list(BASKET_DEFINITIONS),
+    index=list(BASKET_DEFINITIONS).index(DEFAULT_BASKET_DEFINITION),
+    format_func=basket_labels.get,
+    horizontal=True
+)
+affinity, summary = load_product_affinity(version, definition, sales)
+
+st.markdown(
+    f'<div class="caption">{summary["baskets"]:,} baskets, {summary["multi_item_baskets"]:,} with more than one product.</div>',
+    unsafe_allow_html=True
+)
+
+if affinity.empty:
+    st.info("Too few baskets contain more than one product under this grouping to rank product pairs.")
+else:
+    product_names = products.set_index("product_id")["product_name"]
+    basket_product = st.selectbox(
+        "Show pairs for",
+        [None] + sorted(affinity["product_id"].unique().tolist()),
+        format_func=lambda pid: "All Products" if pid is None else product_names.get(pid, str(pid)),
+        key="basket_product"
+    )
+    st.dataframe(
+        frequently_bought_together_table(affinity, products, basket_product),
+        use_container_width=True,
+        hide_index=True
+    )
+
+# EXPORT
+st.markdown('<div class="section-title">Export</div>', unsafe_allow_html=True)
+export_panel(
+    {
+        "Sales transactions": sales,
+        "Top products": top_products,
+        "SKU segments": segments,
+        "Period comparison": comparison
+    },
+    key="sales"
+)
@@ -0,0 +1,99 @@
+import streamlit as st
+from data_loader import load_data, data_version
+from cache_manager import cached, cached_figure
+from theme import apply_theme, export_panel, kpi_row
+from analytics.suppliers import supplier_rollup, supplier_scorecard
+from views.suppliers import (
+    kpis,
+    supplier_revenue_chart,
+    supplier_loss_rate_chart,
+    supplier_scorecard_table
+)
+
+# -------------------------------------------------
+# PAGE CONFIG
+# -------------------------------------------------
+st.set_page_config(
+    page_title="Supplier Performance | Supermarket Dashboard",
+    layout="wide"
+)
+
+# -------------------------------------------------
+# THEME
+# -------------------------------------------------
+apply_theme()
+
+# -------------------------------------------------
+# LOAD DATA
+# -------------------------------------------------
+
+data = load_data()
+version = data_version()
+
+# -------------------------------------------------
+# SUPPLIER ROLLUP
+# -------------------------------------------------
+# The supplier x store x day rollup is built once per data version; every
+# filter below only re-aggregates this small table.
+@cached("aggregates")
+def load_supplier_rollup(version, _data):
+    return supplier_rollup(_data["sales"], _data["inventory"], _data["products"])
+
+rollup = load_supplier_rollup(version, data)
+
+# -------------------------------------------------
+# PAGE LAYOUT
+# -------------------------------------------------
+st.title("Supplier Performance")
+
+first_day, last_day = rollup["Date"].min().date(), rollup["Date"].max().date()
+period = st.date_input("Period", (first_day, last_day), min_value=first_day, max_value=last_day)
+start, end = period if len(period) == 2 else (period[0], period[0])
+
+card = supplier_scorecard(rollup, data["suppliers"], start, end)
+
+# KPIs
+kpi_values = kpis(card)
+
+kpi_row(kpi_values)
+
+# Charts
+st.markdown('<div class="section-title">Supplier Contribution</div>', unsafe_allow_html=True)
+
+left, right = st.columns(2)
+
+with left:
+    st.markdown('<div class="subheader">Revenue By Supplier</div>', unsafe_allow_html=True)
+    st.markdown(
+        '<div class="caption">Revenue with gross profit and margin per supplier.</div>',
+        unsafe_allow_html=True
+    )
+    st.plotly_chart(cached_figure((version, start, end), supplier_revenue_chart, card), use_container_width=True)
+
+with right:
+    st.markdown('<div class="subheader">Damage & Expiry Loss Rate</div>', unsafe_allow_html=True)
+    st.markdown(
+        '<div class="caption">Damaged and expired units as a share of units received.</div>',
+        unsafe_allow_html=True
+    )
+    st.plotly_chart(cached_figure((version, start, end), supplier_loss_rate_chart, card), use_container_width=True)
+
+# Table
+st.markdown('<div class="section-title">Supplier Scorecard</div>', unsafe_allow_html=True)
+st.markdown(
+    '<div class="caption">Revenue, margin, losses, stockout contribution and imported share per supplier.</div>',
+    unsafe_allow_html=True
+)
+
+scorecard = supplier_scorecard_table(card)
+st.dataframe(scorecard, use_container_width=True, hide_index=True)
+
+# EXPORT
+st.markdown('<div class="section-title">Export</div>', unsafe_allow_html=True)
+export_panel(
+    {
+        "Supplier scorecard": scorecard,
+        "Supplier daily rollup": rollup
+    },
+    key="suppliers"
+)
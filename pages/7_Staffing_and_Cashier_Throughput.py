@@ -0,0 +1,167 @@
+import streamlit as st
+from data_loader import load_data, data_version
+from cache_manager import cached, cached_figure
+from theme import apply_theme, export_panel, kpi_row
+from analytics.energy import WEEKDAYS
+from analytics.staffing import (
+    SERVICE_LEVEL,
+    SERVICE_MINUTES,
+    TARGET_WAIT_MINUTES,
+    StaffingCube,
+    cashier_hourly,
+    cashier_throughput,
+    slot_profile,
+    staffing_plan
+)
+from views.staffing import (
+    kpis,
+    arrival_heatmap_chart,
+    staffing_gap_heatmap_chart,
+    cashiers_by_hour_chart,
+    cashier_throughput_chart,
+    cashier_table,
+    staffing_plan_table
+)
+
+# -------------------------------------------------
+# PAGE CONFIG
+# -------------------------------------------------
+st.set_page_config(
+    page_title="Staffing & Cashier Throughput | Supermarket Dashboard",
+    layout="wide"
+)
+
+# -------------------------------------------------
+# THEME
+# -------------------------------------------------
+apply_theme()
+
+# -------------------------------------------------
+# LOAD DATA
+# -------------------------------------------------
+
+data = load_data()
+version = data_version()
+
+# -------------------------------------------------
+# STAFFING CUBE
+# -------------------------------------------------
+# The store x cashier x weekday x hour cube is built once per data version;
+# every control below only reads from it.
+@cached("aggregates")
+def load_staffing_cube(version, _sales):
+    return StaffingCube.from_sales(_sales)
+
+cube = load_staffing_cube(version, data["sales"])
+
+# -------------------------------------------------
+# PAGE LAYOUT
+# -------------------------------------------------
+st.title("Staffing & Cashier Throughput")
+
+store_column, service_column, wait_column, level_column = st.columns(4)
+
+with store_column:
+    store_id = st.selectbox(
+        "Store",
+        [None] + sorted(cube.stores),
+        format_func=lambda sid: "All Stores" if sid is None else f"Store {sid}"
+    )
+with service_column:
+    service_minutes = st.slider(
+        "Minutes per receipt", 0.5, 10.0, SERVICE_MINUTES, 0.5,
+        help="Average time a cashier spends serving one customer."
+    )
+with wait_column:
+    target_wait = st.slider("Target wait (minutes)", 0.5, 10.0, TARGET_WAIT_MINUTES, 0.5)
+with level_column:
+    service_level = st.slider(
+        "Customers within target (%)", 50, 99, int(SERVICE_LEVEL * 100),
+        help="Share of customers who should wait no longer than the target."
+    ) / 100
+
+plan = staffing_plan(slot_profile(cube, store_id), service_minutes, target_wait, service_level)
+throughput = cashier_throughput(cube, store_id)
+settings = (version, store_id, service_minutes, target_wait, service_level)
+
+# KPIs
+kpi_values = kpis(plan, throughput)
+
+kpi_row(kpi_values)
+
+# Arrivals
+st.markdown('<div class="section-title">Arrival Patterns</div>', unsafe_allow_html=True)
+
+left, right = st.columns(2)
+
+with left:
+    st.markdown('<div class="subheader">Arrivals By Hour And Weekday</div>', unsafe_allow_html=True)
+    st.markdown(
+        '<div class="caption">Average receipts per hour at the tills, from transaction times.</div>',
+        unsafe_allow_html=True
+    )
+    st.plotly_chart(cached_figure((version, store_id), arrival_heatmap_chart, plan), use_container_width=True)
+
+with right:
+    st.markdown('<div class="subheader">Staffing Gap</div>', unsafe_allow_html=True)
+    st.markdown(
+        '<div class="caption">Recommended cashiers minus the average on the tills. Red slots are short-staffed, '
+        'blue slots have cashiers to spare.</div>',
+        unsafe_allow_html=True
+    )
+    st.plotly_chart(cached_figure(settings, staffing_gap_heatmap_chart, plan), use_container_width=True)
+
+# Shift plan
+st.markdown('<div class="section-title">Shift Plan</div>', unsafe_allow_html=True)
+st.markdown(
+    '<div class="caption">Each slot is planned for its average arrivals plus one standard deviation, so busy '
+    'days are covered. Cashier counts come from an Erlang C queue with the settings above.</div>',
+    unsafe_allow_html=True
+)
+
+days = [day for day in WEEKDAYS if day in set(plan["Day Of Week"])]
+if not days:
+    st.info("No transactions with a time of day for this selection.")
+else:
+    day = st.selectbox("Day of week", days)
+
+    left, right = st.columns([3, 2])
+
+    with left:
+        st.markdown(f'<div class="subheader">Cashiers Needed On {day}</div>', unsafe_allow_html=True)
+        st.plotly_chart(cached_figure(settings + (day,), cashiers_by_hour_chart, plan, day), use_container_width=True)
+
+    with right:
+        st.markdown(f'<div class="subheader">{day} Slots</div>', unsafe_allow_html=True)
+        st.dataframe(staffing_plan_table(plan, day), use_container_width=True, hide_index=True)
+
+# Cashiers
+st.markdown('<div class="section-title">Cashier Throughput</div>', unsafe_allow_html=True)
+
+left, right = st.columns([3, 2])
+
+with left:
+    st.markdown('<div class="subheader">Receipts Per Hour On The Till</div>', unsafe_allow_html=True)
+    st.markdown(
+        '<div class="caption">How many receipts each cashier processes per hour worked, by hour of day.</div>',
+        unsafe_allow_html=True
+    )
+    st.plotly_chart(
+        cached_figure((version, store_id), cashier_throughput_chart, cashier_hourly(cube, store_id)),
+        use_container_width=True
+    )
+
+with right:
+    st.markdown('<div class="subheader">Cashier Summary</div>', unsafe_allow_html=True)
+    cashiers = cashier_table(throughput)
+    st.dataframe(cashiers, use_container_width=True, hide_index=True)
+
+# EXPORT
+st.markdown('<div class="section-title">Export</div>', unsafe_allow_html=True)
+export_panel(
+    {
+        "Staffing plan": staffing_plan_table(plan),
+        "Cashier throughput": cashiers
+    },
+    key="staffing"
+)
@@ -0,0 +1,180 @@
+import streamlit as st
+from data_loader import load_data, data_version
+from cache_manager import cached, cached_figure
+from theme import apply_theme, export_panel, kpi_row
+from analytics.discounts import (
+    PROMO_DEPTH,
+    depth_response,
+    discount_by_group,
+    discount_rollup,
+    discount_summary,
+    payment_mix,
+    promo_uplift,
+    slice_bands,
+    uplift_by_product
+)
+from views.discounts import (
+    kpis,
+    depth_response_chart,
+    margin_given_up_chart,
+    payment_mix_chart,
+    discount_group_table,
+    uplift_table
+)
+
+# -------------------------------------------------
+# PAGE CONFIG
+# -------------------------------------------------
+st.set_page_config(
+    page_title="Discounts & Payments | Supermarket Dashboard",
+    layout="wide"
+)
+
+# -------------------------------------------------
+# THEME
+# -------------------------------------------------
+apply_theme()
+
+# -------------------------------------------------
+# LOAD DATA
+# -------------------------------------------------
+
+data = load_data()
+version = data_version()
+products = data["products"]
+
+# -------------------------------------------------
+# DISCOUNT ROLLUP
+# -------------------------------------------------
+# Built once per data version; every filter below slices the compact
+# store x product x day and store x day x hour aggregates instead of the
+# sales lines.
+@cached("aggregates")
+def load_discount_rollup(version, _sales, _products):
+    return discount_rollup(_sales, _products)
+
+rollup = load_discount_rollup(version, data["sales"], products)
+
+# -------------------------------------------------
+# PAGE LAYOUT
+# -------------------------------------------------
+st.title("Discounts & Payments")
+
+bands_frame = rollup["bands"]
+first_day, last_day = bands_frame["Date"].min().date(), bands_frame["Date"].max().date()
+period_column, store_column, category_column = st.columns([2, 1, 1])
+
+with period_column:
+    period = st.date_input("Period", (first_day, last_day), min_value=first_day, max_value=last_day)
+with store_column:
+    store_id = st.selectbox(
+        "Store",
+        [None] + sorted(bands_frame["store_id"].unique().tolist()),
+        format_func=lambda sid: "All Stores" if sid is None else f"Store {sid}"
+    )
+with category_column:
+    category = st.selectbox(
+        "Category",
+        [None] + sorted(products["category"].unique().tolist()),
+        format_func=lambda name: "All Categories" if name is None else name
+    )
+
+start, end = period if len(period) == 2 else (period[0], period[0])
+bands = slice_bands(rollup, products, start, end, store_id, category)
+settings = (version, start, end, store_id, category)
+
+# KPIs
+kpi_values = kpis(discount_summary(bands))
+
+kpi_row(kpi_values)
+
+# Discount depth
+st.markdown('<div class="section-title">Discount Depth</div>', unsafe_allow_html=True)
+
+group = "category" if category is None else "product_name"
+group_label = "Category" if category is None else "Product"
+by_group = discount_by_group(bands, group)
+
+left, right = st.columns(2)
+
+with left:
+    st.markdown('<div class="subheader">Discount Depth vs Units And Margin</div>', unsafe_allow_html=True)
+    st.markdown(
+        '<div class="caption">Units per sales line and margin after discount for each discount depth. '
+        'Depth is the line discount as a share of its shelf-price value.</div>',
+        unsafe_allow_html=True
+    )
+    st.plotly_chart(
+        cached_figure(settings, depth_response_chart, depth_response(bands)),
+        use_container_width=True
+    )
+
+with right:
+    st.markdown(f'<div class="subheader">Margin Given Up By {group_label}</div>', unsafe_allow_html=True)
+    st.markdown(
+        '<div class="caption">Gross margin points lost to discounts: margin at shelf prices minus margin '
+        'on what customers paid.</div>',
+        unsafe_allow_html=True
+    )
+    st.plotly_chart(
+        cached_figure(settings, margin_given_up_chart, by_group, group_label),
+        use_container_width=True
+    )
+
+st.markdown(f'<div class="subheader">Discounts By {group_label}</div>', unsafe_allow_html=True)
+discounts = discount_group_table(by_group, group_label)
+st.dataframe(discounts, use_container_width=True, hide_index=True)
+
+# Uplift
+st.markdown('<div class="section-title">Discount Period Uplift</div>', unsafe_allow_html=True)
+st.markdown(
+    '<div class="caption">A discount period is a run of days on which a product\'s discount depth reached the '
+    'threshold below. Its units are compared with the daily average of the undiscounted weeks before it; the '
+    'after-period change shows any dip once the discount ends.</div>',
+    unsafe_allow_html=True
+)
+
+promo_depth = st.slider("Discount period threshold (%)", 1, 30, int(PROMO_DEPTH * 100)) / 100
+uplift = uplift_table(uplift_by_product(promo_uplift(bands, promo_depth), products))
+
+if uplift.empty:
+    st.info("No discount periods with enough undiscounted days before them for this selection.")
+else:
+    st.dataframe(uplift, use_container_width=True, hide_index=True)
+
+# Payment mix
+st.markdown('<div class="section-title">Payment Mix</div>', unsafe_allow_html=True)
+
+by_column, measure_column = st.columns(2)
+
+with by_column:
+    by = st.radio("Split by", ["Hour", "Day Of Week", "Month"], horizontal=True)
+with measure_column:
+    measure = st.radio(
+        "Share of", ["lines", "revenue"], horizontal=True,
+        format_func={"lines": "Transactions", "revenue": "Revenue"}.get
+    )
+
+mix = payment_mix(rollup, by, start, end, store_id, measure)
+x_titles = {"Hour": "Hour Of Day", "Day Of Week": "Day Of Week", "Month": "Month"}
+
+st.markdown(f'<div class="subheader">Payment Methods By {x_titles[by]}</div>', unsafe_allow_html=True)
+st.markdown(
+    '<div class="caption">Share paid by cash, POS and transfer. Payment mix covers every category.</div>',
+    unsafe_allow_html=True
+)
+st.plotly_chart(
+    cached_figure((version, start, end, store_id, by, measure), payment_mix_chart, mix, by, x_titles[by], measure),
+    use_container_width=True
+)
+
+# EXPORT
+st.markdown('<div class="section-title">Export</div>', unsafe_allow_html=True)
+export_panel(
+    {
+        f"Discounts by {group_label.lower()}": discounts,
+        "Discount period uplift": uplift,
+        "Payment mix": mix
+    },
+    key="discounts"
+)
@@ -0,0 +1,66 @@
+import argparse
+import subprocess
+import sys
+
+# Modules every page loads before it can draw anything.
+DEFAULT_MODULES = [
+    "data_loader",
+    "theme",
+    "views.executive",
+    "views.inventory",
+    "views.profitability",
+    "views.sales",
+    "views.customers",
+    "views.suppliers",
+    "views.staffing",
+    "views.discounts"
+]
+
+# Imports that should stay deferred until a chart or basket analysis is
+# rendered. (Streamlit itself already loads plotly.graph_objects.)
+DEFERRED_MODULES = ["plotly.express", "scipy", "pyarrow.parquet"]
+
+# -------------------------------------------------
+# IMPORT-TIME PROFILE
+# -------------------------------------------------
+def import_times(module):
+    # Runs `python -X importtime` in a fresh interpreter and returns
+    # {module: (self_us, cumulative_us)} for everything it imported.
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+def profile(modules, top_n):
+    for module in modules:
+        times = import_times(module)
+        print(f"{module}: {times[module][1] / 1000:,.1f} ms cumulative")
+
+        loaded = [name for name in DEFERRED_MODULES if name in times]
+        if loaded:
+            print(f"  eagerly imports {', '.join(loaded)}")
+
+        heaviest = sorted(times.items(), key=lambda item: item[1][0], reverse=True)[:top_n]
+        for name, (self_us, _) in heaviest:
+            print(f"  {self_us / 1000:8.1f} ms  {name}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile the import time of dashboard modules.")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES, help="Modules to profile")
+    parser.add_argument("--top", type=int, default=5, help="Heaviest imports to list per module (by self time)")
+    args = parser.parse_args(argv)
+
+    profile(args.modules, args.top)
+
+if __name__ == "__main__":
+    main()
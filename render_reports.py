@@ -0,0 +1,372 @@
+import argparse
+import hashlib
+import html
+import importlib.util
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+from plotly.subplots import make_subplots
+import plotly.graph_objects as go
+
+from cache_manager import cached
+from data_loader import prepared_data, filter_data, data_version
+from theme import BACKGROUND_COLOR, CARD_BACKGROUND, MUTED_TEXT, SECONDARY_COLOR
+from views import customers, discounts, executive, inventory, profitability, sales, staffing, suppliers
+
+# -------------------------------------------------
+# REPORT SETTINGS
+# -------------------------------------------------
+PAGES = {
+    "executive_overview": executive,
+    "inventory_and_stock_health": inventory,
+    "profitability_and_cost_control": profitability,
+    "sales_and_demand_pattern": sales,
+    "customer_insights": customers,
+    "supplier_performance": suppliers,
+    "staffing_and_cashier_throughput": staffing,
+    "discounts_and_payments": discounts
+}
+
+FORMATS = ("html", "png", "pdf")
+
+# Bump when the report layout changes so existing outputs are re-rendered.
+RENDERER_VERSION = "17"
+
+MANIFEST_FILE = "manifest.json"
+
+REPORT_CSS = f"""
+body {{
+    background-color: {BACKGROUND_COLOR};
+    color: {SECONDARY_COLOR};
+    font-family: Inter, sans-serif;
+    margin: 32px;
+}}
+
+.kpi-row {{
+    display: flex;
+    gap: 16px;
+}}
+
+.kpi-card {{
+    flex: 1;
+    background-color: {CARD_BACKGROUND};
+    padding: 22px;
+    border-radius: 16px;
+    box-shadow: 0 8px 22px rgba(0,0,0,0.05);
+    text-align: center;
+}}
+
+.kpi-title {{
+    font-size: 12px;
+    color: {MUTED_TEXT};
+    text-transform: uppercase;
+    letter-spacing: 0.05em;
+    margin-bottom: 6px;
+}}
+
+.kpi-value {{
+    font-size: 28px;
+    font-weight: 700;
+}}
+
+.subheader {{
+    font-size: 18px;
+    font-weight: 600;
+    margin-top: 32px;
+}}
+
+.caption {{
+    font-size: 13px;
+    color: {MUTED_TEXT};
+    margin-bottom: 10px;
+}}
+
+table {{
+    border-collapse: collapse;
+    background-color: {CARD_BACKGROUND};
+    font-size: 14px;
+}}
+
+th, td {{
+    padding: 6px 12px;
+    border-bottom: 1px solid #e2e8f0;
+    text-align: left;
+}}
+"""
+
+# -------------------------------------------------
+# INPUT FINGERPRINTS
+# -------------------------------------------------
+def job_key(data_fingerprint, store_id, start, end, formats):
+    payload = json.dumps(
+        [RENDERER_VERSION, data_fingerprint, store_id, str(start), str(end), sorted(formats)]
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+def job_directory(out_dir, store_id, start, end):
+    period = f"{start or 'start'}_{end or 'end'}"
+    return os.path.join(out_dir, f"store_{store_id}", period)
+
+def expected_outputs(directory, formats):
+    return [
+        os.path.join(directory, f"{page}.{fmt}")
+        for page in PAGES
+        for fmt in formats
+    ]
+
+def load_manifest(out_dir):
+    path = os.path.join(out_dir, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as handle:
+        return json.load(handle)
+
+def save_manifest(out_dir, manifest):
+    path = os.path.join(out_dir, MANIFEST_FILE)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as handle:
+        json.dump(manifest, handle, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def is_up_to_date(manifest, directory, key, formats):
+    return manifest.get(directory) == key and all(
+        os.path.exists(path) for path in expected_outputs(directory, formats)
+    )
+
+# -------------------------------------------------
+# RENDERERS
+# -------------------------------------------------
+def render_html(report, subtitle):
+    parts = [
+        "<!DOCTYPE html>",
+        "<html><head><meta charset='utf-8'>",
+        f"<title>{html.escape(report['title'])}</title>",
+        f"<style>{REPORT_CSS}</style>",
+        "</head><body>",
+        f"<h1>{html.escape(report['title'])}</h1>",
+        f"<div class='caption'>{html.escape(subtitle)}</div>",
+        "<div class='kpi-row'>"
+    ]
+
+    for title, value in report["kpis"]:
+        parts.append(
+            f"<div class='kpi-card'><div class='kpi-title'>{html.escape(title)}</div>"
+            f"<div class='kpi-value'>{html.escape(str(value))}</div></div>"
+        )
+    parts.append("</div>")
+
+    # plotly.js is inlined once so the file opens without a network connection.
+    include_plotlyjs = True
+    for subheader, caption, fig in report["charts"]:
+        parts.append(f"<div class='subheader'>{html.escape(subheader)}</div>")
+        parts.append(f"<div class='caption'>{html.escape(caption)}</div>")
+        parts.append(fig.to_html(full_html=False, include_plotlyjs=include_plotlyjs))
+        include_plotlyjs = False
+
+    for subheader, caption, table in report["tables"]:
+        parts.append(f"<div class='subheader'>{html.escape(subheader)}</div>")
+        parts.append(f"<div class='caption'>{html.escape(caption)}</div>")
+        parts.append(table.to_html(index=False, border=0))
+
+    parts.append("</body></html>")
+    return "\n".join(parts)
+
+def page_figure(report, subtitle):
+    charts = report["charts"]
+    tables = report["tables"]
+
+    specs = [[{"type": "table"}]]
+    specs += [[{"type": "xy"}] for _ in charts]
+    specs += [[{"type": "table"}] for _ in tables]
+    heights = [0.6] + [3] * len(charts) + [2.5] * len(tables)
+
+    fig = make_subplots(
+        rows=len(specs),
+        cols=1,
+        specs=specs,
+        row_heights=heights,
+        vertical_spacing=0.04,
+        subplot_titles=["Key Indicators"] + [c[0] for c in charts] + [t[0] for t in tables]
+    )
+
+    titles = [title for title, _ in report["kpis"]]
+    values = [str(value) for _, value in report["kpis"]]
+    fig.add_trace(go.Table(header=dict(values=titles), cells=dict(values=[[v] for v in values])), row=1, col=1)
+
+    for row, (_, _, chart) in enumerate(charts, start=2):
+        for trace in chart.data:
+            fig.add_trace(trace, row=row, col=1)
+        fig.update_xaxes(title_text=chart.layout.xaxis.title.text, row=row, col=1)
+        fig.update_yaxes(title_text=chart.layout.yaxis.title.text, row=row, col=1)
+
+    for row, (_, _, table) in enumerate(tables, start=len(charts) + 2):
+        fig.add_trace(
+            go.Table(
+                header=dict(values=list(table.columns)),
+                cells=dict(values=[table[column].tolist() for column in table.columns])
+            ),
+            row=row,
+            col=1
+        )
+
+    fig.update_layout(
+        title=f"{report['title']} — {subtitle}",
+        height=int(sum(heights) * 160),
+        width=1200,
+        showlegend=False,
+        plot_bgcolor="white",
+        paper_bgcolor="white"
+    )
+
+    return fig
+
+# Pages with a build_rollups hook get the rollups of the unfiltered data,
+# built at most once per worker and data version and sliced by every job,
+# instead of rebuilding them from each job's filtered frames.
+@cached("aggregates")
+def load_report_rollups(version, page, _data):
+    return PAGES[page].build_rollups(_data)
+
+def build_page_report(page, view, data, store_id, start, end):
+    if not hasattr(view, "build_rollups"):
+        return view.build_report(data)
+    rollups = load_report_rollups(WORKER_VERSION, page, WORKER_DATA)
+    return view.build_report(data, rollups, store_id, start, end)
+
+def render_job(job):
+    store_id, start, end, formats, directory = job
+    data = filter_data(WORKER_DATA, store_id, start, end)
+    subtitle = f"Store {store_id} · {start or 'start'} to {end or 'end'}"
+
+    os.makedirs(directory, exist_ok=True)
+    written = []
+
+    for page, view in PAGES.items():
+        report = build_page_report(page, view, data, store_id, start, end)
+
+        if "html" in formats:
+            path = os.path.join(directory, f"{page}.html")
+            with open(path, "w", encoding="utf-8") as handle:
+                handle.write(render_html(report, subtitle))
+            written.append(path)
+
+        image_formats = [fmt for fmt in formats if fmt != "html"]
+        if image_formats:
+            fig = page_figure(report, subtitle)
+            for fmt in image_formats:
+                path = os.path.join(directory, f"{page}.{fmt}")
+                fig.write_image(path, format=fmt)
+                written.append(path)
+
+    return directory, written
+
+# -------------------------------------------------
+# WORKER POOL
+# -------------------------------------------------
+WORKER_DATA = None
+WORKER_VERSION = None
+
+def init_worker(file_path, version):
+    global WORKER_DATA, WORKER_VERSION
+    WORKER_DATA = prepared_data(file_path, version)
+    WORKER_VERSION = version
+
+def run(file_path, out_dir, formats, stores=None, start=None, end=None, workers=None, force=False):
+    data_fingerprint = data_version(file_path)
+    manifest = {} if force else load_manifest(out_dir)
+
+    # Parses the workbook at most once for all processes: the prepared
+    # tables are published as memory-mapped Arrow files that each worker opens.
+    data = None
+    if stores is None:
+        data = prepared_data(file_path, data_fingerprint)
+        stores = sorted(data["sales"]["store_id"].unique().tolist())
+
+    jobs = []
+    keys = {}
+    skipped = []
+    failed = []
+    for store_id in stores:
+        directory = job_directory(out_dir, store_id, start, end)
+        key = job_key(data_fingerprint, store_id, start, end, formats)
+        if is_up_to_date(manifest, directory, key, formats):
+            skipped.append(directory)
+            continue
+        keys[directory] = key
+        jobs.append((store_id, start, end, tuple(formats), directory))
+
+    if jobs:
+        if data is None:
+            prepared_data(file_path, data_fingerprint)
+        os.makedirs(out_dir, exist_ok=True)
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=init_worker,
+            initargs=(file_path, data_fingerprint)
+        ) as pool:
+            # A failed job is reported and left out of the manifest, so the
+            # next run retries it; the manifest is saved after every finished
+            # job, so an interrupted run keeps what it completed.
+            futures = {pool.submit(render_job, job): job[-1] for job in jobs}
+            for future in as_completed(futures):
+                directory = futures[future]
+                try:
+                    _, written = future.result()
+                except Exception as error:
+                    failed.append(directory)
+                    print(f"failed {directory}: {type(error).__name__}: {error}", file=sys.stderr)
+                    continue
+                manifest[directory] = keys[directory]
+                save_manifest(out_dir, manifest)
+                print(f"rendered {directory} ({len(written)} files)")
+
+    for directory in skipped:
+        print(f"skipped {directory} (inputs unchanged)")
+
+    return len(jobs) - len(failed), len(skipped), len(failed)
+
+# -------------------------------------------------
+# COMMAND LINE
+# -------------------------------------------------
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Render every dashboard page to static files for each store."
+    )
+    parser.add_argument("--data", default="data.xlsx", help="Source workbook")
+    parser.add_argument("--out", default="reports", help="Output directory")
+    parser.add_argument("--format", nargs="+", choices=FORMATS, default=["html"], dest="formats")
+    parser.add_argument("--stores", nargs="+", type=int, help="Store ids (default: all stores)")
+    parser.add_argument("--start", type=lambda v: pd.Timestamp(v).date(), help="First date, YYYY-MM-DD")
+    parser.add_argument("--end", type=lambda v: pd.Timestamp(v).date(), help="Last date, YYYY-MM-DD")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true", help="Re-render even if inputs are unchanged")
+
+    args = parser.parse_args(argv)
+
+    if any(fmt != "html" for fmt in args.formats) and importlib.util.find_spec("kaleido") is None:
+        parser.error("PNG and PDF output need the kaleido package (pip install kaleido)")
+
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    rendered, skipped, failed = run(
+        args.data,
+        args.out,
+        args.formats,
+        stores=args.stores,
+        start=args.start,
+        end=args.end,
+        workers=args.workers,
+        force=args.force
+    )
+    print(f"{rendered} rendered, {skipped} skipped, {failed} failed")
+    if failed:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+# Threads used to evaluate one graph. NumPy and pandas release the GIL in
+# most aggregation and merge kernels, so independent KPIs and charts overlap.
+MAX_WORKERS = int(os.environ.get("DASHBOARD_RENDER_THREADS", str(min(8, os.cpu_count() or 1))))
+
+# -------------------------------------------------
+# TASKS
+# -------------------------------------------------
+class Task:
+    # One node: fn called with args, where any argument that is itself a Task
+    # is replaced by that task's result.
+
+    def __init__(self, name, fn, args, kwargs):
+        self.name = name
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+
+    def dependencies(self):
+        values = list(self.args) + list(self.kwargs.values())
+        return [value for value in values if isinstance(value, Task)]
+
+    def __call__(self, results):
+        def resolve(value):
+            return results[value.name] if isinstance(value, Task) else value
+
+        return self.fn(
+            *[resolve(value) for value in self.args],
+            **{key: resolve(value) for key, value in self.kwargs.items()}
+        )
+
+    def __repr__(self):
+        return f"Task({self.name!r})"
+
+# -------------------------------------------------
+# GRAPH
+# -------------------------------------------------
+class TaskGraph:
+    # Tasks are registered by name; adding a name that already exists returns
+    # the existing node, so a subcomputation shared by several KPIs (cost of
+    # goods sold under gross profit, margin and net profit) runs once. A task
+    # can only depend on tasks added before it, so the graph has no cycles.
+
+    def __init__(self):
+        self.tasks = {}
+
+    def add(self, name, fn, *args, **kwargs):
+        if name not in self.tasks:
+            self.tasks[name] = Task(name, fn, args, kwargs)
+        return self.tasks[name]
+
+    def __contains__(self, name):
+        return name in self.tasks
+
+    def run(self, max_workers=MAX_WORKERS):
+        # Returns {name: result}. Each task is submitted as soon as everything
+        # it depends on has finished; the first exception is re-raised after
+        # queued tasks are cancelled.
+        results = {}
+        if max_workers <= 1:
+            for name, task in self.tasks.items():
+                results[name] = task(results)
+            return results
+
+        waiting = {name: {dep.name for dep in task.dependencies()} for name, task in self.tasks.items()}
+        dependants = {name: [] for name in self.tasks}
+        for name, deps in waiting.items():
+            for dep in deps:
+                dependants[dep].append(name)
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, max(len(self.tasks), 1))) as pool:
+            def submit(name):
+                return pool.submit(self.tasks[name], results)
+
+            running = {submit(name): name for name, deps in waiting.items() if not deps}
+            try:
+                while running:
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        name = running.pop(future)
+                        results[name] = future.result()
+                        for dependant in dependants[name]:
+                            waiting[dependant].discard(name)
+                            if not waiting[dependant]:
+                                running[submit(dependant)] = dependant
+            except BaseException:
+                for future in running:
+                    future.cancel()
+                raise
+
+        return results
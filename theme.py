@@ -0,0 +1,188 @@
+import os
+
+import streamlit as st
+
+# -------------------------------------------------
+# COLOR SCHEME (SHARED BY ALL PAGES)
+# -------------------------------------------------
+BACKGROUND_COLOR = "#f5f7fb"
+CARD_BACKGROUND = "#ffffff"
+SIDEBAR_BACKGROUND = "#ffffff"
+SECONDARY_COLOR = "#0f172a"
+MUTED_TEXT = "#64748b"
+DIVIDER_COLOR = "#e5e7eb"
+INFO_BACKGROUND = "#eef2ff"
+INFO_BORDER = "#c7d2fe"
+
+# Chart colors, used by the views and the static reports alike.
+PRIMARY_COLOR = "#4f46e5"
+ACCENT_COLOR = "#10b981"
+INFO_COLOR = "#0369a1"
+SUCCESS_COLOR = "#15803d"
+WARNING_COLOR = "#d97706"
+DANGER_COLOR = "#b91c1c"
+MUTED_COLOR = "#94a3b8"
+FORECAST_COLOR = WARNING_COLOR
+INTERVAL_FILL = "rgba(217, 119, 6, 0.15)"
+AXIS_COLOR = "#334155"
+GRID_COLOR = "#e2e8f0"
+
+# -------------------------------------------------
+# PAGE CSS
+# -------------------------------------------------
+def render_css():
+    css = f"""
+    .stApp {{
+        background-color: {BACKGROUND_COLOR};
+    }}
+
+    .kpi-card {{
+        background-color: {CARD_BACKGROUND};
+        padding: 22px;
+        border-radius: 16px;
+        box-shadow: 0 8px 22px rgba(0,0,0,0.05);
+        text-align: center;
+    }}
+
+    .kpi-title {{
+        font-size: 12px;
+        color: {MUTED_TEXT};
+        text-transform: uppercase;
+        letter-spacing: 0.05em;
+        margin-bottom: 6px;
+    }}
+
+    .kpi-value {{
+        font-size: 28px;
+        font-weight: 700;
+        color: {SECONDARY_COLOR};
+    }}
+
+    .section-title {{
+        font-size: 24px;
+        font-weight: 700;
+        margin: 32px 0 10px 0;
+        color: {SECONDARY_COLOR};
+    }}
+
+    .subheader {{
+        font-size: 18px;
+        font-weight: 600;
+        color: {SECONDARY_COLOR};
+        margin-bottom: 4px;
+    }}
+
+    .caption {{
+        font-size: 13px;
+        color: {MUTED_TEXT};
+        margin-bottom: 10px;
+    }}
+
+    section[data-testid="stSidebar"] {{
+        background-color: {SIDEBAR_BACKGROUND};
+        border-right: 1px solid {DIVIDER_COLOR};
+    }}
+
+    section[data-testid="stSidebar"] > div {{
+        padding-top: 20px;
+    }}
+
+    h1, h2, h3 {{
+        color: {SECONDARY_COLOR};
+    }}
+
+    p, li {{
+        color: {SECONDARY_COLOR};
+        font-size: 15px;
+        line-height: 1.6;
+    }}
+
+    .muted {{
+        color: {MUTED_TEXT};
+        font-size: 14px;
+    }}
+
+    .sidebar-title {{
+        font-size: 22px;
+        font-weight: 700;
+        color: {SECONDARY_COLOR};
+        margin-bottom: 2px;
+    }}
+
+    .sidebar-subtitle {{
+        font-size: 13px;
+        color: {MUTED_TEXT};
+        margin-bottom: 16px;
+    }}
+
+    .sidebar-section {{
+        font-size: 14px;
+        font-weight: 600;
+        color: {SECONDARY_COLOR};
+        margin: 18px 0 6px 0;
+    }}
+
+    hr {{
+        border: none;
+        height: 1px;
+        background-color: {DIVIDER_COLOR};
+        margin: 16px 0;
+    }}
+
+    div[data-testid="stAlert"] {{
+        background-color: {INFO_BACKGROUND};
+        border: 1px solid {INFO_BORDER};
+        color: {SECONDARY_COLOR};
+    }}
+    """
+    # Whitespace is collapsed so every rerun ships the smallest payload.
+    return f"<style>{' '.join(css.split())}</style>"
+
+# Formatted once per server process and reused by every page and rerun.
+PAGE_CSS = render_css()
+
+def apply_theme():
+    st.markdown(PAGE_CSS, unsafe_allow_html=True)
+
+# -------------------------------------------------
+# KPI COMPONENTS
+# -------------------------------------------------
+def kpi_card(title, value):
+    st.markdown(
+        f'<div class="kpi-card"><div class="kpi-title">{title}</div><div class="kpi-value">{value}</div></div>',
+        unsafe_allow_html=True
+    )
+
+def kpi_row(kpi_values):
+    for column, (title, value) in zip(st.columns(len(kpi_values)), kpi_values):
+        with column:
+            kpi_card(title, value)
+
+# -------------------------------------------------
+# EXPORTS
+# -------------------------------------------------
+def export_panel(datasets, key):
+    # datasets maps a label to the frame behind it. The file is only encoded
+    # when the button is pressed. It is written to disk chunk by chunk, and
+    # the link serves it from there, so the table is never held as one file
+    # in memory. exports is imported here so pages do not load pyarrow just
+    # to render.
+    from exports import EXPORT_FORMATS, MAX_DOWNLOAD_BYTES, download_url, publish_download
+
+    with st.expander("Export data"):
+        table_col, format_col = st.columns([2, 1])
+        with table_col:
+            label = st.selectbox("Table", list(datasets), key=f"{key}_export_table")
+        with format_col:
+            fmt = st.radio("Format", list(EXPORT_FORMATS), horizontal=True, key=f"{key}_export_format")
+
+        frame = datasets[label]
+        st.caption(f"{len(frame):,} rows, {len(frame.columns)} columns")
+        if st.button("Prepare download", key=f"{key}_export_prepare"):
+            path = publish_download(frame, f"{key}_{label.lower().replace(' ', '_')}", fmt)
+            name = os.path.basename(path)
+            if os.path.getsize(path) > MAX_DOWNLOAD_BYTES:
+                os.remove(path)
+                st.warning(f"{name} is over {MAX_DOWNLOAD_BYTES // (1024 * 1024)} MB; export it with exports.py instead.")
+            else:
+                st.markdown(f'<a href="{download_url(path)}" download="{name}">Download {name}</a>', unsafe_allow_html=True)
@@ -0,0 +1,2 @@
+# Chart builders import plotly inside the function, so importing a view for its
+# KPI and table helpers does not load plotly.express until a chart is built.
@@ -0,0 +1,186 @@
+import pandas as pd
+
+from analytics.customers import customer_analytics
+from theme import AXIS_COLOR, GRID_COLOR, MUTED_COLOR, PRIMARY_COLOR, SUCCESS_COLOR
+
+TITLE = "Customer Insights"
+
+# -------------------------------------------------
+# KPI CALCULATIONS
+# -------------------------------------------------
+def active_customers(rfm):
+    return len(rfm)
+
+def loyalty_member_share(rfm, customers):
+    members = customers.loc[customers["loyalty_member"] == "Yes", "customer_id"]
+    return round(rfm["customer_id"].isin(members).mean() * 100, 1) if len(rfm) else 0
+
+def average_spend_per_customer(rfm):
+    return rfm["monetary"].mean() if len(rfm) else 0
+
+def repeat_customer_rate(rfm):
+    return round((rfm["frequency"] > 1).mean() * 100, 1) if len(rfm) else 0
+
+def average_visits_per_customer(rfm):
+    return rfm["frequency"].mean() if len(rfm) else 0
+
+def kpis(data, analytics):
+    rfm = analytics["rfm"]
+
+    return [
+        ("Active Customers", f"{active_customers(rfm):,}"),
+        ("Loyalty Members", f"{loyalty_member_share(rfm, data['customers'])}%"),
+        ("Avg Spend Per Customer", f"₦{average_spend_per_customer(rfm):,.0f}"),
+        ("Repeat Customer Rate", f"{repeat_customer_rate(rfm)}%"),
+        ("Avg Visits Per Customer", f"{average_visits_per_customer(rfm):,.1f}")
+    ]
+
+def shopper_reach_kpis(reach):
+    quantiles = reach["quantiles"]
+
+    return [
+        ("Unique Shoppers", f"≈{reach['unique_customers']:,}"),
+        ("Active Cashiers", f"≈{reach['unique_cashiers']:,}"),
+        ("Median Sale Value", f"₦{quantiles[0.5]:,.0f}" if reach["lines"] else "–"),
+        ("90th Percentile Sale", f"₦{quantiles[0.9]:,.0f}" if reach["lines"] else "–")
+    ]
+
+# -------------------------------------------------
+# CHARTS
+# -------------------------------------------------
+def rfm_segment_chart(rfm):
+    import plotly.express as px
+
+    grouped = rfm.groupby("segment").agg(
+        Customers=("customer_id", "count"),
+        Revenue=("monetary", "sum")
+    ).reset_index().sort_values("Revenue", ascending=False)
+
+    fig = px.bar(
+        grouped,
+        x="segment",
+        y="Customers",
+        custom_data=["Revenue"]
+    )
+
+    fig.update_traces(
+        marker_color=PRIMARY_COLOR,
+        hovertemplate="<b>Segment:</b> %{x}<br><b>Customers:</b> %{y:,}<br><b>Revenue:</b> ₦%{customdata[0]:,.0f}<extra></extra>"
+    )
+    fig.update_layout(
+        plot_bgcolor="white",
+        paper_bgcolor="white",
+        font=dict(color=AXIS_COLOR),
+        xaxis_title="RFM Segment",
+        yaxis_title="Customers",
+        yaxis_gridcolor=GRID_COLOR
+    )
+
+    return fig
+
+def loyalty_spend_chart(loyalty):
+    import plotly.express as px
+
+    grouped = loyalty.assign(
+        Membership=loyalty["loyalty_member"].map({"Yes": "Loyalty Member", "No": "Non-Member"}).fillna("Unknown")
+    )
+
+    fig = px.bar(
+        grouped,
+        x="Membership",
+        y="spend_per_customer",
+        color="Membership",
+        custom_data=["spend_per_visit", "revenue_share"],
+        color_discrete_map={
+            "Loyalty Member": SUCCESS_COLOR,
+            "Non-Member": MUTED_COLOR
+        }
+    )
+
+    fig.update_traces(
+        hovertemplate=(
+            "<b>%{x}</b><br><b>Spend Per Customer:</b> ₦%{y:,.0f}"
+            "<br><b>Spend Per Visit:</b> ₦%{customdata[0]:,.0f}"
+            "<br><b>Revenue Share:</b> %{customdata[1]:.1%}<extra></extra>"
+        )
+    )
+    fig.update_layout(
+        plot_bgcolor="white",
+        paper_bgcolor="white",
+        font=dict(color=AXIS_COLOR),
+        xaxis_title="Membership",
+        yaxis_title="Spend Per Customer (₦)",
+        yaxis_tickprefix="₦",
+        yaxis_gridcolor=GRID_COLOR,
+        showlegend=False
+    )
+
+    return fig
+
+def retention_cohort_chart(retention):
+    import plotly.express as px
+
+    fig = px.imshow(
+        retention * 100,
+        color_continuous_scale="Blues",
+        zmin=0,
+        zmax=100,
+        aspect="auto",
+        labels=dict(x="Months Since First Purchase", y="Cohort", color="Retained (%)")
+    )
+
+    fig.update_traces(
+        hovertemplate="<b>Cohort:</b> %{y}<br><b>Month:</b> +%{x}<br><b>Retained:</b> %{z:.1f}%<extra></extra>"
+    )
+    fig.update_layout(
+        plot_bgcolor="white",
+        paper_bgcolor="white",
+        font=dict(color=AXIS_COLOR)
+    )
+
+    return fig
+
+# -------------------------------------------------
+# TABLE
+# -------------------------------------------------
+def top_customers_table(rfm, customers, top_n=10):
+    top = rfm.sort_values("monetary", ascending=False).head(top_n).merge(
+        customers[["customer_id", "gender", "age_group", "loyalty_member"]],
+        on="customer_id",
+        how="left"
+    )
+
+    return pd.DataFrame({
+        "Customer": top["customer_id"],
+        "Segment": top["segment"],
+        "Total Spend (₦)": top["monetary"],
+        "Visits": top["frequency"],
+        "Days Since Last Visit": top["recency_days"],
+        "RFM Score": top["rfm_score"],
+        "Loyalty Member": top["loyalty_member"],
+        "Age Group": top["age_group"],
+        "Gender": top["gender"]
+    })
+
+# -------------------------------------------------
+# STATIC REPORT
+# -------------------------------------------------
+def build_report(data):
+    analytics = customer_analytics(data)
+
+    return {
+        "title": TITLE,
+        "kpis": kpis(data, analytics),
+        "charts": [
+            ("Customer Segments (RFM)", "Customers grouped by how recently, how often and how much they buy.",
+             rfm_segment_chart(analytics["rfm"])),
+            ("Loyalty vs Non-Loyalty Spend", "Average spend per customer by loyalty membership.",
+             loyalty_spend_chart(analytics["loyalty"])),
+            ("Monthly Retention Cohorts", "Share of each first-purchase cohort that buys again in later months.",
+             retention_cohort_chart(analytics["retention"]))
+        ],
+        "tables": [
+            ("Top Customers", "Highest-spending customers with their RFM profile.",
+             top_customers_table(analytics["rfm"], data["customers"]))
+        ]
+    }
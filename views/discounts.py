@@ -0,0 +1,192 @@
+import pandas as pd
+
+from analytics.discounts import (
+    DEPTH_BANDS,
+    depth_response,
+    discount_by_group,
+    discount_rollup,
+    discount_summary,
+    payment_mix,
+    promo_uplift,
+    slice_bands,
+    uplift_by_product
+)
+from theme import AXIS_COLOR, GRID_COLOR, PRIMARY_COLOR, SUCCESS_COLOR, WARNING_COLOR
+
+TITLE = "Discounts & Payments"
+
+# Payment methods keep one colour across every chart.
+PAYMENT_COLORS = {"Cash": SUCCESS_COLOR, "POS": PRIMARY_COLOR, "Transfer": WARNING_COLOR}
+
+MEASURE_LABELS = {"lines": "Transactions", "revenue": "Revenue"}
+
+# -------------------------------------------------
+# KPI CALCULATIONS
+# -------------------------------------------------
+def percent(value, digits=1):
+    return f"{value * 100:,.{digits}f}%" if pd.notna(value) else "–"
+
+def kpis(summary):
+    given_up = summary["list_margin"] - summary["net_margin"]
+    return [
+        ("Discounts Given", f"₦{summary['discount']:,.0f}"),
+        ("Discount Rate", percent(summary["discount_rate"], 2)),
+        ("Margin Before Discounts", percent(summary["list_margin"])),
+        ("Margin After Discounts", percent(summary["net_margin"])),
+        ("Margin Given Up", f"{given_up * 100:,.2f} pts" if pd.notna(given_up) else "–")
+    ]
+
+# -------------------------------------------------
+# CHARTS
+# -------------------------------------------------
+def depth_response_chart(response):
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=response["Depth"],
+        y=response["units_per_line"],
+        marker_color=PRIMARY_COLOR,
+        name="Units Per Line",
+        customdata=response[["lines"]],
+        hovertemplate="<b>%{x}</b><br>Units per line: %{y:.2f}<br>Lines: %{customdata[0]:,}<extra></extra>"
+    ))
+    fig.add_trace(go.Scatter(
+        x=response["Depth"],
+        y=response["net_margin"] * 100,
+        mode="lines+markers",
+        line=dict(color=WARNING_COLOR, width=3),
+        name="Margin After Discount",
+        yaxis="y2",
+        hovertemplate="<b>%{x}</b><br>Margin: %{y:.1f}%<extra></extra>"
+    ))
+
+    fig.update_layout(
+        plot_bgcolor="white",
+        paper_bgcolor="white",
+        font=dict(color=AXIS_COLOR),
+        xaxis=dict(title="Discount Depth", categoryorder="array", categoryarray=DEPTH_BANDS),
+        yaxis=dict(title="Units Per Line", gridcolor=GRID_COLOR),
+        yaxis2=dict(title="Margin (%)", overlaying="y", side="right", ticksuffix="%"),
+        legend=dict(orientation="h", y=1.1)
+    )
+
+    return fig
+
+def margin_given_up_chart(by_group, group_label):
+    import plotly.express as px
+
+    frame = by_group.assign(
+        GivenUp=(by_group["margin_given_up"] * 100).round(2),
+        Rate=(by_group["discount_rate"] * 100).round(2)
+    )
+
+    fig = px.bar(
+        frame,
+        x=by_group.columns[0],
+        y="GivenUp",
+        custom_data=["discount", "Rate"]
+    )
+
+    fig.update_traces(
+        marker_color=WARNING_COLOR,
+        hovertemplate=(
+            "<b>%{x}</b><br>Margin given up: %{y:.2f} pts<br>Discounts: ₦%{customdata[0]:,.0f}"
+            "<br>Discount rate: %{customdata[1]:.2f}%<extra></extra>"
+        )
+    )
+    fig.update_layout(
+        plot_bgcolor="white",
+        paper_bgcolor="white",
+        font=dict(color=AXIS_COLOR),
+        xaxis_title=group_label,
+        yaxis_title="Margin Given Up (pts)",
+        yaxis_gridcolor=GRID_COLOR
+    )
+
+    return fig
+
+def payment_mix_chart(mix, x, x_title, measure="lines"):
+    import plotly.express as px
+
+    fig = px.bar(
+        mix.assign(Share=(mix["share"] * 100).round(1)),
+        x=x,
+        y="Share",
+        color="payment_method",
+        color_discrete_map=PAYMENT_COLORS,
+        labels={"payment_method": "Payment Method"}
+    )
+
+    fig.update_traces(hovertemplate="%{x}<br>%{y:.1f}%<extra>%{fullData.name}</extra>")
+    fig.update_layout(
+        barmode="stack",
+        plot_bgcolor="white",
+        paper_bgcolor="white",
+        font=dict(color=AXIS_COLOR),
+        xaxis=dict(title=x_title, type="category"),
+        yaxis=dict(title=f"Share Of {MEASURE_LABELS[measure]} (%)", ticksuffix="%", range=[0, 100], gridcolor=GRID_COLOR),
+        legend=dict(orientation="h", y=1.1)
+    )
+
+    return fig
+
+# -------------------------------------------------
+# TABLES
+# -------------------------------------------------
+def discount_group_table(by_group, group_label):
+    return pd.DataFrame({
+        group_label: by_group.iloc[:, 0],
+        "Discounts (₦)": by_group["discount"].round(0),
+        "Discount Rate (%)": (by_group["discount_rate"] * 100).round(2),
+        "Margin Before (%)": (by_group["list_margin"] * 100).round(1),
+        "Margin After (%)": (by_group["net_margin"] * 100).round(1),
+        "Units Per Line": by_group["units_per_line"].round(2)
+    })
+
+def uplift_table(by_product):
+    return pd.DataFrame({
+        "Product": by_product["product_name"],
+        "Category": by_product["category"],
+        "Discount Periods": by_product["periods"],
+        "Promo Days": by_product["promo_days"],
+        "Units Sold": by_product["units"].round(0),
+        "Expected Units": by_product["expected_units"].round(0),
+        "Uplift (%)": (by_product["uplift"] * 100).round(1),
+        "After-Period Change (%)": (by_product["mean_post_change"] * 100).round(1),
+        "Discount Per Extra Unit (₦)": by_product["discount_per_incremental_unit"].round(0)
+    })
+
+# -------------------------------------------------
+# STATIC REPORT
+# -------------------------------------------------
+def build_rollups(data):
+    return discount_rollup(data["sales"], data["products"])
+
+def build_report(data, rollup=None, store_id=None, start=None, end=None):
+    # rollup, when given, is build_rollups of the unfiltered data and is
+    # sliced to the store and period here.
+    products = data["products"]
+    if rollup is None:
+        rollup = build_rollups(data)
+    bands = slice_bands(rollup, products, start, end, store_id)
+    by_category = discount_by_group(bands, "category")
+
+    return {
+        "title": TITLE,
+        "kpis": kpis(discount_summary(bands)),
+        "charts": [
+            ("Discount Depth vs Units And Margin", "Units per line and margin after discount for each depth band.",
+             depth_response_chart(depth_response(bands))),
+            ("Margin Given Up By Category", "Gross margin points lost to discounts in each category.",
+             margin_given_up_chart(by_category, "Category")),
+            ("Payment Mix By Hour", "Share of transactions paid by cash, POS and transfer at each hour.",
+             payment_mix_chart(payment_mix(rollup, "Hour", start, end, store_id), "Hour", "Hour Of Day"))
+        ],
+        "tables": [
+            ("Discounts By Category", "Discount spend and margin before and after discounts.",
+             discount_group_table(by_category, "Category")),
+            ("Discount Period Uplift", "Units sold in discount periods against the weeks before them.",
+             uplift_table(uplift_by_product(promo_uplift(bands), products)))
+        ]
+    }
@@ -0,0 +1,218 @@
+import pandas as pd
+
+from analytics.anomalies import METRIC_LABELS, anomaly_alerts, detect_anomalies
+from analytics.replenishment import reorder_alerts, replenishment_metrics
+from analytics.rolling import RollingDaily
+from task_graph import TaskGraph
+from theme import ACCENT_COLOR, AXIS_COLOR, CARD_BACKGROUND, GRID_COLOR, PRIMARY_COLOR
+
+TITLE = "Executive Overview"
+
+# ----------------------------------
+# KPI CALCULATIONS
+# ----------------------------------
+# Day-level figures read the rolling daily buckets, which already hold
+# today's and the trailing month's totals.
+def calculate_today_revenue(rolling):
+    return rolling.day_total("revenue")
+
+def calculate_gross_margin(sales, products):
+    merged = sales.merge(products, on="product_id")
+    revenue = merged["total_amount"].sum()
+    cost = (merged["quantity_sold"] * merged["cost_price"]).sum()
+    return round((revenue - cost) / revenue * 100, 2) if revenue else 0
+
+def calculate_stockout_rate(inventory):
+    stockouts = inventory[inventory["closing_stock"] <= 0]
+    return round(len(stockouts) / len(inventory) * 100, 2) if len(inventory) else 0
+
+def calculate_expired_stock_value(inventory, products):
+    merged = inventory.merge(products, on="product_id")
+    return (merged["expired_qty"] * merged["cost_price"]).sum()
+
+def calculate_energy_cost_today(rolling):
+    return rolling.day_total("energy_cost")
+
+def kpi_cards(today_revenue, margin, stockout_rate, expired_value, energy_today):
+    return [
+        ("Today’s Revenue", f"₦{today_revenue:,.0f}"),
+        ("Gross Margin", f"{margin}%"),
+        ("Stockout Rate", f"{stockout_rate}%"),
+        ("Expired Stock Value", f"₦{expired_value:,.0f}"),
+        ("Energy Cost Today", f"₦{energy_today:,.0f}")
+    ]
+
+def kpi_tasks(graph, data, rolling):
+    # rolling may be a task itself, in which case the day-level KPIs wait for
+    # it while the margin and inventory KPIs start straight away.
+    sales = data["sales"]
+    inventory = data["inventory"]
+    products = data["products"]
+
+    return graph.add(
+        "kpis", kpi_cards,
+        graph.add("today_revenue", calculate_today_revenue, rolling),
+        graph.add("gross_margin", calculate_gross_margin, sales, products),
+        graph.add("stockout_rate", calculate_stockout_rate, inventory),
+        graph.add("expired_stock_value", calculate_expired_stock_value, inventory, products),
+        graph.add("energy_cost_today", calculate_energy_cost_today, rolling)
+    )
+
+def kpis(data, rolling):
+    graph = TaskGraph()
+    cards = kpi_tasks(graph, data, rolling)
+    return graph.run()[cards.name]
+
+# ----------------------------------
+# CHARTS
+# ----------------------------------
+def revenue_trend_chart(rolling):
+    import plotly.express as px
+
+    grouped = rolling.series("revenue").rename_axis("Transaction Date").rename("total_amount").reset_index()
+
+    fig = px.line(
+        grouped,
+        x="Transaction Date",
+        y="total_amount",
+        markers=True
+    )
+
+    fig.update_traces(
+        line=dict(color=PRIMARY_COLOR, width=3),
+        marker=dict(size=6, color=PRIMARY_COLOR),
+        hovertemplate="<b>Date:</b> %{x|%d %b %Y}<br><b>Revenue:</b> ₦%{y:,.0f}<extra></extra>"
+    )
+
+    fig.update_layout(
+        plot_bgcolor=CARD_BACKGROUND,
+        paper_bgcolor=CARD_BACKGROUND,
+        font=dict(color=AXIS_COLOR),
+        xaxis=dict(title="Date", gridcolor=GRID_COLOR),
+        yaxis=dict(title="Revenue (₦)", tickprefix="₦", gridcolor=GRID_COLOR),
+        margin=dict(l=40, r=40, t=20, b=40)
+    )
+
+    return fig
+
+def top_categories_chart(sales):
+    import plotly.express as px
+
+    grouped = sales.groupby("product_category")["total_amount"].sum().reset_index()
+    grouped = grouped.sort_values("total_amount", ascending=False).head(5)
+
+    fig = px.bar(
+        grouped,
+        x="product_category",
+        y="total_amount"
+    )
+
+    fig.update_traces(
+        marker_color=ACCENT_COLOR,
+        hovertemplate="<b>Category:</b> %{x}<br><b>Revenue:</b> ₦%{y:,.0f}<extra></extra>"
+    )
+
+    fig.update_layout(
+        plot_bgcolor=CARD_BACKGROUND,
+        paper_bgcolor=CARD_BACKGROUND,
+        font=dict(color=AXIS_COLOR),
+        xaxis_title="Product Category",
+        yaxis_title="Revenue (₦)",
+        yaxis_tickprefix="₦",
+        xaxis_gridcolor=GRID_COLOR,
+        yaxis_gridcolor=GRID_COLOR,
+        margin=dict(l=40, r=40, t=20, b=40)
+    )
+
+    return fig
+
+# ----------------------------------
+# LIVE MODE
+# ----------------------------------
+def live_kpis(snapshot):
+    last_update = snapshot["last_update"]
+    return [
+        ("Live Revenue Today", f"₦{snapshot['revenue']:,.0f}"),
+        ("Units Sold Today", f"{snapshot['units']:,}"),
+        ("Sales Lines Today", f"{snapshot['lines']:,}"),
+        ("Last Update", last_update.strftime("%H:%M:%S") if last_update is not None else "—")
+    ]
+
+def intraday_revenue_chart(trend):
+    import plotly.express as px
+
+    fig = px.bar(
+        trend,
+        x="Time",
+        y="Revenue"
+    )
+
+    fig.update_traces(
+        marker_color=PRIMARY_COLOR,
+        hovertemplate="<b>Time:</b> %{x|%H:%M}<br><b>Revenue:</b> ₦%{y:,.0f}<extra></extra>"
+    )
+
+    fig.update_layout(
+        plot_bgcolor=CARD_BACKGROUND,
+        paper_bgcolor=CARD_BACKGROUND,
+        font=dict(color=AXIS_COLOR),
+        xaxis=dict(title="Time", tickformat="%H:%M", gridcolor=GRID_COLOR),
+        yaxis=dict(title="Revenue (₦)", tickprefix="₦", gridcolor=GRID_COLOR),
+        margin=dict(l=40, r=40, t=20, b=40)
+    )
+
+    return fig
+
+# ----------------------------------
+# ALERT TABLE
+# ----------------------------------
+def low_stock_alert_table(inventory, products):
+    alerts = reorder_alerts(replenishment_metrics(inventory, products))
+
+    return pd.DataFrame({
+        "Product Name": alerts["product_name"],
+        "Current Stock": alerts["closing_stock"].astype(int),
+        "Reorder Point": alerts["reorder_point"].astype(int),
+        "Days Of Cover": alerts["days_of_cover"].round(1),
+        "Stockout Risk (%)": (alerts["stockout_probability"] * 100).round(1)
+    }).reset_index(drop=True)
+
+# Alerts cover the most recent ALERT_DAYS days of each store's history.
+ALERT_DAYS = 30
+
+def anomaly_alert_table(scores, days=ALERT_DAYS):
+    alerts = anomaly_alerts(scores, days)
+
+    return pd.DataFrame({
+        "Date": alerts["Date"].dt.strftime("%d %b %Y"),
+        "Store": alerts["store_id"],
+        "Metric": alerts["metric"].map(METRIC_LABELS),
+        "Actual": alerts["value"].round(0),
+        "Expected": alerts["expected"].round(0),
+        "Deviation (robust z)": alerts["score"].round(1),
+        "Direction": alerts["score"].gt(0).map({True: "Above normal", False: "Below normal"})
+    }).reset_index(drop=True)
+
+# ----------------------------------
+# STATIC REPORT
+# ----------------------------------
+def build_report(data):
+    sales = data["sales"]
+    rolling = RollingDaily.from_data(data)
+
+    return {
+        "title": TITLE,
+        "kpis": kpis(data, rolling),
+        "charts": [
+            ("Daily Revenue Trend", "Daily total revenue over the last 30 days.",
+             revenue_trend_chart(rolling)),
+            ("Top Revenue Categories", "Product categories generating the most revenue.",
+             top_categories_chart(sales))
+        ],
+        "tables": [
+            ("Unusual Activity", f"Store-days in the last {ALERT_DAYS} days that deviate from the usual weekday pattern.",
+             anomaly_alert_table(detect_anomalies(data))),
+            ("Low Stock Items", "Products at or below their reorder point, most urgent first.",
+             low_stock_alert_table(data["inventory"], data["products"]))
+        ]
+    }
@@ -0,0 +1,288 @@
+import pandas as pd
+
+from analytics.expiry import RISK_HORIZON_DAYS, expiry_cohorts, expiry_risk_by_day, expiry_risk_by_product
+from analytics.reconciliation import GAP_WINDOW_DAYS, STATUS_LABELS, reconcile_days, reconciliation_trend, shrinkage_summary
+from analytics.replenishment import reorder_alerts, replenishment_metrics
+from theme import AXIS_COLOR, DANGER_COLOR, GRID_COLOR, PRIMARY_COLOR, SECONDARY_COLOR, SUCCESS_COLOR, WARNING_COLOR
+
+TITLE = "Inventory & Stock Health"
+
+# -------------------------------------------------
+# LATEST SNAPSHOT
+# -------------------------------------------------
+def latest_snapshot(inventory):
+    latest_date = inventory["Snapshot Date"].max()
+    return inventory[inventory["Snapshot Date"] == latest_date]
+
+# -------------------------------------------------
+# KPI CALCULATIONS
+# -------------------------------------------------
+def total_units_in_stock(inventory):
+    latest = latest_snapshot(inventory)
+    return int(latest["closing_stock"].sum())
+
+def stockout_rate(inventory):
+    latest = latest_snapshot(inventory)
+    return round((latest["closing_stock"] <= 0).mean() * 100, 2) if len(latest) else 0
+
+def damaged_and_expired_units(inventory):
+    latest = latest_snapshot(inventory)
+    return int(latest["damaged_qty"].sum() + latest["expired_qty"].sum())
+
+def received_units_today(inventory):
+    latest = latest_snapshot(inventory)
+    return int(latest["received_qty"].sum())
+
+def sold_units_today(inventory):
+    latest = latest_snapshot(inventory)
+    return int(latest["sold_qty"].sum())
+
+def kpis(data):
+    inventory = data["inventory"]
+
+    return [
+        ("Total Units In Stock", f"{total_units_in_stock(inventory):,}"),
+        ("Stockout Rate", f"{stockout_rate(inventory)}%"),
+        ("Damaged & Expired Units", f"{damaged_and_expired_units(inventory):,}"),
+        ("Units Received Today", f"{received_units_today(inventory):,}"),
+        ("Units Sold Today", f"{sold_units_today(inventory):,}")
+    ]
+
+# -------------------------------------------------
+# CHARTS
+# -------------------------------------------------
+def stock_movement_breakdown_chart(inventory):
+    import plotly.express as px
+
+    latest = latest_snapshot(inventory)
+
+    summary = pd.DataFrame({
+        "Movement Type": [
+            "Opening Stock",
+            "Received",
+            "Sold",
+            "Damaged",
+            "Expired",
+            "Closing Stock"
+        ],
+        "Units": [
+            latest["opening_stock"].sum(),
+            latest["received_qty"].sum(),
+            latest["sold_qty"].sum(),
+            latest["damaged_qty"].sum(),
+            latest["expired_qty"].sum(),
+            latest["closing_stock"].sum()
+        ]
+    })
+
+    fig = px.bar(
+        summary,
+        x="Movement Type",
+        y="Units",
+        color="Movement Type",
+        color_discrete_map={
+            "Opening Stock": PRIMARY_COLOR,
+            "Received": SUCCESS_COLOR,
+            "Sold": PRIMARY_COLOR,
+            "Damaged": WARNING_COLOR,
+            "Expired": DANGER_COLOR,
+            "Closing Stock": SECONDARY_COLOR
+        }
+    )
+
+    fig.update_layout(
+        plot_bgcolor="white",
+        paper_bgcolor="white",
+        font=dict(color=AXIS_COLOR),
+        xaxis_title="Inventory Movement Type",
+        yaxis_title="Units",
+        yaxis_gridcolor=GRID_COLOR
+    )
+
+    return fig
+
+def stock_level_distribution_chart(inventory):
+    import plotly.express as px
+
+    latest = latest_snapshot(inventory).copy()
+
+    latest["Stock Status"] = latest["closing_stock"].apply(
+        lambda x: "Stockout" if x <= 0 else "In Stock"
+    )
+
+    grouped = latest["Stock Status"].value_counts().reset_index()
+    grouped.columns = ["Stock Status", "Number Of Products"]
+
+    fig = px.bar(
+        grouped,
+        x="Stock Status",
+        y="Number Of Products",
+        color="Stock Status",
+        color_discrete_map={
+            "In Stock": SUCCESS_COLOR,
+            "Stockout": DANGER_COLOR
+        }
+    )
+
+    fig.update_layout(
+        plot_bgcolor="white",
+        paper_bgcolor="white",
+        font=dict(color=AXIS_COLOR),
+        xaxis_title="Stock Status",
+        yaxis_title="Number Of Products",
+        yaxis_gridcolor=GRID_COLOR
+    )
+
+    return fig
+
+def expiry_risk_chart(cohorts):
+    import plotly.express as px
+
+    grouped = expiry_risk_by_day(cohorts)
+
+    fig = px.bar(
+        grouped,
+        x="expiry_date",
+        y="value_at_risk"
+    )
+
+    fig.update_traces(
+        marker_color=DANGER_COLOR,
+        hovertemplate="<b>Expires:</b> %{x|%d %b %Y}<br><b>Value At Risk:</b> ₦%{y:,.0f}<extra></extra>"
+    )
+    fig.update_layout(
+        plot_bgcolor="white",
+        paper_bgcolor="white",
+        font=dict(color=AXIS_COLOR),
+        xaxis_title="Expiry Date",
+        yaxis_title="Value At Risk (₦)",
+        yaxis_tickprefix="₦",
+        yaxis_gridcolor=GRID_COLOR
+    )
+
+    return fig
+
+def reconciliation_trend_chart(trend):
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=trend["Date"],
+        y=trend["gap"],
+        marker_color=WARNING_COLOR,
+        name="Gap (Stock System − POS)",
+        hovertemplate="%{x|%d %b %Y}<br>Gap: %{y:+,} units<extra></extra>"
+    ))
+    fig.add_trace(go.Scatter(
+        x=trend["Date"],
+        y=trend["pos_qty"],
+        mode="lines",
+        line=dict(color=PRIMARY_COLOR, width=2),
+        name="Sold At Tills (POS)",
+        yaxis="y2",
+        hovertemplate="%{x|%d %b %Y}<br>POS: %{y:,} units<extra></extra>"
+    ))
+    fig.add_trace(go.Scatter(
+        x=trend["Date"],
+        y=trend["sold_qty"],
+        mode="lines",
+        line=dict(color=SECONDARY_COLOR, width=2, dash="dot"),
+        name="Sold Per Stock System",
+        yaxis="y2",
+        hovertemplate="%{x|%d %b %Y}<br>Stock system: %{y:,} units<extra></extra>"
+    ))
+
+    fig.update_layout(
+        plot_bgcolor="white",
+        paper_bgcolor="white",
+        font=dict(color=AXIS_COLOR),
+        xaxis_title="Date",
+        yaxis=dict(title="Gap (Units)", gridcolor=GRID_COLOR),
+        yaxis2=dict(title="Units Sold", overlaying="y", side="right"),
+        legend=dict(orientation="h", y=1.1)
+    )
+
+    return fig
+
+# -------------------------------------------------
+# TABLES
+# -------------------------------------------------
+def low_stock_table(inventory, products):
+    alerts = reorder_alerts(replenishment_metrics(inventory, products))
+    latest = latest_snapshot(inventory)[["store_id", "product_id", "sold_qty", "received_qty"]]
+    table = alerts.merge(latest, on=["store_id", "product_id"], how="left")
+
+    return pd.DataFrame({
+        "Product Name": table["product_name"],
+        "Current Stock": table["closing_stock"].astype(int),
+        "Reorder Point": table["reorder_point"].astype(int),
+        "Daily Sales Velocity": table["velocity"].round(1),
+        "Days Of Cover": table["days_of_cover"].round(1),
+        "Stockout Risk (%)": (table["stockout_probability"] * 100).round(1),
+        "Units Sold Today": table["sold_qty"],
+        "Units Received Today": table["received_qty"]
+    })
+
+def expiry_risk_table(cohorts):
+    table = expiry_risk_by_product(cohorts)
+
+    return pd.DataFrame({
+        "Product Name": table["product_name"],
+        "Store": table["store_id"],
+        "Units At Risk": table["units_at_risk"].astype(int),
+        "Value At Risk (₦)": table["value_at_risk"].round(0),
+        "Next Expiry": table["next_expiry"].dt.date
+    }).reset_index(drop=True)
+
+def shrinkage_table(summary):
+    return pd.DataFrame({
+        "Product Name": summary["product_name"],
+        "Store": summary["store_id"],
+        "Status": summary["status"].map(STATUS_LABELS),
+        "Days In Status": summary["status_days"].astype(int),
+        "Sold At Tills": summary["pos_qty"].astype(int),
+        "Sold Per Stock System": summary["sold_qty"].astype(int),
+        "Gap (Units)": summary["net_gap"].astype(int),
+        "Gap (%)": (summary["gap_share"] * 100).round(1),
+        "Gap Value (₦)": summary["gap_value"].round(0),
+        "Damaged & Expired": summary["written_off"].astype(int)
+    }).reset_index(drop=True)
+
+# -------------------------------------------------
+# STATIC REPORT
+# -------------------------------------------------
+def build_report(data):
+    inventory = data["inventory"]
+    cohorts = expiry_cohorts(inventory, data["products"], RISK_HORIZON_DAYS)
+    reconciliation = reconcile_days(inventory, data["sales"])
+
+    return {
+        "title": TITLE,
+        "kpis": kpis(data),
+        "charts": [
+            ("Inventory Movement Breakdown",
+             "Shows how inventory moved today across opening stock, receipts, sales, damage, expiry, and closing stock.",
+             stock_movement_breakdown_chart(inventory)),
+            ("Stock Availability Distribution",
+             "Displays the number of products currently in stock versus those stocked out.",
+             stock_level_distribution_chart(inventory)),
+            ("Stock Value At Risk Of Expiry",
+             f"Cost value of stock expected to expire in the next {RISK_HORIZON_DAYS} days under first-expired-first-out.",
+             expiry_risk_chart(cohorts)),
+            ("Stock System vs POS Sales",
+             "Units sold per the inventory snapshots against units rung up at the tills, and the daily gap.",
+             reconciliation_trend_chart(reconciliation_trend(reconciliation)))
+        ],
+        "tables": [
+            ("Low Stock Items (Operational Attention)",
+             "Products at or below a reorder point set from recent sales velocity and lead-time demand.",
+             low_stock_table(inventory, data["products"])),
+            ("Expiry Risk By Product",
+             "Products holding stock that is past or approaching its shelf life.",
+             expiry_risk_table(cohorts)),
+            ("Stock vs POS Reconciliation",
+             f"Gap between stock-system and POS sales per product over the last {GAP_WINDOW_DAYS} days, "
+             "with persistent gaps flagged.",
+             shrinkage_table(shrinkage_summary(reconciliation, data["products"])))
+        ]
+    }
@@ -0,0 +1,275 @@
+import operator
+
+import pandas as pd
+
+from analytics.chunked import cost_of_goods_sold, product_day_totals, product_totals
+from analytics.energy import energy_by_hour, energy_by_weekday, energy_efficiency, energy_rollup
+from analytics.pricing import price_sweep, product_baseline
+from task_graph import TaskGraph
+from theme import AXIS_COLOR, GRID_COLOR, SUCCESS_COLOR, WARNING_COLOR
+
+TITLE = "Profitability & Cost Control"
+
+# -------------------------------------------------
+# KPI CALCULATIONS
+# -------------------------------------------------
+# totals is the product x day frame from analytics.chunked; it carries
+# total_amount, so revenue reads the same from it as from the sales lines.
+def total_revenue(totals):
+    return totals["total_amount"].sum()
+
+def margin_percent(profit, revenue):
+    return round((profit / revenue) * 100, 2) if revenue else 0
+
+def total_operating_expenses(expenses):
+    return expenses["expense_amount"].sum()
+
+def kpi_cards(revenue, cogs, profit, margin, net_profit):
+    return [
+        ("Total Revenue", f"₦{revenue:,.0f}"),
+        ("Cost Of Goods Sold", f"₦{cogs:,.0f}"),
+        ("Gross Profit", f"₦{profit:,.0f}"),
+        ("Gross Margin", f"{margin}%"),
+        ("Net Profit Estimate", f"₦{net_profit:,.0f}")
+    ]
+
+def kpi_tasks(graph, data):
+    # Revenue and cost of goods sold are computed once and shared by gross
+    # profit, margin and net profit instead of each KPI re-merging sales.
+    # Both come from one scan of sales; the totals frame carries total_amount.
+    totals = graph.add("daily_product_totals", product_day_totals, data)
+    revenue = graph.add("revenue", total_revenue, totals)
+    cogs = graph.add("cost_of_goods_sold", cost_of_goods_sold, totals, data["products"])
+    profit = graph.add("gross_profit", operator.sub, revenue, cogs)
+    margin = graph.add("gross_margin", margin_percent, profit, revenue)
+    opex = graph.add("operating_expenses", total_operating_expenses, data["expenses"])
+    net_profit = graph.add("net_profit", operator.sub, profit, opex)
+    return graph.add("kpis", kpi_cards, revenue, cogs, profit, margin, net_profit)
+
+def kpis(data):
+    graph = TaskGraph()
+    cards = kpi_tasks(graph, data)
+    return graph.run()[cards.name]
+
+# -------------------------------------------------
+# CHARTS
+# -------------------------------------------------
+def monthly_profit_trend_chart(sales, products):
+    import plotly.express as px
+
+    merged = sales.merge(products, on="product_id")
+    merged["Month"] = merged["Transaction Date"].dt.to_period("M").astype(str)
+
+    grouped = merged.groupby("Month").agg(
+        Revenue=("total_amount", "sum"),
+        Cost=("quantity_sold", lambda x: (x * merged.loc[x.index, "cost_price"]).sum())
+    ).reset_index()
+
+    grouped["Gross Profit"] = grouped["Revenue"] - grouped["Cost"]
+
+    fig = px.line(
+        grouped,
+        x="Month",
+        y="Gross Profit",
+        markers=True
+    )
+
+    fig.update_traces(line=dict(color=SUCCESS_COLOR, width=3))
+    fig.update_layout(
+        plot_bgcolor="white",
+        paper_bgcolor="white",
+        font=dict(color=AXIS_COLOR),
+        xaxis_title="Month",
+        yaxis_title="Gross Profit (₦)",
+        yaxis_tickprefix="₦",
+        yaxis_gridcolor=GRID_COLOR
+    )
+
+    return fig
+
+def expense_category_breakdown_chart(expenses):
+    import plotly.express as px
+
+    grouped = expenses.groupby("expense_category")["expense_amount"].sum().reset_index()
+
+    fig = px.bar(
+        grouped,
+        x="expense_category",
+        y="expense_amount"
+    )
+
+    fig.update_traces(marker_color=WARNING_COLOR)
+    fig.update_layout(
+        plot_bgcolor="white",
+        paper_bgcolor="white",
+        font=dict(color=AXIS_COLOR),
+        xaxis_title="Expense Category",
+        yaxis_title="Total Cost (₦)",
+        yaxis_tickprefix="₦",
+        yaxis_gridcolor=GRID_COLOR
+    )
+
+    return fig
+
+# -------------------------------------------------
+# ENERGY EFFICIENCY
+# -------------------------------------------------
+def energy_kpis(summary):
+    return [
+        ("Power & Fuel Spend", f"₦{summary['energy_cost']:,.0f}"),
+        ("Energy Cost per ₦100 Sales", f"₦{summary['cost_per_100_revenue']:,.2f}"),
+        ("Energy Cost per Transaction", f"₦{summary['cost_per_transaction']:,.0f}"),
+        ("Average Daily Spend", f"₦{summary['energy_cost'] / max(summary['days'], 1):,.0f}")
+    ]
+
+def energy_cost_ratio_chart(frame, x, x_title):
+    import plotly.express as px
+
+    fig = px.bar(
+        frame,
+        x=x,
+        y="cost_per_100_revenue",
+        custom_data=["energy_cost", "revenue", "cost_per_transaction"]
+    )
+
+    fig.update_traces(
+        marker_color=WARNING_COLOR,
+        hovertemplate=(
+            "<b>%{x}</b><br>Energy per ₦100 sales: ₦%{y:,.2f}"
+            "<br>Energy cost: ₦%{customdata[0]:,.0f}<br>Revenue: ₦%{customdata[1]:,.0f}"
+            "<br>Per transaction: ₦%{customdata[2]:,.0f}<extra></extra>"
+        )
+    )
+    fig.update_layout(
+        plot_bgcolor="white",
+        paper_bgcolor="white",
+        font=dict(color=AXIS_COLOR),
+        xaxis_title=x_title,
+        yaxis_title="Energy Cost per ₦100 Sales",
+        yaxis_tickprefix="₦",
+        yaxis_gridcolor=GRID_COLOR
+    )
+
+    return fig
+
+def energy_by_hour_chart(by_hour):
+    fig = energy_cost_ratio_chart(by_hour, "Hour", "Hour Of Day")
+    fig.update_xaxes(dtick=1)
+    return fig
+
+def energy_by_weekday_chart(by_weekday):
+    return energy_cost_ratio_chart(by_weekday, "Day Of Week", "Day Of Week")
+
+# -------------------------------------------------
+# WHAT-IF PRICING
+# -------------------------------------------------
+def signed_naira(value):
+    return f"{'+' if value >= 0 else '−'}₦{abs(value):,.0f}"
+
+def scenario_kpis(base, scenario):
+    return [
+        ("Scenario Revenue", f"₦{scenario['revenue']:,.0f} ({signed_naira(scenario['revenue'] - base['revenue'])})"),
+        ("Scenario Gross Profit", f"₦{scenario['gross_profit']:,.0f} ({signed_naira(scenario['gross_profit'] - base['gross_profit'])})"),
+        ("Scenario Gross Margin", f"{scenario['gross_margin'] * 100:.2f}%"),
+        ("Scenario Net Profit", f"₦{scenario['net_profit']:,.0f} ({signed_naira(scenario['net_profit'] - base['net_profit'])})")
+    ]
+
+def price_sensitivity_chart(sweep):
+    import plotly.express as px
+
+    frame = sweep.assign(
+        **{
+            "Price Change (%)": sweep["price_change"] * 100,
+            "Elasticity": sweep["elasticity"].map(lambda e: f"{e:g}")
+        }
+    )
+
+    fig = px.line(
+        frame,
+        x="Price Change (%)",
+        y="net_profit",
+        color="Elasticity"
+    )
+
+    fig.update_traces(
+        hovertemplate="<b>Price change:</b> %{x:+.0f}%<br><b>Net profit:</b> ₦%{y:,.0f}<extra></extra>"
+    )
+    fig.update_layout(
+        plot_bgcolor="white",
+        paper_bgcolor="white",
+        font=dict(color=AXIS_COLOR),
+        xaxis_title="Price Change (%)",
+        yaxis_title="Net Profit (₦)",
+        yaxis_tickprefix="₦",
+        yaxis_gridcolor=GRID_COLOR,
+        legend_title="Elasticity"
+    )
+
+    return fig
+
+def scenario_impact_table(by_group, group_label):
+    return pd.DataFrame({
+        group_label: by_group.iloc[:, 0],
+        "Baseline Revenue (₦)": by_group["base_revenue"].round(0),
+        "Scenario Revenue (₦)": by_group["revenue"].round(0),
+        "Revenue Change (₦)": by_group["revenue_change"].round(0),
+        "Gross Profit Change (₦)": by_group["gross_profit_change"].round(0)
+    }).sort_values("Gross Profit Change (₦)", key=abs, ascending=False).reset_index(drop=True)
+
+# -------------------------------------------------
+# TABLE
+# -------------------------------------------------
+def high_cost_products_table(totals, products):
+    merged = product_totals(totals, products)
+
+    table = merged.groupby("product_name").agg(
+        Units_Sold=("quantity_sold", "sum"),
+        Cost_Impact=("cost", "sum")
+    ).reset_index()
+
+    return table.sort_values("Cost_Impact", ascending=False).head(10).rename(
+        columns={
+            "product_name": "Product Name",
+            "Units_Sold": "Units Sold",
+            "Cost_Impact": "Total Cost (₦)"
+        }
+    )
+
+# -------------------------------------------------
+# STATIC REPORT
+# -------------------------------------------------
+def build_rollups(data):
+    return energy_rollup(data["sales"], data["expenses"])
+
+def build_report(data, energy=None, store_id=None, start=None, end=None):
+    # energy, when given, is build_rollups of the unfiltered data and is
+    # sliced to the store and period here.
+    sales = data["sales"]
+    products = data["products"]
+    if energy is None:
+        energy = build_rollups(data)
+
+    return {
+        "title": TITLE,
+        "kpis": kpis(data) + energy_kpis(energy_efficiency(energy, start, end, store_id)),
+        "charts": [
+            ("Monthly Gross Profit Trend", "Tracks how gross profit has changed over time.",
+             monthly_profit_trend_chart(sales, products)),
+            ("Operating Expenses By Category", "Shows which cost categories consume the most money.",
+             expense_category_breakdown_chart(data["expenses"])),
+            ("Energy Cost By Hour", "Power & generator fuel spend per ₦100 of sales, by hour of day.",
+             energy_by_hour_chart(energy_by_hour(energy, start, end, store_id))),
+            ("Energy Cost By Day Of Week", "Power & generator fuel spend per ₦100 of sales, by day of week.",
+             energy_by_weekday_chart(energy_by_weekday(energy, start, end, store_id))),
+            ("Net Profit Sensitivity To Price", "Net profit for store-wide price changes under different demand elasticities.",
+             price_sensitivity_chart(price_sweep(
+                 product_baseline(sales, products),
+                 operating_expenses=total_operating_expenses(data["expenses"])
+             )))
+        ],
+        "tables": [
+            ("Products With Highest Cost Impact",
+             "Products that contribute most to total cost of goods sold.",
+             high_cost_products_table(product_day_totals(data), products))
+        ]
+    }
@@ -0,0 +1,343 @@
+import pandas as pd
+
+from analytics.basket import frequently_bought_together, product_affinity
+from analytics.chunked import category_demand, daily_revenue, product_day_totals, product_totals
+from analytics.forecasting import forecast_demand, has_enough_history, total_forecast
+from analytics.segmentation import (
+    COMPARISONS,
+    RECENT_DAYS,
+    classify_skus,
+    period_deltas,
+    product_series,
+    recent_period,
+    segment_matrix
+)
+from theme import AXIS_COLOR, FORECAST_COLOR, GRID_COLOR, INFO_COLOR, INTERVAL_FILL, PRIMARY_COLOR
+
+TITLE = "Sales & Demand Patterns"
+
+# -------------------------------------------------
+# KPI CALCULATIONS
+# -------------------------------------------------
+def total_units_sold(sales):
+    return sales["quantity_sold"].sum()
+
+def average_daily_sales(totals):
+    return daily_revenue(totals).mean()
+
+# Both return None when the selection has no sales.
+def peak_sales_hour(sales):
+    by_hour = sales.groupby("Hour")["total_amount"].sum()
+    return by_hour.idxmax() if len(by_hour) else None
+
+def best_selling_category(totals, products):
+    by_category = category_demand(totals, products).groupby("category")["quantity_sold"].sum()
+    return by_category.idxmax() if len(by_category) else None
+
+def kpis(data):
+    sales = data["sales"]
+    totals = product_day_totals(data)
+
+    peak_hour = peak_sales_hour(sales)
+    top_category = best_selling_category(totals, data["products"])
+
+    return [
+        ("Total Units Sold", f"{total_units_sold(sales):,}"),
+        ("Average Daily Sales", f"₦{average_daily_sales(totals) if len(totals) else 0:,.0f}"),
+        ("Peak Sales Hour", f"{peak_hour}:00" if peak_hour is not None else "—"),
+        ("Top Selling Category", top_category if top_category is not None else "—")
+    ]
+
+# -------------------------------------------------
+# CHARTS
+# -------------------------------------------------
+def hourly_sales_pattern_chart(sales):
+    import plotly.express as px
+
+    grouped = sales.groupby("Hour")["total_amount"].sum().reset_index()
+
+    fig = px.line(
+        grouped,
+        x="Hour",
+        y="total_amount",
+        markers=True
+    )
+
+    fig.update_traces(line=dict(color=PRIMARY_COLOR, width=3))
+    fig.update_layout(
+        plot_bgcolor="white",
+        paper_bgcolor="white",
+        font=dict(color=AXIS_COLOR),
+        xaxis_title="Hour Of Day",
+        yaxis_title="Total Sales (₦)",
+        yaxis_tickprefix="₦",
+        yaxis_gridcolor=GRID_COLOR
+    )
+
+    return fig
+
+def day_of_week_sales_chart(sales):
+    import plotly.express as px
+
+    order = [
+        "Monday", "Tuesday", "Wednesday",
+        "Thursday", "Friday", "Saturday", "Sunday"
+    ]
+
+    grouped = (
+        sales.groupby("Day Of Week")["total_amount"]
+        .sum()
+        .reindex(order)
+        .reset_index()
+    )
+
+    fig = px.bar(
+        grouped,
+        x="Day Of Week",
+        y="total_amount"
+    )
+
+    fig.update_traces(marker_color=INFO_COLOR)
+    fig.update_layout(
+        plot_bgcolor="white",
+        paper_bgcolor="white",
+        font=dict(color=AXIS_COLOR),
+        xaxis_title="Day Of Week",
+        yaxis_title="Total Sales (₦)",
+        yaxis_tickprefix="₦",
+        yaxis_gridcolor=GRID_COLOR
+    )
+
+    return fig
+
+def monthly_category_demand_chart(totals, products):
+    import plotly.express as px
+
+    grouped = category_demand(totals, products)
+
+    fig = px.area(
+        grouped,
+        x="Month",
+        y="quantity_sold",
+        color="category"
+    )
+
+    fig.update_layout(
+        plot_bgcolor="white",
+        paper_bgcolor="white",
+        font=dict(color=AXIS_COLOR),
+        xaxis_title="Month",
+        yaxis_title="Units Sold",
+        yaxis_gridcolor=GRID_COLOR
+    )
+
+    return fig
+
+def demand_forecast_chart(actual, predicted, history_days=60):
+    import plotly.graph_objects as go
+
+    actual = actual.tail(history_days)
+
+    fig = go.Figure()
+
+    fig.add_trace(go.Scatter(
+        x=list(predicted["Date"]) + list(predicted["Date"][::-1]),
+        y=list(predicted["Upper"]) + list(predicted["Lower"][::-1]),
+        fill="toself",
+        fillcolor=INTERVAL_FILL,
+        line=dict(width=0),
+        hoverinfo="skip",
+        name="90% Interval"
+    ))
+    fig.add_trace(go.Scatter(
+        x=actual["Date"],
+        y=actual["Units Sold"],
+        mode="lines",
+        line=dict(color=PRIMARY_COLOR, width=2),
+        name="Actual"
+    ))
+    fig.add_trace(go.Scatter(
+        x=predicted["Date"],
+        y=predicted["Forecast"],
+        mode="lines+markers",
+        line=dict(color=FORECAST_COLOR, width=3, dash="dash"),
+        name="Forecast"
+    ))
+
+    fig.update_layout(
+        plot_bgcolor="white",
+        paper_bgcolor="white",
+        font=dict(color=AXIS_COLOR),
+        xaxis_title="Date",
+        yaxis_title="Units Sold",
+        yaxis_gridcolor=GRID_COLOR,
+        legend=dict(orientation="h", y=1.1)
+    )
+
+    return fig
+
+def sku_segment_matrix_chart(matrix):
+    import plotly.express as px
+
+    counts = matrix.pivot(index="abc", columns="xyz", values="skus")
+    shares = matrix.pivot(index="abc", columns="xyz", values="revenue_share") * 100
+
+    fig = px.imshow(
+        shares,
+        color_continuous_scale="Blues",
+        aspect="auto",
+        labels=dict(x="Demand Variability (XYZ)", y="Revenue Class (ABC)", color="Revenue Share (%)")
+    )
+
+    fig.update_traces(
+        customdata=counts.to_numpy(),
+        text=[[f"{count:,} SKUs<br>{share:.1f}%" for count, share in zip(*row)] for row in zip(counts.to_numpy(), shares.to_numpy())],
+        texttemplate="%{text}",
+        hovertemplate="<b>%{y}%{x}</b><br>SKUs: %{customdata:,}<br>Revenue share: %{z:.1f}%<extra></extra>"
+    )
+    fig.update_layout(
+        plot_bgcolor="white",
+        paper_bgcolor="white",
+        font=dict(color=AXIS_COLOR)
+    )
+
+    return fig
+
+# -------------------------------------------------
+# TABLE
+# -------------------------------------------------
+def top_products_by_volume_table(totals, products):
+    merged = product_totals(totals, products)
+
+    table = merged.groupby("product_name").agg(
+        Units_Sold=("quantity_sold", "sum"),
+        Revenue=("total_amount", "sum")
+    ).reset_index()
+
+    return table.sort_values(
+        "Units_Sold", ascending=False
+    ).head(10).rename(
+        columns={
+            "product_name": "Product Name",
+            "Units_Sold": "Units Sold",
+            "Revenue": "Total Revenue (₦)"
+        }
+    )
+
+def sku_segments_table(classes):
+    table = pd.DataFrame({
+        "Product Name": classes["product_name"],
+        "Category": classes["category"],
+        "Segment": classes["segment"],
+        "Revenue (₦)": classes["revenue"].round(0),
+        "Revenue Share (%)": (classes["revenue_share"] * 100).round(2),
+        "Cumulative Share (%)": (classes["cumulative_share"] * 100).round(1),
+        "Gross Profit (₦)": (classes["revenue"] - classes["cost"]).round(0),
+        "Units Sold": classes["units"].astype(int),
+        "Avg Daily Units": classes["mean_daily_units"].round(1),
+        "Demand CV": classes["cv"].round(2)
+    })
+    if "store_id" in classes:
+        table.insert(1, "Store", classes["store_id"])
+    return table
+
+def format_kpi(kpi, value):
+    if pd.isna(value):
+        return "–"
+    if kpi == "Gross Margin":
+        return f"{value * 100:,.1f}%"
+    if kpi in ("Units Sold", "Active SKUs"):
+        return f"{value:,.0f}"
+    return f"₦{value:,.0f}"
+
+def format_change(kpi, change):
+    if pd.isna(change):
+        return "–"
+    if kpi == "Gross Margin":
+        return f"{change * 100:+,.1f} pts"
+    return f"{change * 100:+,.1f}%"
+
+def period_comparison_table(deltas):
+    table = pd.DataFrame({
+        "KPI": deltas["kpi"],
+        "Selected Period": [format_kpi(kpi, value) for kpi, value in zip(deltas["kpi"], deltas["current"])]
+    })
+    for label in COMPARISONS:
+        table[label] = [format_change(kpi, change) for kpi, change in zip(deltas["kpi"], deltas[label])]
+    return table
+
+def frequently_bought_together_table(affinity, products, product_id=None, top_n=10):
+    pairs = frequently_bought_together(affinity, products, product_id, top_n)
+
+    return pd.DataFrame({
+        "Product": pairs["product_name"],
+        "Bought With": pairs["with_product_name"],
+        "Baskets Together": pairs["baskets"],
+        "Support (%)": (pairs["support"] * 100).round(2),
+        "Confidence (%)": (pairs["confidence"] * 100).round(1),
+        "Lift": pairs["lift"].round(2)
+    }).reset_index(drop=True)
+
+# -------------------------------------------------
+# STATIC REPORT
+# -------------------------------------------------
+def build_rollups(data):
+    return product_series(data["sales"], data["products"])
+
+def build_report(data, series=None, store_id=None, start=None, end=None):
+    # series, when given, is build_rollups of the unfiltered data and is read
+    # for the store and period here.
+    sales = data["sales"]
+    products = data["products"]
+    totals = product_day_totals(data)
+    if series is None:
+        series = build_rollups(data)
+    classes = classify_skus(series, products, start, end, store_id)
+
+    charts = [
+        ("Hourly Sales Pattern", "Identifies peak shopping hours for staff and power planning.",
+         hourly_sales_pattern_chart(sales)),
+        ("Sales By Day Of Week", "Shows which days drive the highest demand.",
+         day_of_week_sales_chart(sales)),
+        ("Monthly Category Demand", "Tracks how product categories perform across the year.",
+         monthly_category_demand_chart(totals, products)),
+        ("SKU Segments (ABC/XYZ)", "Share of revenue in each revenue class and demand-variability class.",
+         sku_segment_matrix_chart(segment_matrix(classes)))
+    ]
+
+    if has_enough_history(data):
+        history, forecast = forecast_demand(data)
+        charts.append((
+            "Demand Forecast", "Projected units sold across all products with a 90% interval.",
+            demand_forecast_chart(*total_forecast(history, forecast))
+        ))
+
+    tables = [
+        ("Top Selling Products", "Products with the highest sales volume.",
+         top_products_by_volume_table(totals, products)),
+        ("SKU Segments", "Products ranked by revenue with their ABC/XYZ class.",
+         sku_segments_table(classes))
+    ]
+
+    recent = recent_period(series, start=start, end=end)
+    if recent is not None:
+        tables.append((
+            f"Last {RECENT_DAYS} Days vs Earlier Periods",
+            f"Each KPI for the last {RECENT_DAYS} days against the same days a week, a month and a year earlier.",
+            period_comparison_table(period_deltas(series, *recent, store_id))
+        ))
+
+    affinity = product_affinity(sales)
+    if not affinity.empty:
+        tables.append((
+            "Frequently Bought Together",
+            "Product pairs bought by the same customer in the same store on the same day, ranked by lift.",
+            frequently_bought_together_table(affinity, products)
+        ))
+
+    return {
+        "title": TITLE,
+        "kpis": kpis(data),
+        "charts": charts,
+        "tables": tables
+    }
@@ -0,0 +1,198 @@
+import pandas as pd
+
+from analytics.energy import WEEKDAYS
+from analytics.staffing import StaffingCube, cashier_hourly, cashier_throughput, slot_profile, staffing_plan
+from theme import AXIS_COLOR, GRID_COLOR, PRIMARY_COLOR, WARNING_COLOR
+
+TITLE = "Staffing & Cashier Throughput"
+
+# -------------------------------------------------
+# KPI CALCULATIONS
+# -------------------------------------------------
+def peak_slot(plan):
+    if plan.empty:
+        return "–"
+    row = plan.loc[plan["planning_rate"].idxmax()]
+    return f"{row['Day Of Week'][:3]} {int(row['Hour'])}:00"
+
+def transactions_per_cashier_hour(throughput):
+    hours = throughput["active_hours"].sum()
+    return throughput["transactions"].sum() / hours if hours else 0
+
+def understaffed_slots(plan):
+    return int((plan["gap"] >= 1).sum())
+
+def overstaffed_slots(plan):
+    return int((plan["gap"] <= -1).sum())
+
+def kpis(plan, throughput):
+    return [
+        ("Busiest Slot", peak_slot(plan)),
+        ("Peak Arrivals Per Hour", f"{plan['planning_rate'].max() if len(plan) else 0:,.1f}"),
+        ("Receipts Per Cashier-Hour", f"{transactions_per_cashier_hour(throughput):,.1f}"),
+        ("Peak Cashiers Needed", f"{int(plan['recommended_cashiers'].max()) if len(plan) else 0}"),
+        ("Slots Short / Over", f"{understaffed_slots(plan)} / {overstaffed_slots(plan)}")
+    ]
+
+# -------------------------------------------------
+# CHARTS
+# -------------------------------------------------
+def slot_matrix(plan, column):
+    return plan.pivot(index="Day Of Week", columns="Hour", values=column).reindex(
+        [day for day in WEEKDAYS if day in set(plan["Day Of Week"])]
+    )
+
+def arrival_heatmap_chart(plan):
+    import plotly.express as px
+
+    fig = px.imshow(
+        slot_matrix(plan, "transactions_per_hour"),
+        color_continuous_scale="Blues",
+        aspect="auto",
+        labels=dict(x="Hour Of Day", y="Day Of Week", color="Receipts / Hour")
+    )
+
+    fig.update_traces(
+        hovertemplate="<b>%{y} %{x}:00</b><br>Average receipts: %{z:.1f} per hour<extra></extra>"
+    )
+    fig.update_layout(
+        plot_bgcolor="white",
+        paper_bgcolor="white",
+        font=dict(color=AXIS_COLOR),
+        xaxis=dict(dtick=1)
+    )
+
+    return fig
+
+def staffing_gap_heatmap_chart(plan):
+    import plotly.express as px
+
+    gaps = slot_matrix(plan, "gap")
+    limit = max(float(gaps.abs().max().max()), 1.0) if not gaps.empty else 1.0
+
+    fig = px.imshow(
+        gaps,
+        color_continuous_scale="RdBu_r",
+        zmin=-limit,
+        zmax=limit,
+        aspect="auto",
+        labels=dict(x="Hour Of Day", y="Day Of Week", color="Cashier Gap")
+    )
+
+    fig.update_traces(
+        hovertemplate="<b>%{y} %{x}:00</b><br>Recommended minus on tills: %{z:+.1f}<extra></extra>"
+    )
+    fig.update_layout(
+        plot_bgcolor="white",
+        paper_bgcolor="white",
+        font=dict(color=AXIS_COLOR),
+        xaxis=dict(dtick=1)
+    )
+
+    return fig
+
+def cashiers_by_hour_chart(plan, day):
+    import plotly.graph_objects as go
+
+    rows = plan[plan["Day Of Week"] == day]
+
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=rows["Hour"],
+        y=rows["observed_cashiers"],
+        marker_color=PRIMARY_COLOR,
+        name="On Tills (Average)",
+        hovertemplate="%{x}:00<br>On tills: %{y:.1f}<extra></extra>"
+    ))
+    fig.add_trace(go.Scatter(
+        x=rows["Hour"],
+        y=rows["recommended_cashiers"],
+        mode="lines+markers",
+        line=dict(color=WARNING_COLOR, width=3, shape="hv"),
+        name="Recommended",
+        hovertemplate="%{x}:00<br>Recommended: %{y}<extra></extra>"
+    ))
+
+    fig.update_layout(
+        plot_bgcolor="white",
+        paper_bgcolor="white",
+        font=dict(color=AXIS_COLOR),
+        xaxis=dict(title="Hour Of Day", dtick=1),
+        yaxis=dict(title="Cashiers", gridcolor=GRID_COLOR),
+        legend=dict(orientation="h", y=1.1)
+    )
+
+    return fig
+
+def cashier_throughput_chart(hourly):
+    import plotly.express as px
+
+    fig = px.line(
+        hourly.assign(Cashier=hourly["cashier_id"].astype(str)),
+        x="Hour",
+        y="transactions_per_hour",
+        color="Cashier",
+        markers=True
+    )
+
+    fig.update_layout(
+        plot_bgcolor="white",
+        paper_bgcolor="white",
+        font=dict(color=AXIS_COLOR),
+        xaxis=dict(title="Hour Of Day", dtick=1),
+        yaxis_title="Receipts Per Active Hour",
+        yaxis_gridcolor=GRID_COLOR
+    )
+
+    return fig
+
+# -------------------------------------------------
+# TABLES
+# -------------------------------------------------
+def cashier_table(throughput):
+    return pd.DataFrame({
+        "Cashier": throughput["cashier_id"],
+        "Receipts": throughput["transactions"].astype(int),
+        "Revenue (₦)": throughput["revenue"].round(0),
+        "Hours On Till": throughput["active_hours"].astype(int),
+        "Receipts Per Hour": throughput["transactions_per_hour"].round(2),
+        "Revenue Per Hour (₦)": throughput["revenue_per_hour"].round(0)
+    })
+
+def staffing_plan_table(plan, day=None):
+    rows = plan if day is None else plan[plan["Day Of Week"] == day]
+
+    return pd.DataFrame({
+        "Day": rows["Day Of Week"],
+        "Hour": rows["Hour"].map("{}:00".format),
+        "Receipts / Hour": rows["transactions_per_hour"].round(1),
+        "Planning Rate": rows["planning_rate"].round(1),
+        "On Tills (Avg)": rows["observed_cashiers"].round(1),
+        "Recommended": rows["recommended_cashiers"],
+        "Gap": rows["gap"].round(1)
+    }).reset_index(drop=True)
+
+# -------------------------------------------------
+# STATIC REPORT
+# -------------------------------------------------
+def build_report(data):
+    cube = StaffingCube.from_sales(data["sales"])
+    plan = staffing_plan(slot_profile(cube))
+    throughput = cashier_throughput(cube)
+
+    return {
+        "title": TITLE,
+        "kpis": kpis(plan, throughput),
+        "charts": [
+            ("Arrivals By Hour And Weekday", "Average receipts per hour at the tills.",
+             arrival_heatmap_chart(plan)),
+            ("Staffing Gap", "Recommended cashiers minus the average on the tills; red slots are short-staffed.",
+             staffing_gap_heatmap_chart(plan)),
+            ("Cashier Throughput By Hour", "Receipts each cashier processes per hour on the till.",
+             cashier_throughput_chart(cashier_hourly(cube)))
+        ],
+        "tables": [
+            ("Cashier Throughput", "Receipts and revenue per cashier, overall and per hour on the till.",
+             cashier_table(throughput))
+        ]
+    }
@@ -0,0 +1,135 @@
+import pandas as pd
+
+from analytics.suppliers import supplier_rollup, supplier_scorecard
+from theme import AXIS_COLOR, GRID_COLOR, PRIMARY_COLOR, WARNING_COLOR
+
+TITLE = "Supplier Performance"
+
+# -------------------------------------------------
+# KPI CALCULATIONS
+# -------------------------------------------------
+def top_supplier(card):
+    return card.iloc[0]["supplier_name"] if card["revenue"].sum() else "–"
+
+def overall_gross_margin(card):
+    revenue = card["revenue"].sum()
+    return round((revenue - card["cogs"].sum()) / revenue * 100, 2) if revenue else 0
+
+def total_loss_value(card):
+    return card["loss_value"].sum()
+
+def imported_revenue_share(card):
+    revenue = card["revenue"].sum()
+    return round(card["imported_revenue"].sum() / revenue * 100, 1) if revenue else 0
+
+def kpis(card):
+    return [
+        ("Active Suppliers", f"{int((card['revenue'] > 0).sum())}"),
+        ("Top Supplier By Revenue", top_supplier(card)),
+        ("Gross Margin", f"{overall_gross_margin(card)}%"),
+        ("Damage & Expiry Loss", f"₦{total_loss_value(card):,.0f}"),
+        ("Imported Revenue Share", f"{imported_revenue_share(card)}%")
+    ]
+
+# -------------------------------------------------
+# CHARTS
+# -------------------------------------------------
+def supplier_revenue_chart(card):
+    import plotly.express as px
+
+    grouped = card.assign(Margin=(card["gross_margin"] * 100).round(1))
+
+    fig = px.bar(
+        grouped,
+        x="supplier_name",
+        y="revenue",
+        custom_data=["Margin", "gross_profit"]
+    )
+
+    fig.update_traces(
+        marker_color=PRIMARY_COLOR,
+        hovertemplate=(
+            "<b>Supplier:</b> %{x}<br><b>Revenue:</b> ₦%{y:,.0f}"
+            "<br><b>Gross Profit:</b> ₦%{customdata[1]:,.0f}"
+            "<br><b>Gross Margin:</b> %{customdata[0]}%<extra></extra>"
+        )
+    )
+    fig.update_layout(
+        plot_bgcolor="white",
+        paper_bgcolor="white",
+        font=dict(color=AXIS_COLOR),
+        xaxis_title="Supplier",
+        yaxis_title="Revenue (₦)",
+        yaxis_tickprefix="₦",
+        yaxis_gridcolor=GRID_COLOR
+    )
+
+    return fig
+
+def supplier_loss_rate_chart(card):
+    import plotly.express as px
+
+    grouped = card.assign(LossRate=(card["loss_rate"] * 100).round(2))
+
+    fig = px.bar(
+        grouped,
+        x="supplier_name",
+        y="LossRate",
+        custom_data=["loss_value"]
+    )
+
+    fig.update_traces(
+        marker_color=WARNING_COLOR,
+        hovertemplate=(
+            "<b>Supplier:</b> %{x}<br><b>Loss Rate:</b> %{y}% of units received"
+            "<br><b>Loss Value:</b> ₦%{customdata[0]:,.0f}<extra></extra>"
+        )
+    )
+    fig.update_layout(
+        plot_bgcolor="white",
+        paper_bgcolor="white",
+        font=dict(color=AXIS_COLOR),
+        xaxis_title="Supplier",
+        yaxis_title="Damaged & Expired (% Of Received)",
+        yaxis_gridcolor=GRID_COLOR
+    )
+
+    return fig
+
+# -------------------------------------------------
+# TABLE
+# -------------------------------------------------
+def supplier_scorecard_table(card):
+    return pd.DataFrame({
+        "Supplier": card["supplier_name"],
+        "Type": card["supplier_type"],
+        "Revenue (₦)": card["revenue"].round(0),
+        "Revenue Share (%)": (card["revenue_share"] * 100).round(1),
+        "Gross Margin (%)": (card["gross_margin"] * 100).round(1),
+        "Loss Rate (%)": (card["loss_rate"] * 100).round(2),
+        "Loss Value (₦)": card["loss_value"].round(0),
+        "Stockout Share (%)": (card["stockout_share"] * 100).round(1),
+        "Imported Share (%)": (card["imported_share"] * 100).round(1)
+    })
+
+# -------------------------------------------------
+# STATIC REPORT
+# -------------------------------------------------
+def build_report(data):
+    rollup = supplier_rollup(data["sales"], data["inventory"], data["products"])
+    card = supplier_scorecard(rollup, data["suppliers"])
+
+    return {
+        "title": TITLE,
+        "kpis": kpis(card),
+        "charts": [
+            ("Revenue By Supplier", "Revenue with gross profit and margin per supplier.",
+             supplier_revenue_chart(card)),
+            ("Damage & Expiry Loss Rate", "Damaged and expired units as a share of units received.",
+             supplier_loss_rate_chart(card))
+        ],
+        "tables": [
+            ("Supplier Scorecard", "Revenue, margin, losses, stockouts and imported share per supplier.",
+             supplier_scorecard_table(card))
+        ]
+    }